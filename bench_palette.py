@@ -0,0 +1,281 @@
+# 팔레트 분석 벤치마크
+# Run: python bench_palette.py photos/            (폴더의 JPEG/PNG 사진으로 측정)
+#      python bench_palette.py photos/ --paths upload_legacy upload  (업로드 1건당 피크 메모리 비교)
+#      python bench_palette.py photos/ --generate 6 (큰 샘플 사진을 만들어서 측정)
+#      python bench_palette.py photos/ --load 8 --workers 0 2 4  (동시 업로드 부하 테스트)
+
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import resource
+import statistics
+import sys
+import time
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp", ".bmp")
+
+
+# ============ 분석 경로 ============
+def path_full(path):
+    """기존 경로: 전체 디코딩 → exif_transpose(copy) → 128px LANCZOS"""
+    from PIL import Image, ImageOps
+    from palette import resize_for_analysis
+    img = Image.open(path)
+    img = ImageOps.exif_transpose(img.copy())
+    return resize_for_analysis(img, 128)
+
+
+def path_fast(path):
+    """축소 디코딩 경로 (open_for_analysis)"""
+    from palette import open_for_analysis
+    return open_for_analysis(path, 128)
+
+
+def upload_legacy(path):
+    """기존 업로드 처리: exif_transpose(img.copy()) 미리보기 + np.array 복사 + //16 양자화"""
+    import io
+    from PIL import Image, ImageOps
+    from palette import get_simple_palette
+    with open(path, "rb") as f:
+        uploaded = io.BytesIO(f.read())
+    data = uploaded.getvalue()
+    img = Image.open(io.BytesIO(data))
+    preview = ImageOps.exif_transpose(img.copy())
+    preview.load()
+    return get_simple_palette(preview, 5)
+
+
+def upload_current(path):
+    """현재 업로드 처리 (test.main과 같은 순서, 캐시/워커 풀 제외)"""
+    import io
+    from palette import analyze_upload, content_digest, palette_from_histogram
+    with open(path, "rb") as f:
+        uploaded = io.BytesIO(f.read())
+    with uploaded.getbuffer() as buf:
+        content_digest(buf)
+    hist, _, _ = analyze_upload(uploaded)
+    return palette_from_histogram(*hist, k=5, algorithm="simple")
+
+
+PATHS = {"full": path_full, "fast": path_fast, "upload_legacy": upload_legacy, "upload": upload_current}
+
+
+# ============ 측정 ============
+def peak_rss_mb() -> float:
+    """프로세스 최대 RSS (MB). Linux는 /proc의 VmHWM, 그 외에는 ru_maxrss"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def reset_peak_rss():
+    # fork/exec 시 부모의 최대 RSS가 이어지므로 측정 전에 리셋 (Linux 4.0+)
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _run_path(name, files, out):
+    # 새 프로세스에서 import를 끝낸 뒤의 최대 RSS를 기준으로 삼는다
+    import numpy  # noqa: F401
+    from PIL import Image  # noqa: F401
+    import palette  # noqa: F401
+    fn = PATHS[name]
+    times, sizes, peaks, errors = [], [], [], []
+    for f in files:
+        # 파일마다 최대 RSS를 리셋해서 업로드 1건당 피크를 잰다
+        reset_peak_rss()
+        base = rss_mb()
+        t0 = time.perf_counter()
+        try:
+            res = fn(f)
+            if hasattr(res, "load"):
+                res.load()
+                sizes.append(res.size)
+        except Exception as e:
+            # 깨진 파일 하나 때문에 부모가 결과를 끝없이 기다리지 않도록 기록만 하고 다음 파일로
+            errors.append({"file": os.path.basename(f), "error": f"{type(e).__name__}: {e}"})
+            continue
+        times.append((time.perf_counter() - t0) * 1000)
+        peaks.append(peak_rss_mb() - base)
+        del res
+    out.put({"path": name, "times": times, "sizes": sizes, "peaks": peaks, "errors": errors})
+
+
+def run_in_child(target, *args):
+    """target(*args, queue)를 깨끗한 spawn 프로세스에서 실행 → (queue로 보낸 결과, 종료 코드).
+    자식이 결과 없이 죽으면(OOM kill 등) 끝없이 기다리지 않고 (None, 종료 코드)"""
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue()
+    p = ctx.Process(target=target, args=(*args, q))
+    p.start()
+    res = None
+    while True:
+        try:
+            res = q.get(timeout=1)
+            break
+        except queue.Empty:
+            if p.is_alive():
+                continue
+        # 이미 죽었다 — 종료 직전에 보낸 결과가 남아 있는지 한 번 더 확인
+        try:
+            res = q.get(timeout=1)
+        except queue.Empty:
+            pass
+        break
+    p.join()
+    return res, p.exitcode
+
+
+def measure(name, files):
+    """경로 하나를 깨끗한 프로세스에서 실행하고 지연시간/피크 메모리를 돌려준다"""
+    res, code = run_in_child(_run_path, name, files)
+    if res is None:
+        res = {"path": name, "times": [], "sizes": [], "peaks": [],
+               "errors": [{"file": "*", "error": f"측정 프로세스 종료 (exitcode {code})"}]}
+    return res
+
+
+# ============ 동시 업로드 부하 테스트 ============
+def _inline_job(data):
+    import io
+    from palette import analyze_upload
+    return analyze_upload(io.BytesIO(data))
+
+
+def load_test(files, clients, rounds, workers):
+    """clients개 스레드가 동시에 업로드를 rounds번씩 분석 요청. workers=0이면 스레드에서 직접 분석"""
+    import threading
+    from palette_pool import AnalysisPool, PoolBusy, analyze_job
+    blobs = []
+    for f in files:
+        with open(f, "rb") as fh:
+            blobs.append(fh.read())
+    pool = None
+    if workers:
+        pool = AnalysisPool(workers=workers, timeout=300)
+        pool.warmup()
+    else:
+        import palette  # noqa: F401  (풀과 같은 조건으로 import 비용 제외)
+    lat, busy = [], [0]
+    lock = threading.Lock()
+
+    def client(i):
+        for r in range(rounds):
+            data = blobs[(i + r) % len(blobs)]
+            t0 = time.perf_counter()
+            while True:
+                try:
+                    pool.run(analyze_job, data) if pool else _inline_job(data)
+                    break
+                except PoolBusy:
+                    # 실제 화면의 "다시 시도" 버튼처럼 잠깐 쉬고 재시도
+                    with lock:
+                        busy[0] += 1
+                    time.sleep(0.1)
+            with lock:
+                lat.append((time.perf_counter() - t0) * 1000)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    if pool:
+        pool.shutdown()
+    lat.sort()
+    return {"jobs/s": len(lat) / elapsed, "median": statistics.median(lat),
+            "p95": lat[min(len(lat) - 1, int(len(lat) * 0.95))], "busy": busy[0]}
+
+
+def generate_samples(folder, n):
+    """EXIF 회전 태그가 붙은 12~48MP 샘플 JPEG 만들기"""
+    import numpy as np
+    from PIL import Image
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(0)
+    sizes = [(4000, 3000), (6000, 4000), (8000, 6000)]
+    for i in range(n):
+        w, h = sizes[i % len(sizes)]
+        # 부드러운 그라디언트 + 약한 노이즈 (사진과 비슷한 압축률)
+        x = np.linspace(0, 255, w, dtype=np.float32)
+        y = np.linspace(0, 255, h, dtype=np.float32)[:, None]
+        arr = np.empty((h, w, 3), np.uint8)
+        arr[..., 0] = x
+        arr[..., 1] = y
+        arr[..., 2] = ((x + y) / 2 + rng.normal(0, 4, (h, w))).clip(0, 255)
+        img = Image.fromarray(arr)
+        exif = Image.Exif()
+        exif[0x0112] = 6 if i % 2 else 1   # Orientation: 90° 회전 / 정상
+        img.save(os.path.join(folder, f"sample_{i:02d}_{w}x{h}.jpg"), quality=90, exif=exif)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="팔레트 분석 이미지 로딩 벤치마크")
+    ap.add_argument("folder", help="큰 사진이 들어있는 폴더")
+    ap.add_argument("--generate", type=int, default=0, metavar="N", help="샘플 사진 N장을 먼저 생성")
+    ap.add_argument("--paths", nargs="+", default=list(PATHS), choices=list(PATHS))
+    ap.add_argument("--load", type=int, default=0, metavar="CLIENTS", help="동시 업로드 부하 테스트 (클라이언트 수)")
+    ap.add_argument("--rounds", type=int, default=3, help="부하 테스트에서 클라이언트당 업로드 횟수")
+    ap.add_argument("--workers", type=int, nargs="+", default=[0, 1, os.cpu_count() or 1],
+                    help="부하 테스트할 워커 수 (0 = 스크립트 스레드에서 직접 분석)")
+    args = ap.parse_args(argv)
+
+    if args.generate:
+        generate_samples(args.folder, args.generate)
+    files = sorted(os.path.join(args.folder, f) for f in os.listdir(args.folder)
+                   if f.lower().endswith(IMAGE_EXTS))
+    if not files:
+        print("측정할 이미지가 없습니다.", file=sys.stderr)
+        return 1
+
+    print(f"{len(files)}장: {args.folder}")
+    if args.load:
+        print(f"동시 업로드 {args.load}명 x {args.rounds}회 · CPU {os.cpu_count()}개")
+        print(f"{'workers':<8} {'jobs/s':>7} {'median ms':>10} {'p95 ms':>9} {'busy':>5}")
+        for w in dict.fromkeys(args.workers):
+            r = load_test(files, args.load, args.rounds, w)
+            print(f"{w or 'inline':<8} {r['jobs/s']:>7.2f} {r['median']:>10.1f} {r['p95']:>9.1f} {r['busy']:>5}")
+        return 0
+    print(f"{'path':<14} {'median ms':>10} {'p95 ms':>9} {'total s':>8} {'peak MB/장':>10} {'max MB':>7}")
+    results = {}
+    for name in args.paths:
+        r = measure(name, files)
+        results[name] = r
+        for e in r["errors"]:
+            print(f"⚠️ {name}: {e['file']} — {e['error']}", file=sys.stderr)
+        ts = sorted(r["times"])
+        if not ts:
+            print(f"{name:<14} {'실패':>10}")
+            continue
+        p95 = ts[min(len(ts) - 1, int(len(ts) * 0.95))]
+        print(f"{name:<14} {statistics.median(ts):>10.1f} {p95:>9.1f} {sum(ts) / 1000:>8.2f} "
+              f"{statistics.median(r['peaks']):>10.1f} {max(r['peaks']):>7.1f}")
+    if "full" in results and "fast" in results and results["full"]["sizes"] != results["fast"]["sizes"]:
+        print("⚠️ 경로별 분석 이미지 크기가 다릅니다 (EXIF 회전 확인 필요)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+# 팔레트 분석 단계별 성능 테스트
+# Run: python bench_stages.py                          (합성 이미지 생성 → 단계별 측정 → bench_results.json)
+#      python bench_stages.py --sizes 0.1 1 12 --formats jpeg   (기본은 JPEG + PNG, PNG는 스트리밍 단계 포함)
+#      python bench_stages.py --save-baseline          (이번 결과를 기준값으로 저장)
+# 기준값(bench_baseline.json)이 있으면 단계별 시간/피크 메모리가 나빠진 항목을 표시하고 종료 코드 1을 돌려준다.
+# 기준값은 측정한 기계에 따라 다르므로 저장소에 넣지 않는다 — 비교하려면 같은 기계에서 먼저 --save-baseline.
+# 최적화 경로(축소 디코딩, 스트립 스트리밍)가 원래 경로와 같은 결과를 내는지도 함께 확인한다.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from bench_palette import peak_rss_mb, reset_peak_rss, rss_mb, run_in_child
+
+KINDS = ("gradient", "noise", "blocks")
+SIZES_MP = (0.1, 1, 12, 50, 100)
+FORMATS = {"jpeg": ".jpg", "png": ".png"}
+IMAGE_DIR = ".bench_images"
+RESULTS_PATH = "bench_results.json"
+BASELINE_PATH = "bench_baseline.json"
+TOLERANCE = 0.25         # 기준값보다 25% 넘게 나빠지면 회귀
+MIN_MS_DELTA = 2.0       # 이보다 작은 시간 차이는 잡음으로 본다
+MIN_MB_DELTA = 8.0
+# open_for_analysis 팔레트와 전체 디코딩 팔레트의 허용 거리 (ΔE).
+# JPEG은 DCT 단계 축소 디코딩이라 픽셀 값 자체가 조금 달라지고, PNG는 회전/축소 순서 차이뿐이다.
+FAST_PALETTE_DELTA_E = {".jpg": 6.0, ".png": 1.0}
+
+
+# ============ 합성 이미지 ============
+def image_size(mp_: float):
+    """4:3 비율에서 mp_ 메가픽셀이 되는 (w, h)"""
+    h = int(round((mp_ * 1e6 * 3 / 4) ** 0.5))
+    return int(round(mp_ * 1e6 / h)), h
+
+
+def synth_array(kind: str, w: int, h: int, seed: int = 0):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    if kind == "noise":
+        return rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+    if kind == "blocks":
+        # 8x6 격자의 단색 블록
+        colors = rng.integers(0, 256, (6, 8, 3), dtype=np.uint8)
+        ys = np.minimum(np.arange(h) * 6 // h, 5)
+        xs = np.minimum(np.arange(w) * 8 // w, 7)
+        return colors[ys[:, None], xs[None, :]]
+    x = np.linspace(0, 255, w, dtype=np.float32)
+    y = np.linspace(0, 255, h, dtype=np.float32)[:, None]
+    arr = np.empty((h, w, 3), np.uint8)
+    arr[..., 0] = x
+    arr[..., 1] = y
+    arr[..., 2] = (x + y) / 2
+    return arr
+
+
+def generate(folder, kinds, sizes, formats):
+    """없는 이미지만 만든다. EXIF 회전(6)을 붙여서 exif_transpose 단계가 실제로 일하게 한다"""
+    from PIL import Image
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for fmt in formats:
+        for kind in kinds:
+            for mp_ in sizes:
+                path = os.path.join(folder, f"{kind}_{mp_:g}mp{FORMATS[fmt]}")
+                paths.append(path)
+                if os.path.exists(path):
+                    continue
+                w, h = image_size(mp_)
+                img = Image.fromarray(synth_array(kind, w, h))
+                exif = Image.Exif()
+                exif[0x0112] = 6
+                tmp = path + ".tmp"
+                img.save(tmp, "JPEG" if fmt == "jpeg" else "PNG", quality=90, exif=exif, compress_level=1)
+                os.replace(tmp, path)
+                print(f"생성: {path} ({w}x{h})", file=sys.stderr)
+    return paths
+
+
+# ============ 단계별 측정 (이미지마다 새 프로세스) ============
+def _timed(rec, stage, fn, *args):
+    reset_peak_rss()
+    base = rss_mb()
+    t0 = time.perf_counter()
+    out = fn(*args)
+    rec.setdefault(stage, []).append(((time.perf_counter() - t0) * 1000, peak_rss_mb() - base))
+    return out
+
+
+def _load(img):
+    img.load()
+    return img
+
+
+def _run_image(path, repeat, algorithm, out):
+    try:
+        out.put(_measure_image(path, repeat, algorithm))
+    except Exception as e:
+        # 이미지 하나가 실패해도(MemoryError 등) 부모가 기다리지 않게 실패한 확인 항목으로 보낸다
+        out.put({"rows": [], "checks": [{"image": os.path.basename(path), "check": "측정", "ok": False,
+                                         "value": f"{type(e).__name__}: {e}"}]})
+
+
+def _measure_image(path, repeat, algorithm):
+    import numpy as np
+    from PIL import Image, ImageOps
+    import palette
+    from colorspace import palette_distance, srgb_to_lab
+    from face_mask import segment
+
+    rec, checks = {}, []
+    for _ in range(repeat):
+        # 원래 경로: 전체 디코딩 → 회전 → 128px → 양자화 → 개수 세기 → 팔레트 → 스와치
+        img = _timed(rec, "decode", lambda: _load(Image.open(path)))
+        img = _timed(rec, "exif_transpose", ImageOps.exif_transpose, img)
+        small = _timed(rec, "resize_for_analysis", palette.resize_for_analysis, img, 128)
+        del img
+        arr = palette.to_numpy(small).reshape(-1, 3)
+        idx = _timed(rec, "quantize", palette.quantize_pixels, arr)
+        counts, sums = _timed(rec, "count", palette.count_bins, idx, arr)
+        colors = _timed(rec, "palette", palette.palette_from_histogram, counts, sums, 5, algorithm)
+        _timed(rec, "swatch_html", lambda: [palette.swatch_html(c) for c in colors])
+        # 최적화 경로
+        fast = _timed(rec, "open_for_analysis", palette.open_for_analysis, path, 128)
+        _timed(rec, "segment", segment, palette.to_numpy(fast))
+        if path.endswith(".png"):
+            _timed(rec, "stream_preview", lambda: palette.stream_preview(Image.open(path)))
+            streamed = _timed(rec, "stream_histogram", lambda: palette.stream_histogram(Image.open(path)))
+
+    # ---- 결과 일치 확인 ----
+    legacy = np.unique(arr >> 4, axis=0, return_counts=True)
+    legacy_idx = (legacy[0][:, 0].astype(np.int64) << 8) | (legacy[0][:, 1] << 4) | legacy[0][:, 2]
+    checks.append({"check": "quantize+count == np.unique",
+                   "ok": bool(np.array_equal(counts[legacy_idx], legacy[1]) and counts.sum() == len(arr))})
+
+    fast_colors = palette.palette_from_histogram(*palette.color_histogram(fast), k=5, algorithm=algorithm)
+    if colors and fast_colors:
+        lab = [srgb_to_lab(np.array(c)) for c in (colors, fast_colors)]
+        d = float(palette_distance(lab[0][None], np.ones((1, len(colors))),
+                                   lab[1][None], np.ones((1, len(fast_colors))))[0, 0])
+    else:
+        d = 0.0 if colors == fast_colors else float("inf")
+    limit = FAST_PALETTE_DELTA_E[os.path.splitext(path)[1]]
+    checks.append({"check": f"open_for_analysis 팔레트 ΔE <= {limit:g}", "ok": d <= limit, "value": round(d, 2)})
+
+    if path.endswith(".png") and streamed is not None:
+        full = Image.open(path).convert("RGB")
+        ref = palette.histogram_from_pixels(palette.to_numpy(full).reshape(-1, 3))
+        del full
+        checks.append({"check": "stream_histogram == 전체 디코딩",
+                       "ok": bool(np.array_equal(ref[0], streamed[0]) and np.allclose(ref[1], streamed[1]))})
+
+    rows = [{"image": os.path.basename(path), "stage": stage,
+             "ms": round(statistics.median(t for t, _ in v), 3), "peak_mb": round(max(m for _, m in v), 1)}
+            for stage, v in rec.items()]
+    return {"rows": rows, "checks": [{"image": os.path.basename(path), **c} for c in checks]}
+
+
+def measure(path, repeat, algorithm):
+    res, code = run_in_child(_run_image, path, repeat, algorithm)
+    if res is None:
+        res = {"rows": [], "checks": [{"image": os.path.basename(path), "check": "측정", "ok": False,
+                                       "value": f"측정 프로세스 종료 (exitcode {code})"}]}
+    return res
+
+
+# ============ 기준값 비교 ============
+def find_regressions(rows, baseline, tolerance=TOLERANCE):
+    base = {(r["image"], r["stage"]): r for r in baseline.get("results", [])}
+    flagged = []
+    for r in rows:
+        b = base.get((r["image"], r["stage"]))
+        if b is None:
+            continue
+        slow = r["ms"] > b["ms"] * (1 + tolerance) and r["ms"] - b["ms"] > MIN_MS_DELTA
+        fat = r["peak_mb"] > b["peak_mb"] * (1 + tolerance) and r["peak_mb"] - b["peak_mb"] > MIN_MB_DELTA
+        if slow or fat:
+            flagged.append({**r, "base_ms": b["ms"], "base_peak_mb": b["peak_mb"]})
+    return flagged
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="팔레트 분석 단계별 성능 테스트")
+    ap.add_argument("--kinds", nargs="+", default=list(KINDS), choices=KINDS)
+    ap.add_argument("--sizes", nargs="+", type=float, default=list(SIZES_MP), metavar="MP")
+    ap.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    ap.add_argument("--images", default=IMAGE_DIR, help="합성 이미지 폴더 (이미 있으면 재사용)")
+    ap.add_argument("--repeat", type=int, default=3, help="이미지당 반복 횟수 (시간은 중앙값)")
+    ap.add_argument("--algorithm", default="median_cut", choices=["simple", "median_cut", "kmeans"])
+    ap.add_argument("-o", "--output", default=RESULTS_PATH)
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = ap.parse_args(argv)
+
+    paths = generate(args.images, args.kinds, args.sizes, args.formats)
+    rows, checks = [], []
+    print(f"{'image':<22} {'stage':<20} {'ms':>10} {'peak MB':>8}")
+    for path in paths:
+        res = measure(path, args.repeat, args.algorithm)
+        rows += res["rows"]
+        checks += res["checks"]
+        for r in res["rows"]:
+            print(f"{r['image']:<22} {r['stage']:<20} {r['ms']:>10.2f} {r['peak_mb']:>8.1f}")
+
+    import numpy
+    import PIL
+    results = {
+        "meta": {"date": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+                 "pillow": PIL.__version__, "numpy": numpy.__version__, "cpu_count": os.cpu_count(),
+                 "machine": platform.machine(), "repeat": args.repeat, "algorithm": args.algorithm},
+        "results": rows,
+        "checks": checks,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=1)
+    print(f"결과 → {args.output}")
+
+    status = 0
+    failed = [c for c in checks if not c["ok"]]
+    for c in failed:
+        print(f"❌ {c['image']}: {c['check']} {c.get('value', '')}", file=sys.stderr)
+    print(f"결과 일치 확인 {len(checks) - len(failed)}/{len(checks)} 통과")
+    status |= bool(failed)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+        print(f"기준값 저장 → {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            flagged = find_regressions(rows, json.load(f), args.tolerance)
+        for r in flagged:
+            print(f"⚠️ 회귀: {r['image']} {r['stage']}: {r['base_ms']:.2f} → {r['ms']:.2f} ms, "
+                  f"{r['base_peak_mb']:.1f} → {r['peak_mb']:.1f} MB", file=sys.stderr)
+        print(f"기준값 대비 회귀 {len(flagged)}건")
+        status |= bool(flagged)
+    else:
+        print(f"기준값({args.baseline})이 없어 회귀 비교는 건너뜀 — 먼저 --save-baseline으로 저장하세요")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# 색상 최근접 인덱스 점검 — 격자 검색 결과가 전수 비교와 같은지, 카탈로그 범위 밖 색도 n개를 찾는지 확인한다
+# Run: python check_color_index.py
+
+import sys
+
+import numpy as np
+
+from check_common import Checker
+from color_index import ColorIndex
+from colorspace import srgb_to_lab
+
+
+def brute(lab, q, n):
+    d = np.sqrt(((lab[None] - q[:, None]) ** 2).sum(-1))
+    return np.sort(d, 1)[:, :n]
+
+
+def main():
+    check = Checker()
+
+    def deltas(index, q, n):
+        return np.array([[m["delta_e"] for m in row] for row in index.query(q, n=n)])
+
+    rng = np.random.default_rng(0)
+
+    # 1) 카탈로그 전체 색 범위 안 질의: 전수 비교와 같은 거리
+    lab = srgb_to_lab(rng.integers(0, 256, (5000, 3)))
+    index = ColorIndex.build(lab, {"product_id": np.arange(len(lab))})
+    q = srgb_to_lab(rng.integers(0, 256, (50, 3)))
+    check("범위 안 질의 = 전수 비교", np.allclose(deltas(index, q, 5), brute(lab, q, 5), atol=1e-3))
+
+    # 2) 어두운 색 3개뿐인 카탈로그에 노랑/흰색으로 질의 → 격자 밖에서 시작해도 3개 전부
+    dark = srgb_to_lab(np.array([[10, 10, 20], [20, 10, 10], [15, 15, 15]]))
+    small = ColorIndex.build(dark, {"product_id": np.array(["a", "b", "c"])})
+    far = srgb_to_lab(np.array([[255, 230, 0], [255, 255, 255]]))
+    got = deltas(small, far, 3)
+    check("범위 밖 질의도 n개", got.shape == (2, 3) and np.allclose(got, brute(dark, far, 3), atol=1e-3),
+          f"(ΔE {got[0].round(1).tolist()})")
+
+    # 3) 좁은 색 범위 카탈로그 + 무작위 질의 (대부분 범위 밖)
+    pastel = srgb_to_lab(rng.integers(200, 256, (2000, 3)))
+    narrow = ColorIndex.build(pastel, {"product_id": np.arange(len(pastel))})
+    check("좁은 카탈로그 + 범위 밖 질의 = 전수 비교", np.allclose(deltas(narrow, q, 3), brute(pastel, q, 3), atol=1e-3))
+    return check.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
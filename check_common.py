@@ -0,0 +1,60 @@
+# check_*.py 공용 도구 — ✅/❌ 출력과 종료 코드, 임시 폴더, 로컬 스텁 HTTP 서버
+
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+
+class Checker:
+    """check(이름, 조건, 설명)으로 한 줄씩 ✅/❌를 찍고, 하나라도 실패하면 exit_code가 1"""
+
+    def __init__(self):
+        self.ok = True
+
+    def __call__(self, name, cond, detail=""):
+        self.ok &= bool(cond)
+        print(f"{'✅' if cond else '❌'} {name} {detail}")
+        return bool(cond)
+
+    @property
+    def exit_code(self) -> int:
+        return 0 if self.ok else 1
+
+
+def scratch_dir(**env) -> tempfile.TemporaryDirectory:
+    """임시 폴더 하나. env의 각 이름=하위 경로를 환경 변수로 건다 (모듈 상수에 반영되도록 import 전에 부를 것)"""
+    tmp = tempfile.TemporaryDirectory()
+    for key, sub in env.items():
+        os.environ[key] = os.path.join(tmp.name, sub)
+    return tmp
+
+
+def start(handler) -> ThreadingHTTPServer:
+    """handler로 127.0.0.1 빈 포트에 스텁 서버를 띄운다 (데몬 스레드)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_thumb_stubs(tmp):
+    """스텁 위키 + 스텁 이미지 서버를 띄우고 wiki_thumbs/http_client를 그쪽으로 돌린다 → (wiki, images)"""
+    import http_client
+    import wiki_thumbs
+    from check_thumb_proxy import StubImages
+    from check_wiki_thumbs import StubWiki
+    http_client.get_client().retries = 0
+    wiki, images = start(StubWiki), start(StubImages)
+    StubWiki.thumb_url = f"http://127.0.0.1:{images.server_port}/img/blocks-{{name}}.jpg"
+    wiki_thumbs.WIKI_BASE_URL = f"http://127.0.0.1:{wiki.server_port}/{{lang}}"
+    wiki_thumbs.THUMB_CACHE_PATH = os.path.join(tmp.name, "thumbs.sqlite3")
+    return wiki, images
+
+
+def start_proxy():
+    """썸네일 프록시를 빈 포트에 띄우고 THUMB_PROXY_URL을 맞춘다"""
+    import thumb_proxy
+    proxy = thumb_proxy.start_server(port=0, host="127.0.0.1")
+    thumb_proxy.THUMB_PROXY_URL = f"http://127.0.0.1:{proxy.server_port}"
+    return proxy
@@ -0,0 +1,110 @@
+# 운세 달력 점검 — 벡터화한 MT19937/randint/sample이 random.Random과 똑같은지, 10년치 달력이
+# fortune.py 계산과 한 날짜도 다르지 않은지, 앱(DayCache)이 달력에서 찾아 쓰는지 확인한다
+# Run: python check_fortune_calendar.py
+
+import datetime as dt
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from check_common import Checker, scratch_dir
+
+
+def main():
+    tmp = scratch_dir()
+    import fortune
+    import fortune_calendar as fc
+    check = Checker()
+
+    # 1) MT19937: 시드 워드가 하나(2**32 미만)/둘인 경우 모두 random.Random 출력과 같다
+    seeds = [0, 5, 2**32 - 1, 2**32, 0x0123456789ABCDEF, 2**64 - 1]
+    words = fc.twist_temper(fc.seed_words(seeds))
+    expect = [[r.getrandbits(32) for _ in range(fc.N)] for r in map(random.Random, seeds)]
+    check("첫 624워드가 random.Random과 같음", all(words[:, k].tolist() == e for k, e in enumerate(expect)))
+    streams = fc.Streams(fc.seed_words(seeds))
+    rngs = [random.Random(s) for s in seeds]
+    got = [streams.randbelow(n).tolist() for n in (1, 2, 3, 5, 9, 46, 40, 1000)]
+    got.append(streams.sample_positions(3, 3).tolist())
+    want = [[r.randrange(n) for r in rngs] for n in (1, 2, 3, 5, 9, 46, 40, 1000)]
+    want.append([r.sample(range(3), 3) for r in rngs])
+    check("randbelow/sample 소비 순서가 같음", got == want)
+    streams.pos[:] = fc.Streams.WORDS - 1      # 앞 워드가 모자라면 624워드 전부 다시 만든다
+    rngs = [random.Random(s) for s in seeds]
+    for r in rngs:
+        for _ in range(fc.Streams.WORDS - 1):
+            r.getrandbits(32)
+    check("워드가 모자랄 때도 같음", [streams.randbelow(3).tolist() for _ in range(20)]
+          == [[r.randrange(3) for r in rngs] for _ in range(20)])
+
+    # 2) 10년치 만들기 + 전부 비교
+    start, days = dt.date(2025, 1, 1), 3652
+    path = os.path.join(tmp.name, "calendar.npz")
+    report = fc.build(path, start, days, workers=1)
+    check("10년 × 12별자리 만들기", report["days"] == days,
+          f"({report['seconds']:.2f}s, {report['dates_per_sec']:,.0f} 날짜/s, {report['bytes'] / 1024:.0f} KB, "
+          f"{report['bytes'] / days:.0f} B/일)")
+    cal = fc.load_calendar(path)
+    result = fc.verify(cal)
+    check("fortune.py 계산과 전부 같음 (랭킹 + 디테일 + tips)", not result["mismatch"], f"({len(result['mismatch'])}일 불일치)")
+    t0 = time.perf_counter()
+    for i in range(365):
+        d = start + dt.timedelta(days=i)
+        fortune.today_rank_all(d)
+        for s in fortune.SIGN_KO:
+            fortune.detail_fortune(s, d)
+    scalar = 365 / (time.perf_counter() - t0)
+    print(f"   한 날짜씩 계산: {scalar:,.0f} 날짜/s → 일괄 {report['dates_per_sec'] / scalar:.1f}배 (코어 {os.cpu_count()}개)")
+
+    # 3) 여러 프로세스로 나눠 만들어도 같은 파일 내용
+    path2 = os.path.join(tmp.name, "calendar2.npz")
+    report2 = fc.build(path2, start, days, workers=2, chunk_days=500)
+    with np.load(path) as a, np.load(path2) as b:
+        same = all(np.array_equal(a[c], b[c]) for c in fc.COLUMNS)
+    check("워커 2개 · 다른 chunk 크기 → 같은 결과", same, f"({report2['dates_per_sec']:,.0f} 날짜/s)")
+
+    # 4) 앱: 달력 범위 안은 해시 계산 없이, 범위 밖은 평소처럼 계산
+    import hashlib
+    calls = [0]
+    real_sha256 = hashlib.sha256
+
+    def counting_sha256(*a, **kw):
+        calls[0] += 1
+        return real_sha256(*a, **kw)
+
+    cache = fortune.DayCache(calendar=cal)
+    fortune.hashlib.sha256 = counting_sha256
+    try:
+        inside = cache.get(dt.date(2030, 6, 1))
+        inside_calls = calls[0]
+        outside = cache.get(dt.date(2040, 1, 1))
+    finally:
+        fortune.hashlib.sha256 = real_sha256
+    check("범위 안 날짜는 달력에서 (sha256 0회)", inside_calls == 0 and cache.stats["calendar"] == 1
+          and inside == (fortune.today_rank_all(dt.date(2030, 6, 1)),
+                         {s: fortune.detail_fortune(s, dt.date(2030, 6, 1)) for s in fortune.SIGN_KO}))
+    check("범위 밖 날짜는 계산", calls[0] > 0 and cache.stats["miss"] == 2 and len(outside[0]) == 12)
+    t0 = time.perf_counter()
+    for i in range(1000):
+        cal.day(start + dt.timedelta(days=i))
+    print(f"   달력에서 하루 찾기: {(time.perf_counter() - t0) * 1000:.1f} µs")
+
+    # 5) 없거나 깨졌거나 fortune.py 데이터가 바뀐 달력은 쓰지 않는다
+    broken = os.path.join(tmp.name, "broken.npz")
+    with open(broken, "wb") as f:
+        f.write(b"not a calendar")
+    real_colors = fc.LUCKY_COLORS
+    fc.LUCKY_COLORS = real_colors[::-1]
+    try:
+        stale = fc.load_calendar(path)
+    finally:
+        fc.LUCKY_COLORS = real_colors
+    check("없음/깨짐/데이터 바뀜 → None", fc.load_calendar(os.path.join(tmp.name, "nope.npz")) is None
+          and fc.load_calendar(broken) is None and stale is None)
+    return check.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
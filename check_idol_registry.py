@@ -0,0 +1,110 @@
+# 아이돌 레지스트리 점검 — 프리셋이 예전 IDOLS 필터와 같은지, 재시작 후에도 남는지, 여러 스레드/프로세스가
+# 동시에 써도 빠지거나 겹치지 않는지, 아이돌이 5만 명일 때도 페이지 조회가 빠른지 확인한다
+# Run: python check_idol_registry.py
+
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+
+from check_common import Checker, scratch_dir
+
+
+def _writer(path, prefix, n):
+    """다른 프로세스에서 한 명씩 추가 (Streamlit 서버 여러 개가 같은 파일을 쓸 때처럼)"""
+    from idol_registry import IdolRegistry
+    reg = IdolRegistry(path)
+    return sum(reg.add(f"{prefix}{i}", "PROC", "양자리") for i in range(n))
+
+
+def main():
+    tmp = scratch_dir()
+    from fortune import IDOLS, SIGN_KO
+    from idol_registry import IdolRegistry, page_count
+    path = os.path.join(tmp.name, "idols.sqlite3")
+    check = Checker()
+
+    # 1) 프리셋: 별자리/그룹 필터 결과가 예전 리스트 필터와 같다 (순서 포함)
+    reg = IdolRegistry(path)
+    same = all(reg.page(s, g, page_size=100)[0] == [i for i in IDOLS if i["sign"] == s and (not g or i["group"] in g)]
+               for s in SIGN_KO for g in (None, ["NCT", "RIIZE"], ["TWS"]))
+    check("프리셋 필터 = 예전 IDOLS 필터", same and len(reg) == len(IDOLS))
+    IdolRegistry(path)
+    check("다시 열어도 프리셋은 한 번만", len(reg) == len(IDOLS))
+
+    # 2) 추가한 아이돌은 재시작 후에도, 같은 (이름, 그룹)은 한 번만
+    first = reg.add("NEWBIE", "NCT WISH", "게자리")
+    again = reg.add("NEWBIE", "NCT WISH", "게자리")
+    other = reg.add("NEWBIE", "RIIZE", "게자리")
+    reopened = IdolRegistry(path)
+    check("추가 → 재시작 후에도 남음", first and other and not again
+          and [i["group"] for i in reopened.page("게자리", ["NCT WISH", "RIIZE"])[0]] == ["NCT WISH", "RIIZE"])
+    check("위키 제목 없으면 이름", reopened.page("게자리", ["NCT WISH"])[0][0]["wiki"] == "NEWBIE")
+
+    # 3) 동시 쓰기: 스레드 8개 + 프로세스 2개, 이름이 겹치는 추가는 한 번만 들어간다
+    results, errors = [], []
+
+    def thread_writer(t):
+        try:
+            results.append(sum(reg.add(f"T{i % 300}", "THREAD", "사자자리") for i in range(t, t + 150)))
+        except Exception as e:
+            errors.append(e)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=thread_writer, args=(t * 20,)) for t in range(8)]
+    with mp.get_context("spawn").Pool(2) as pool:
+        procs = pool.starmap_async(_writer, [(path, "P", 300), (path, "P", 300)])
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        proc_added = procs.get()
+    n_thread = reg.page("사자자리", ["THREAD"])[1]
+    n_proc = reg.page("양자리", ["PROC"])[1]
+    check("동시 쓰기 — 오류 없음, 빠짐/중복 없음", not errors and n_thread == sum(results) == 290
+          and n_proc == sum(proc_added) == 300, f"(스레드 {n_thread}, 프로세스 {n_proc}, {time.perf_counter() - t0:.2f}s)")
+
+    # 4) 5만 명: 페이지 조회는 색인으로, 예전 리스트 필터보다 빠르다
+    groups = [f"G{g:03d}" for g in range(200)]
+    bulk = [{"name": f"Idol {i}", "group": groups[i % len(groups)], "sign": SIGN_KO[(i * 7) % 12]} for i in range(50_000)]
+    t0 = time.perf_counter()
+    reg.add_many(bulk)
+    print(f"   5만 명 추가: {time.perf_counter() - t0:.2f}s, 전체 {len(reg)}명")
+    big = IDOLS + bulk
+    want = ["G007", "G042", "NCT"]
+    t0 = time.perf_counter()
+    for _ in range(100):
+        rows, total = reg.page("물고기자리", want)
+    db_ms = (time.perf_counter() - t0) * 10
+    t0 = time.perf_counter()
+    for _ in range(100):
+        old = [i for i in big if i["sign"] == "물고기자리" and i["group"] in want][:12]
+    list_ms = (time.perf_counter() - t0) * 10
+    check("별자리+그룹 첫 페이지 — 리스트 필터보다 빠름", rows == [dict(i, wiki=i.get("wiki") or i["name"]) for i in old]
+          and db_ms < list_ms,
+          f"({db_ms:.2f} ms, 예전 리스트 필터 {list_ms:.2f} ms, {total}명)")
+    t0 = time.perf_counter()
+    for _ in range(100):
+        rows, total = reg.page("물고기자리", page=page_count(reg.page("물고기자리")[1]) - 1)
+    check("별자리만, 마지막 페이지", 0 < len(rows) <= 12, f"({(time.perf_counter() - t0) * 10:.2f} ms, 전체 {total}명)")
+    plan = " ".join(r[-1] for r in reg._conn().execute(
+        "EXPLAIN QUERY PLAN SELECT name FROM idols WHERE sign = ? ORDER BY id LIMIT 12", ("양자리",)))
+    check("별자리 페이지는 (sign, id) 색인 순서 그대로 (정렬 없음)", "idols_sign" in plan and "TEMP B-TREE" not in plan,
+          f"({plan})")
+
+    # 5) 페이지를 끝까지 넘기면 빠짐/중복 없이 전부
+    seen, page = [], 0
+    while True:
+        rows, total = reg.page("처녀자리", page=page, page_size=500)
+        if not rows:
+            break
+        seen += [(r["name"], r["group"]) for r in rows]
+        page += 1
+    check("페이지 전체 = 별자리 전체", len(seen) == len(set(seen)) == total and page == page_count(total, 500))
+    check("그룹 목록", set(groups) <= set(reg.groups()) and "PROC" in reg.groups())
+    return check.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# 오프라인 썸네일 번들 점검 — 스텁 위키/이미지 서버로 번들을 만들고, 네트워크 없이 카드가 나오는지 확인한다
+# Run: python check_thumb_bundle.py
+
+import base64
+import io
+import os
+import sys
+import time
+
+import requests
+from PIL import Image
+
+from check_common import Checker, scratch_dir, start_thumb_stubs
+
+
+def main():
+    tmp = scratch_dir(THUMB_PROXY_DIR="proxy")
+    import http_client
+    import thumb_bundle
+    import thumb_proxy
+    import wiki_thumbs
+    wiki, images = start_thumb_stubs(tmp)
+    path = os.path.join(tmp.name, "thumbs.bundle")
+    check = Checker()
+
+    # 1) 만들기: 프리셋 전부 + 썸네일 없는 제목 하나 + 조회 실패 제목 하나
+    presets = thumb_bundle.preset_titles()
+    t0 = time.perf_counter()
+    report = thumb_bundle.build(path, presets + ["missing:Nobody"], workers=4)
+    check("프리셋 전부 번들에", report["images"] == len(presets) and not report["failed"],
+          f"({report['images']}개, {report['bytes'] / 1024:.0f} KB, {time.perf_counter() - t0:.1f}s)")
+    check("썸네일 없는 제목은 null로 기록", report["no_image"] == 1)
+    report_fail = thumb_bundle.build(os.path.join(tmp.name, "fail.bundle"), ["fail:Xiaojun", "Hendery"])
+    check("조회 실패 제목은 빼고 보고", [t for t, _ in report_fail["failed"]] == ["fail:Xiaojun", "Hendery"])
+
+    # 2) mmap으로 열기
+    t0 = time.perf_counter()
+    bundle = thumb_bundle.load_bundle(path)
+    ms = (time.perf_counter() - t0) * 1000
+    check("번들 열기", bundle is not None and all(t in bundle for t in presets), f"({ms:.1f} ms, {len(bundle.blobs)}개 이미지)")
+    img = Image.open(io.BytesIO(bundle.blob(bundle.titles[presets[0]])))
+    check("이미지는 카드 크기 WebP", img.format == "WEBP" and img.size == thumb_proxy.CARD_SIZE)
+
+    # 3) 오프라인: 위키/이미지 서버를 끄고도 프리셋 카드가 나온다, 네트워크 요청 없음
+    wiki.shutdown()
+    images.shutdown()
+    wiki_thumbs.WIKI_BASE_URL = "http://127.0.0.1:9/{lang}"
+    before = http_client.get_client().snapshot()
+    proxy = thumb_proxy.start_server(port=0, host="127.0.0.1", bundle=bundle)
+    thumb_proxy.THUMB_PROXY_URL = f"http://127.0.0.1:{proxy.server_port}"
+    t0 = time.perf_counter()
+    urls = bundle.thumbs(presets + ["missing:Nobody"])
+    ms = (time.perf_counter() - t0) * 1000
+    check("프리셋 전부 프록시 주소, 없음은 None",
+          all(urls[t].startswith(thumb_proxy.THUMB_PROXY_URL) for t in presets) and urls["missing:Nobody"] is None,
+          f"({ms:.2f} ms)")
+    check("외부 요청 0건", http_client.get_client().snapshot() == before)
+    r = requests.get(urls[presets[0]], timeout=5)
+    check("프록시가 번들에서 서빙", r.status_code == 200 and r.content == bundle.blob(bundle.titles[presets[0]])
+          and r.headers["Cache-Control"] == thumb_proxy.CACHE_CONTROL)
+    inline = bundle.thumbs(presets[:1], inline=True)[presets[0]]
+    check("프록시 없이 data: URI", base64.b64decode(inline.split(",", 1)[1]) == bundle.blob(bundle.titles[presets[0]]))
+    taken = thumb_proxy.start_server(port=proxy.server_port, host="127.0.0.1")   # 포트를 다른 서버가 쓰는 중
+    cards = thumb_bundle.card_thumbs(presets[:3], bundle, deadline=0.5, proxy=taken)
+    check("프록시 서버를 못 띄우면 주소를 바꾸지 않음 (data: URI)",
+          taken is None and all(u.startswith("data:image/webp") for u in cards.values()))
+
+    # 4) 번들에 없는 제목만 실시간 (오프라인이면 마감 안에 None)
+    t0 = time.perf_counter()
+    live = wiki_thumbs.fetch_thumbs([t for t in presets + ["Custom idol"] if t not in urls], deadline=2)
+    check("번들 밖 제목만 실시간 조회", list(live) == ["Custom idol"] and live["Custom idol"] is None,
+          f"({time.perf_counter() - t0:.2f}s)")
+
+    # 5) 없거나 깨진 번들 → None (전부 실시간)
+    broken = os.path.join(tmp.name, "broken.bundle")
+    with open(broken, "wb") as f:
+        f.write(b"not a bundle" * 4)
+    check("없거나 깨진 번들은 None",
+          thumb_bundle.load_bundle(os.path.join(tmp.name, "nope.bundle")) is None and thumb_bundle.load_bundle(broken) is None)
+
+    proxy.shutdown()
+    bundle.close()
+    return check.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
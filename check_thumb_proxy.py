@@ -0,0 +1,143 @@
+# 썸네일 프록시 점검 — 로컬 스텁 이미지 서버로 내려받기/변환/서빙을 확인한다
+# Run: python check_thumb_proxy.py
+# 스텁 경로: /img/<이름>.jpg (큰 JPEG), /img/<이름>.png, /img/broken.jpg (이미지 아님), /img/gone.jpg (404),
+#           ?sleep=초 를 붙이면 늦게 응답한다. <종류>-<아무 이름>.jpg 는 이름마다 다른 그림 (gradient만 항상 같다)
+
+import io
+import os
+import zlib
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from PIL import Image
+
+from bench_stages import synth_array
+from check_common import Checker, scratch_dir, start, start_proxy
+
+SOURCE_SIZE = (2000, 1500)
+
+
+def _encode(kind: str, fmt: str, seed: int = 0) -> bytes:
+    buf = io.BytesIO()
+    Image.fromarray(synth_array(kind, *SOURCE_SIZE, seed=seed)).save(buf, fmt, quality=90)
+    return buf.getvalue()
+
+
+class StubImages(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    images = {}
+    log = []
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        with self.lock:
+            self.log.append(url.path)
+        time.sleep(float(parse_qs(url.query).get("sleep", ["0"])[0]))
+        name = url.path.rsplit("/", 1)[-1]
+        kind, _, rest = name.rsplit(".", 1)[0].partition("-")
+        seed = zlib.crc32(rest.encode())
+        if name == "broken.jpg":
+            body, ctype = b"not an image", "image/jpeg"
+        elif kind in ("gradient", "noise", "blocks"):
+            fmt = "PNG" if name.endswith(".png") else "JPEG"
+            key = (kind, fmt, seed)
+            if key not in self.images:
+                self.images[key] = _encode(kind, fmt, seed)
+            body, ctype = self.images[key], f"image/{fmt.lower()}"
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    tmp = scratch_dir(THUMB_PROXY_DIR="proxy")  # noqa: F841  (main이 끝날 때까지 지우지 않는다)
+    import http_client
+    import thumb_proxy
+    http_client.get_client().retries = 0
+    stub = start(StubImages)
+    src = f"http://127.0.0.1:{stub.server_port}/img"
+    proxy = start_proxy()
+    check = Checker()
+
+    # 1) 변환: 카드 크기 WebP, 바이트 비교
+    thumbs = {"A": f"{src}/gradient.jpg", "B": f"{src}/noise.jpg", "C": f"{src}/blocks.png", "D": None}
+    t0 = time.perf_counter()
+    out = thumb_proxy.proxy_thumbs(thumbs, deadline=10)
+    sec = time.perf_counter() - t0
+    local = {t: u for t, u in out.items() if u and u.startswith(thumb_proxy.THUMB_PROXY_URL)}
+    check("원본 이미지 3개 → 로컬 주소", len(local) == 3 and out["D"] is None, f"({sec * 1000:.0f} ms)")
+    for t in ("A", "B", "C"):
+        r = requests.get(out[t], timeout=5)
+        img = Image.open(io.BytesIO(r.content))
+        orig = len(requests.get(thumbs[t], timeout=5).content)
+        check(f"{t}: {img.format} {img.size}", img.format == "WEBP" and img.size == thumb_proxy.CARD_SIZE,
+              f"{orig / 1024:.0f} KB → {len(r.content) / 1024:.1f} KB ({len(r.content) / orig:.1%})")
+
+    # 2) 서빙 헤더
+    r = requests.get(out["A"], timeout=5)
+    check("Cache-Control 1년 immutable", r.headers.get("Cache-Control") == thumb_proxy.CACHE_CONTROL)
+    check("Content-Type image/webp", r.headers.get("Content-Type") == "image/webp")
+    r2 = requests.get(out["A"], headers={"If-None-Match": r.headers["ETag"]}, timeout=5)
+    check("ETag 재검증 → 304", r2.status_code == 304 and not r2.content)
+    bad = [requests.get(f"{thumb_proxy.THUMB_PROXY_URL}{p}", timeout=5).status_code
+           for p in ("/thumbs/../check_thumb_proxy.py", "/thumbs/" + "0" * 40 + ".webp", "/etc/passwd")]
+    check("잘못된 경로/없는 파일 → 404", bad == [404, 404, 404], f"{bad}")
+
+    # 3) 두 번째 페이지는 원본 서버에 가지 않는다 (by-url 색인)
+    n = len(StubImages.log)
+    t0 = time.perf_counter()
+    again = thumb_proxy.proxy_thumbs(thumbs)
+    check("이미 변환한 이미지는 색인에서", again == out and len(StubImages.log) == n,
+          f"({(time.perf_counter() - t0) * 1000:.1f} ms)")
+
+    # 4) 내용 해시: URL이 달라도 같은 그림이면 파일 하나
+    dup = thumb_proxy.proxy_thumbs({"A2": f"{src}/gradient-copy.jpg"}, deadline=10)
+    check("같은 내용 → 같은 파일", dup["A2"] == out["A"])
+
+    # 5) 실패/지연은 원본 URL로 그린다
+    bad_src = {"X": f"{src}/broken.jpg", "Y": f"{src}/gone.jpg", "Z": f"{src}/blocks.jpg?sleep=1.0"}
+    t0 = time.perf_counter()
+    res = thumb_proxy.proxy_thumbs(bad_src, deadline=0.3)
+    check("변환 실패/지연 카드는 원본 URL, 마감 지킴", res == bad_src, f"({time.perf_counter() - t0:.2f}s)")
+    time.sleep(1.0)
+    n = len(StubImages.log)
+    res = thumb_proxy.proxy_thumbs(bad_src, deadline=0)
+    check("늦게 끝난 변환은 다음 페이지에서 로컬", res["Z"].endswith(".webp"))
+    check("실패한 원본은 FAILURE_TTL 동안 다시 받지 않음", res["X"] == bad_src["X"] and len(StubImages.log) == n)
+
+    # 6) 같은 URL을 여러 세션이 동시에 요청해도 원본은 한 번만
+    url = f"{src}/noise-shared.jpg?sleep=0.3"
+    n = len(StubImages.log)
+    threads = [threading.Thread(target=thumb_proxy.proxy_thumbs, args=({"S": url},), kwargs={"deadline": 5})
+               for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    check("동시 16개 세션 → 원본 1번", len(StubImages.log) - n == 1, f"({len(StubImages.log) - n}번)")
+
+    files = [f for f in os.listdir(thumb_proxy.THUMB_PROXY_DIR) if f.endswith(".webp")]
+    size = sum(os.path.getsize(os.path.join(thumb_proxy.THUMB_PROXY_DIR, f)) for f in files)
+    print(f"저장된 WebP {len(files)}개, {size / 1024:.1f} KB")
+    proxy.shutdown()
+    stub.shutdown()
+    return check.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+# 워밍업 점검 — 스텁 위키/이미지 서버로 서버 시작 워밍업을 돌려 보고, 첫 방문자가 할 일이 남지 않는지 확인한다
+# Run: python check_warmup.py
+
+import datetime as dt
+import random
+import sys
+import threading
+import time
+
+from check_common import Checker, scratch_dir, start_proxy, start_thumb_stubs
+from check_thumb_proxy import StubImages
+from check_wiki_thumbs import StubWiki
+
+
+def legacy_detail(sign, date):
+    """예전 detail_fortune의 첫 rng 값 네 개 (tips는 원래 전역 random이라 rng 순서에 없다)"""
+    from fortune import seed_by_date
+    rng = seed_by_date(sign, date)
+    return [rng.randint(60, 99) for _ in range(4)]
+
+
+def main():
+    tmp = scratch_dir(THUMB_PROXY_DIR="proxy")
+    import fortune
+    import thumb_proxy
+    import warmup
+    wiki, images = start_thumb_stubs(tmp)
+    proxy = start_proxy()
+    check = Checker()
+
+    # 1) 운세는 (별자리, 날짜)의 순수 함수 — 추천(tips)도 같은 날엔 같고, 나머지 값은 예전과 같은 순서
+    day = dt.date(2025, 3, 1)
+    a, b = fortune.detail_fortune("양자리", day), fortune.detail_fortune("양자리", day)
+    check("같은 날 같은 별자리 → 같은 결과 (tips 포함)", a == b)
+    rolls = legacy_detail("양자리", day)
+    check("사랑/금전/학업/건강 값은 예전 rng 순서 그대로", [a["love"], a["money"], a["study"], a["health"]] == rolls)
+    random.seed(1)
+    before = random.random()
+    random.seed(1)
+    fortune.detail_fortune("게자리", day)
+    check("전역 random 상태를 건드리지 않음", random.random() == before)
+
+    # 2) 서버 시작 워밍업: 위키가 느려도(0.3s) 요청은 기다리지 않고 처리된다
+    StubWiki.delay = 0.3
+    today = fortune.fortune_today()
+    fortune.day_cache.clear()
+    w = warmup.Warmup(proxy=proxy).start()
+    time.sleep(0.05)
+    t0 = time.perf_counter()
+    rankings, fortunes = fortune.day_fortunes(today)
+    ms = (time.perf_counter() - t0) * 1000
+    check("워밍업 중에도 랭킹/운세 바로 나옴", len(rankings) == 12 and len(fortunes) == 12,
+          f"({w.snapshot()['state']}, {ms:.1f} ms)")
+    while w.snapshot()["state"] != "done":
+        time.sleep(0.05)
+    status = w.snapshot()
+    check("워밍업 완료: 운세 12/12, 썸네일 전부", status["fortunes"] == 12 and status["thumbs"] == status["thumbs_total"] > 0,
+          f"{status}")
+    StubWiki.delay = 0.0
+
+    # 3) 첫 방문자: 계산/조회할 게 남아 있지 않다
+    hits = fortune.day_cache.stats["hit"]
+    fortune.day_fortunes(today)
+    check("랭킹/운세는 캐시에서", fortune.day_cache.stats["hit"] == hits + 1)
+    from thumb_bundle import card_thumbs
+    n_wiki, n_img = len(StubWiki.requests_log), len(StubImages.log)
+    page = fortune.CELEB_BY_SIGN["물고기자리"] + [i["wiki"] for i in fortune.IDOLS if i["sign"] == "물고기자리"]
+    t0 = time.perf_counter()
+    thumbs = card_thumbs(page, proxy=proxy)
+    ms = (time.perf_counter() - t0) * 1000
+    check("카드 썸네일은 외부 요청 없이 로컬 WebP", len(StubWiki.requests_log) == n_wiki and len(StubImages.log) == n_img
+          and all(u.startswith(thumb_proxy.THUMB_PROXY_URL) for u in thumbs.values()), f"({ms:.1f} ms)")
+
+    # 4) 다음 자정까지 남은 시간
+    check("자정까지 남은 시간", warmup.seconds_until_midnight(dt.datetime(2025, 3, 1, 23, 59, 30)) == 30
+          and warmup.seconds_until_midnight(dt.datetime(2025, 3, 1, 0, 0, 0)) == 86400)
+
+    # 5) 워밍업이 실패해도 스레드는 살아 있고 오류를 남긴다
+    broken = warmup.Warmup(bundle=object())   # thumbs()가 없는 번들 → 예외
+    status = broken.run_once(today)
+    check("실패는 status.error로", status["state"] == "done" and status["error"] and status["fortunes"] == 12,
+          f"({status['error']})")
+    check("워밍업 스레드는 데몬 하나", sum(t.name == "warmup" for t in threading.enumerate()) == 1)
+
+    # 6) 날짜 캐시: 다시 그릴 때 해시 계산 0회, 자정에 다음 날로, 지난 날짜는 지움
+    import hashlib
+    calls = [0]
+    real_sha256 = hashlib.sha256
+
+    def counting_sha256(*a, **kw):
+        calls[0] += 1
+        return real_sha256(*a, **kw)
+
+    fortune.day_cache.clear()
+    fortune.day_fortunes(today)
+    fortune.hashlib.sha256 = counting_sha256
+    try:
+        t0 = time.perf_counter()
+        for _ in range(1000):
+            fortune.day_fortunes()
+        cached_us = (time.perf_counter() - t0) * 1000
+        check("재실행 1000번 → sha256 0회", calls[0] == 0, f"({cached_us:.1f} µs/회)")
+        t0 = time.perf_counter()
+        for _ in range(100):
+            fortune.today_rank_all(today)
+            fortune.detail_fortune("양자리", today)
+        print(f"   캐시 없이 랭킹+디테일 한 번: {(time.perf_counter() - t0) * 10000:.1f} µs, sha256 {calls[0] // 100}회")
+    finally:
+        fortune.hashlib.sha256 = real_sha256
+
+    real_today = fortune.fortune_today
+    fortune.day_cache.clear()
+    try:
+        for i in range(10):   # 열흘 동안 매일 자정 넘김
+            d = dt.date(2025, 3, 1) + dt.timedelta(days=i)
+            fortune.fortune_today = lambda d=d: d
+            fortune.day_fortunes()
+            fortune.day_fortunes(d - dt.timedelta(days=1))   # 자정 전에 연 페이지
+        check("자정마다 새 날짜, 오늘+어제만 보관", fortune.day_cache.dates() == [dt.date(2025, 3, 9), dt.date(2025, 3, 10)]
+              and fortune.day_cache.stats["evicted"] == 9, f"{fortune.day_cache.stats}")
+        fortune.fortune_today = lambda: dt.date(2025, 3, 10)
+        for i in range(20):   # 지난 날짜를 마구 넘겨도 MAX_DAYS 이하
+            fortune.day_fortunes(dt.date(2030, 1, 1) + dt.timedelta(days=i))
+        check("보관 날짜 수 상한", len(fortune.day_cache.dates()) <= fortune.MAX_DAYS, f"({len(fortune.day_cache.dates())})")
+    finally:
+        fortune.fortune_today = real_today
+        fortune.day_cache.clear()
+
+    # 7) 시간대: UTC 15:00 = 서울 다음 날 0시
+    utc = dt.datetime(2025, 3, 1, 15, 0, tzinfo=dt.timezone.utc)
+    check("FORTUNE_TZ 기준 날짜", utc.astimezone(fortune.ZoneInfo("Asia/Seoul")).date() == dt.date(2025, 3, 2)
+          and fortune.fortune_now().utcoffset() == dt.timedelta(hours=9), f"(FORTUNE_TZ={fortune.FORTUNE_TZ})")
+    kst = dt.datetime(2025, 3, 1, 23, 59, 30, tzinfo=fortune.ZoneInfo("Asia/Seoul"))
+    check("서울 자정까지 남은 시간", warmup.seconds_until_midnight(kst) == 30)
+
+    proxy.shutdown()
+    wiki.shutdown()
+    images.shutdown()
+    return check.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+# 위키 썸네일 가져오기 점검 — 로컬 스텁 서버(MediaWiki action API 흉내)로 확인한다
+# Run: python check_wiki_thumbs.py
+# 제목 접두어로 스텁 동작을 고른다:
+#   묶음 전체 — slow: (늦게 응답), hang: (마감보다 훨씬 늦게), fail: (500)
+#   제목 하나 — missing: (문서 없음), nothumb: (썸네일 없음), redirect: (다른 문서로 넘겨주기)
+#   첫 글자가 소문자인 영문 제목은 대문자로 정규화해서 돌려준다 (실제 위키와 같다).
+# StubWiki.delay로 API 응답을 늦춰서 동시 세션 부하 테스트(10번)를 한다.
+# http_client 점검용 경로: /flaky/<키>/<n> (처음 n번 503), /down (항상 503), /ok?sleep=초,
+#                         /truncated (응답 도중 끊김)
+
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+from check_common import Checker, scratch_dir, start
+
+SLOW_SEC = 1.0
+HANG_SEC = 8.0
+
+
+class StubWiki(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+    requests_log = []        # (lang, 제목 수)
+    lock = threading.Lock()
+    flaky = {}               # 키 → 지금까지 받은 횟수
+    ports = set()            # 클라이언트 연결(포트) — 연결 재사용 확인용
+    in_flight = 0
+    max_in_flight = 0
+    delay = 0.0              # API 응답 지연(초)
+    thumb_url = "https://img.test/{name}.jpg"
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        with self.lock:
+            StubWiki.ports.add(self.client_address[1])
+        if not url.path.endswith("/api.php"):
+            return self._client_test(url)
+        # /{lang}/w/api.php?action=query&titles=A|B|...
+        lang = url.path.split("/")[1]
+        titles = parse_qs(url.query).get("titles", [""])[0].split("|")
+        with self.lock:
+            self.requests_log.append((lang, len(titles)))
+        kinds = {t.split(":", 1)[0] for t in titles if ":" in t}
+        try:
+            time.sleep(self.delay)
+            if "slow" in kinds:
+                time.sleep(SLOW_SEC)
+            if "hang" in kinds:
+                time.sleep(HANG_SEC)
+            if "fail" in kinds or len(titles) > 50:
+                return self._json(500, {"error": "boom"})
+            self._json(200, {"batchcomplete": True, "query": self._query(titles)})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _client_test(self, url):
+        parts = url.path.strip("/").split("/")
+        if parts[0] == "flaky":
+            with self.lock:
+                n = self.flaky[parts[1]] = self.flaky.get(parts[1], 0) + 1
+            return self._json(503 if n <= int(parts[2]) else 200, {"n": n})
+        if parts[0] == "down":
+            return self._json(503, {})
+        if parts[0] == "truncated":      # Content-Length보다 짧게 보내고 끊기 → ChunkedEncodingError
+            self.send_response(200)
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            self.wfile.write(b"{}")
+            self.close_connection = True
+            return
+        with self.lock:
+            StubWiki.in_flight += 1
+            StubWiki.max_in_flight = max(StubWiki.max_in_flight, StubWiki.in_flight)
+        time.sleep(float(parse_qs(url.query).get("sleep", ["0"])[0]))
+        with self.lock:
+            StubWiki.in_flight -= 1
+        self._json(200, {})
+
+    @classmethod
+    def _query(cls, titles):
+        normalized, redirects, pages = [], [], []
+        for t in titles:
+            name = t
+            if ":" not in name and name[:1].isascii() and name[:1].islower():
+                name = name[0].upper() + name[1:]
+                normalized.append({"from": t, "to": name})
+            if name.startswith("redirect:"):
+                target = name.split(":", 1)[1] + " (target)"
+                redirects.append({"from": name, "to": target})
+                name = target
+            if name.startswith("missing:"):
+                pages.append({"title": name, "missing": True})
+            elif name.startswith("nothumb:"):
+                pages.append({"pageid": 1, "title": name})
+            else:
+                pages.append({"pageid": 1, "title": name,
+                              "thumbnail": {"source": cls.thumb_url.format(name=name), "width": 320, "height": 400}})
+        q = {"pages": pages}
+        if normalized:
+            q["normalized"] = normalized
+        if redirects:
+            q["redirects"] = redirects
+        return q
+
+
+def round_trips(fn):
+    """fn 실행 동안 스텁이 받은 요청 목록과 걸린 시간"""
+    n = len(StubWiki.requests_log)
+    t0 = time.perf_counter()
+    out = fn()
+    return out, StubWiki.requests_log[n:], time.perf_counter() - t0
+
+
+def main():
+    server = start(StubWiki)
+    import http_client
+    import wiki_thumbs
+    from fortune import CELEB_BY_SIGN, IDOLS
+    wiki_thumbs.WIKI_BASE_URL = f"http://127.0.0.1:{server.server_port}/{{lang}}"
+    http_client.get_client().retries = 0   # 위키 점검은 재시도 없이 (재시도는 9번에서 따로)
+    tmp = scratch_dir()
+    wiki_thumbs.THUMB_CACHE_PATH = os.path.join(tmp.name, "thumbs.sqlite3")
+    check = Checker()
+
+    # 1) 전체 카드 워밍: 제목 ~40개 → 언어별 한 묶음씩
+    titles = [i.get("wiki") or i["name"] for i in IDOLS] + [n for v in CELEB_BY_SIGN.values() for n in v]
+    thumbs, log, sec = round_trips(lambda: wiki_thumbs.fetch_thumbs(titles, deadline=5))
+    check("IDOLS + CELEB_BY_SIGN 워밍 왕복 <= 3", len(log) <= 3,
+          f"({len(set(titles))}개 제목 → {len(log)}회 {log}, {sec * 1000:.0f} ms)")
+    check("모든 카드에 썸네일", all(thumbs.values()))
+    _, log, sec = round_trips(lambda: wiki_thumbs.fetch_thumbs(titles))
+    check("두 번째는 캐시에서", not log, f"({sec * 1000:.1f} ms)")
+
+    # 2) 50개씩 나누기
+    many = [f"Title {i}" for i in range(120)] + [f"제목 {i}" for i in range(10)]
+    thumbs, log, _ = round_trips(lambda: wiki_thumbs.fetch_thumbs(many, deadline=5))
+    check("130개 → 50개씩 4회", sorted(n for _, n in log) == [10, 20, 50, 50], f"{log}")
+    check("묶음 결과를 제목별로", all(thumbs[t] == f"https://img.test/{t}.jpg" for t in many))
+
+    # 3) 정규화/넘겨주기/없음 매핑
+    odd = ["haechan", "redirect:Mark", "missing:Nobody", "nothumb:Sungchan", "redirect:missing:Ghost"]
+    thumbs = wiki_thumbs.fetch_thumbs(odd, deadline=5)
+    check("정규화된 제목 매핑", thumbs["haechan"] == "https://img.test/Haechan.jpg")
+    check("넘겨주기 매핑", thumbs["redirect:Mark"] == "https://img.test/Mark (target).jpg")
+    check("없는 문서/썸네일은 None", thumbs["missing:Nobody"] is None and thumbs["nothumb:Sungchan"] is None)
+
+    # 4) 마감: 한 언어 묶음이 멈춰도 다른 묶음은 그려진다
+    stuck = ["hang:Wonbin", "Anton", "원빈", "slow:아이유"]
+    thumbs, log, sec = round_trips(lambda: wiki_thumbs.fetch_thumbs(stuck, deadline=2.0))
+    check("마감 안에 끝남", sec < 2.3, f"({sec:.2f}s)")
+    check("멈춘 묶음은 None, 느린 묶음은 도착",
+          thumbs["hang:Wonbin"] is None and thumbs["Anton"] is None and thumbs["원빈"] and thumbs["slow:아이유"])
+
+    # 5) 요청 실패는 ERROR_TTL 동안만 None으로 기억 → 그 뒤 다시 시도
+    wiki_thumbs.ERROR_TTL = 0.3
+    thumbs = wiki_thumbs.fetch_thumbs(["fail:Yuta", "Yuta"], deadline=2)
+    _, log, _ = round_trips(lambda: wiki_thumbs.fetch_thumbs(["fail:Yuta", "Yuta"], deadline=2))
+    check("실패한 묶음은 None, 잠깐은 다시 요청하지 않음", thumbs["Yuta"] is None and not log)
+    time.sleep(0.4)
+    _, log, _ = round_trips(lambda: wiki_thumbs.fetch_thumbs(["fail:Yuta", "Yuta"], deadline=2))
+    check("ERROR_TTL 뒤 재시도", len(log) == 1)
+
+    # 6) 없음(None)은 NEGATIVE_TTL 동안 캐시, 지나면 다시 조회
+    cache = wiki_thumbs.get_cache()
+    _, log, _ = round_trips(lambda: wiki_thumbs.fetch_thumbs(["missing:Nobody"]))
+    check("없음도 캐시됨", not log)
+    cache.put({"missing:Nobody": None}, now=time.time() - wiki_thumbs.NEGATIVE_TTL - 1)
+    _, log, _ = round_trips(lambda: wiki_thumbs.fetch_thumbs(["missing:Nobody"], deadline=2))
+    check("NEGATIVE_TTL 뒤 재조회", len(log) == 1)
+
+    # 7) 만료된 URL은 바로 돌려주고 뒤에서 갱신
+    cache.put({"Doyoung": "https://old.test/Doyoung.jpg"}, now=time.time() - wiki_thumbs.THUMB_TTL - 1)
+    thumbs, _, sec = round_trips(lambda: wiki_thumbs.fetch_thumbs(["Doyoung"], deadline=2))
+    check("만료된 URL을 기다리지 않고 반환", thumbs["Doyoung"] == "https://old.test/Doyoung.jpg", f"({sec * 1000:.0f} ms)")
+    time.sleep(0.3)
+    check("백그라운드 갱신 후 새 URL", wiki_thumbs.fetch_thumbs(["Doyoung"])["Doyoung"] == "https://img.test/Doyoung.jpg")
+    cache.put({"Doyoung": "https://old.test/Doyoung.jpg"},
+              now=time.time() - wiki_thumbs.THUMB_TTL - wiki_thumbs.MAX_STALE - 1)
+    thumbs = wiki_thumbs.fetch_thumbs(["Doyoung"], deadline=2)
+    check("MAX_STALE 지난 URL은 버리고 다시 조회", thumbs["Doyoung"] == "https://img.test/Doyoung.jpg")
+
+    # 8) 다른 프로세스(재시작)에서도 캐시 사용 — 위키에 닿을 수 없어도 썸네일이 나온다
+    code = ("import json, wiki_thumbs; "
+            f"print(json.dumps(wiki_thumbs.fetch_thumbs({titles!r}, deadline=1)))")
+    env = {**os.environ, "WIKI_THUMB_CACHE": wiki_thumbs.THUMB_CACHE_PATH, "WIKI_BASE_URL": "http://127.0.0.1:9/{lang}"}
+    res = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=60,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    other = json.loads(res.stdout or "{}")
+    check("재시작 후에도 캐시에서", other and all(other.values()), f"({sum(map(bool, other.values()))}/{len(titles)})")
+    print("캐시 통계", wiki_thumbs.cache_stats())
+
+    # 9) 공유 HTTP 클라이언트: 재시도/백오프, 서킷 브레이커, 연결 재사용, 동시 요청 제한
+    base = f"http://127.0.0.1:{server.server_port}"
+    http_client.BACKOFF_BASE = 0.05
+    client = http_client.HttpClient(max_concurrency=4, retries=2)
+    r = client.get(f"{base}/flaky/a/2", timeout=2)
+    check("503 두 번 뒤 세 번째에 성공", r.status_code == 200 and r.json()["n"] == 3,
+          f"{client.snapshot()[f'127.0.0.1:{server.server_port}']}")
+    try:
+        client.get(f"{base}/flaky/b/5", timeout=2)
+        check("재시도를 다 쓰면 HTTPError", False)
+    except http_client.requests.HTTPError:
+        check("재시도를 다 쓰면 HTTPError", StubWiki.flaky["b"] == 3)
+
+    http_client.BREAKER_COOLDOWN = 0.5
+    breaker = http_client.HttpClient(retries=0)
+    errors = []
+    for _ in range(8):
+        try:
+            breaker.get(f"{base}/down", timeout=2)
+        except http_client.requests.RequestException as e:
+            errors.append(type(e).__name__)
+    host = f"127.0.0.1:{server.server_port}"
+    check("연속 실패 5번 뒤 회로 열림", errors == ["HTTPError"] * 5 + ["CircuitOpen"] * 3,
+          f"{breaker.snapshot()[host]}")
+    time.sleep(0.6)
+    check("쿨다운 뒤 시험 요청 성공 → 회로 닫힘",
+          breaker.get(f"{base}/ok", timeout=2).status_code == 200 and breaker.snapshot()[host]["circuit"] == "closed")
+    for _ in range(5):
+        with contextlib.suppress(http_client.requests.RequestException):
+            breaker.get(f"{base}/down", timeout=2)
+    time.sleep(0.6)
+    try:
+        breaker.get(f"{base}/truncated", timeout=2)
+        trial = None
+    except http_client.requests.RequestException as e:
+        trial = type(e).__name__
+    time.sleep(0.6)
+    check("시험 요청이 끊긴 응답으로 실패해도 다음 쿨다운 뒤 회로 닫힘",
+          trial == "ChunkedEncodingError" and breaker.get(f"{base}/ok", timeout=2).status_code == 200
+          and breaker.snapshot()[host]["circuit"] == "closed", f"({trial})")
+    check("그 밖의 requests 예외도 종류별로 셈", breaker.snapshot()[host].get("chunked_encoding") == 1)
+
+    StubWiki.ports.clear()
+    pooled = http_client.HttpClient(max_concurrency=4, retries=0, rate=0)
+    for _ in range(20):
+        pooled.get(f"{base}/ok", timeout=2)
+    check("순차 요청 20번 → 연결 1개 재사용", len(StubWiki.ports) == 1, f"({len(StubWiki.ports)}개)")
+
+    StubWiki.max_in_flight = 0
+    threads = [threading.Thread(target=pooled.get, args=(f"{base}/ok?sleep=0.1",), kwargs={"timeout": 5})
+               for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    check("동시 16개 요청 → 서버에서 동시 최대 4개", StubWiki.max_in_flight == 4, f"({StubWiki.max_in_flight})")
+
+    # 10) 아침 몰림: 같은 별자리 페이지를 세션 N개가 동시에 열어도 위키 요청 수는 그대로
+    StubWiki.delay = 0.2
+    page = CELEB_BY_SIGN["황소자리"] + [i["wiki"] for i in IDOLS if i["sign"] == "황소자리"] + ["Taeyong", "도영"]
+    print(f"{'세션':>6} {'위키 요청':>9} {'합침 없이':>9} {'ms':>7}")
+    counts, complete = set(), True
+    for n in (1, 8, 32, 128):
+        wiki_thumbs.clear_cache()
+        barrier, results = threading.Barrier(n), []
+
+        def session():
+            barrier.wait()
+            results.append(wiki_thumbs.fetch_thumbs(page, deadline=5))
+
+        def run_sessions():
+            threads = [threading.Thread(target=session) for _ in range(n)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        _, log, sec = round_trips(run_sessions)
+        counts.add(len(log))
+        complete &= len(results) == n and all(all(r.values()) for r in results)
+        print(f"{n:>6} {len(log):>9} {n * 2:>9} {sec * 1000:>7.0f}")
+    check("세션 수와 관계없이 위키 요청 수 일정", len(counts) == 1, f"({counts.pop()}회) {wiki_thumbs.cache_stats()}")
+    check("모든 세션이 모든 썸네일을 받음", complete)
+    StubWiki.delay = 0.0
+
+    # 11) 호스트별 토큰 버킷: 초당 5개, 한꺼번에 2개
+    limited = http_client.HttpClient(max_concurrency=8, retries=0, rate=5, burst=2)
+    threads = [threading.Thread(target=limited.get, args=(f"{base}/ok",), kwargs={"timeout": 5}) for _ in range(12)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    sec = time.perf_counter() - t0
+    check("12개 요청이 초당 5개로 퍼짐 (>= 2.0s)", 1.9 <= sec < 2.6,
+          f"({sec:.2f}s, 대기 {limited.snapshot()[host].get('throttled', 0)}개)")
+
+    server.shutdown()
+    return check.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# 상품 색상 최근접 인덱스 (Lab 공간 균일 격자)
+# Build: python color_index.py build catalog.csv -o product_index.npz
+# Demo : python color_index.py demo catalog.csv -n 1000000   (가짜 카탈로그 생성)
+# catalog.csv 컬럼: product_id, name, brand, style, color(#RRGGBB)
+
+import argparse
+import csv
+import random
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from colorspace import srgb_to_lab
+
+PRODUCT_INDEX_PATH = "product_index.npz"
+CELL_SIZE = 4.0  # 격자 한 칸의 Lab 거리 (ΔE76)
+META_FIELDS = ("product_id", "name", "brand", "style", "color")
+
+
+@lru_cache(maxsize=64)
+def _shell(r: int) -> np.ndarray:
+    """체비셰프 거리가 정확히 r인 격자 오프셋 (M,3)"""
+    rng = np.arange(-r, r + 1)
+    g = np.stack(np.meshgrid(rng, rng, rng, indexing="ij"), -1).reshape(-1, 3)
+    return g[np.abs(g).max(1) == r]
+
+
+class ColorIndex:
+    """Lab 좌표를 격자 칸 순서로 정렬해 두고, 질의 색 주변 칸을 한 겹씩 넓혀가며 찾는다."""
+
+    def __init__(self, lab, cell_start, origin, dims, cell, meta):
+        self.lab = lab
+        self.cell_start = cell_start
+        self.origin = origin
+        self.dims = dims
+        self.cell = float(cell)
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.lab)
+
+    @classmethod
+    def build(cls, lab, meta, cell: float = CELL_SIZE):
+        lab = np.asarray(lab, dtype=np.float32)
+        origin = lab.min(0) - 1e-3
+        dims = (np.floor((lab.max(0) - origin) / cell).astype(np.int64) + 1)
+        cid = cls._cell_ids(np.floor((lab - origin) / cell).astype(np.int64), dims)
+        order = np.argsort(cid, kind="stable")
+        cell_start = np.searchsorted(cid[order], np.arange(int(dims.prod()) + 1))
+        return cls(lab[order], cell_start, origin, dims, cell, {k: np.asarray(v)[order] for k, v in meta.items()})
+
+    @staticmethod
+    def _cell_ids(c, dims):
+        return (c[..., 0] * dims[1] + c[..., 1]) * dims[2] + c[..., 2]
+
+    def save(self, path: str):
+        np.savez(path, lab=self.lab, cell_start=self.cell_start, origin=self.origin,
+                 dims=self.dims, cell=self.cell, **{f"meta_{k}": v for k, v in self.meta.items()})
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as z:
+            meta = {k[5:]: z[k] for k in z.files if k.startswith("meta_")}
+            return cls(z["lab"], z["cell_start"], z["origin"], z["dims"], z["cell"], meta)
+
+    def _query_one(self, q, n):
+        c = np.floor((q - self.origin) / self.cell).astype(np.int64)
+        best_i = np.empty(0, dtype=np.int64)
+        best_d = np.empty(0, dtype=np.float32)
+        # 질의 색이 카탈로그 범위 밖이면 격자까지의 칸 거리 r0부터 (그 안쪽 겹에는 칸이 없다)
+        r0 = int(np.maximum(np.maximum(-c, c - (self.dims - 1)), 0).max())
+        for r in range(r0, r0 + int(self.dims.max()) + 1):
+            cells = c + _shell(r)
+            cells = cells[((cells >= 0) & (cells < self.dims)).all(1)]
+            if len(cells):
+                cid = self._cell_ids(cells, self.dims)
+                starts, ends = self.cell_start[cid], self.cell_start[cid + 1]
+                lens = ends - starts
+                if lens.sum():
+                    # 칸별 [start, end) 구간을 하나의 인덱스 배열로 펼친다
+                    idx = np.repeat(starts - np.cumsum(lens) + lens, lens) + np.arange(lens.sum())
+                    d = np.sqrt(((self.lab[idx] - q) ** 2).sum(1))
+                    best_i = np.concatenate([best_i, idx])
+                    best_d = np.concatenate([best_d, d])
+                    if len(best_d) > n:
+                        keep = np.argpartition(best_d, n - 1)[:n]
+                        best_i, best_d = best_i[keep], best_d[keep]
+            # 다음 겹의 점들은 최소 r*cell 만큼 떨어져 있다
+            if len(best_d) >= n and best_d.max() <= r * self.cell:
+                break
+        order = np.argsort(best_d, kind="stable")
+        return best_i[order], best_d[order]
+
+    def query(self, lab_points, n: int = 3):
+        """질의 색(Lab)마다 가까운 상품 n개: [[{meta..., "delta_e": ...}, ...], ...]"""
+        out = []
+        for q in np.asarray(lab_points, dtype=np.float32).reshape(-1, 3):
+            idx, dist = self._query_one(q, n)
+            out.append([{**{k: str(v[i]) for k, v in self.meta.items()}, "delta_e": float(d)}
+                        for i, d in zip(idx, dist)])
+        return out
+
+
+# ============ CLI ============
+def hex_to_rgb(h: str):
+    h = h.strip().lstrip("#")
+    return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+
+
+def read_catalog(path):
+    meta = {k: [] for k in META_FIELDS}
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            for k in META_FIELDS:
+                meta[k].append(row.get(k, ""))
+    rgb = np.array([hex_to_rgb(h) for h in meta["color"]], dtype=np.uint8)
+    return rgb, meta
+
+
+def write_demo_catalog(path, n, seed=0):
+    from palette import BRANDS
+    rnd = random.Random(seed)
+    items = ["티셔츠", "셔츠", "니트", "후드", "자켓", "코트", "데님", "치노", "카고팬츠", "스커트", "스니커즈"]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(META_FIELDS)
+        for i in range(n):
+            style = rnd.choice(list(BRANDS))
+            color = "#%06x" % rnd.getrandbits(24)
+            w.writerow([f"P{i:07d}", f"{rnd.choice(items)} {color.upper()}", rnd.choice(BRANDS[style]), style, color])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="상품 색상 최근접 인덱스")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="카탈로그 CSV → 인덱스 파일")
+    b.add_argument("catalog")
+    b.add_argument("-o", "--output", default=PRODUCT_INDEX_PATH)
+    b.add_argument("--cell", type=float, default=CELL_SIZE)
+    d = sub.add_parser("demo", help="가짜 카탈로그 CSV 만들기")
+    d.add_argument("catalog")
+    d.add_argument("-n", type=int, default=100_000)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "demo":
+        write_demo_catalog(args.catalog, args.n)
+        print(f"{args.n}개 상품 → {args.catalog}")
+        return 0
+
+    t0 = time.perf_counter()
+    rgb, meta = read_catalog(args.catalog)
+    index = ColorIndex.build(srgb_to_lab(rgb), meta, cell=args.cell)
+    index.save(args.output)
+    print(f"{len(index)}개 상품 인덱싱 ({time.perf_counter() - t0:.1f}s) → {args.output}")
+
+    # 질의 지연시간 확인 (팔레트 8색)
+    q = srgb_to_lab(np.random.default_rng(0).integers(0, 256, (8, 3)))
+    t0 = time.perf_counter()
+    index.query(q, n=3)
+    print(f"팔레트 8색 x top3 질의: {(time.perf_counter() - t0) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
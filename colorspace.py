@@ -0,0 +1,110 @@
+# sRGB → CIE Lab 변환 (D65)
+# 8비트 채널은 256칸 감마 LUT로 선형화하고, 배열 전체를 한 번에 행렬곱으로 변환한다.
+
+from functools import lru_cache
+
+import numpy as np
+
+# sRGB(D65) → XYZ, 기준 백색으로 미리 나눠 둔 행렬
+_RGB2XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+_RGB2XYZ_N = (_RGB2XYZ / _WHITE_D65[:, None]).T.astype(np.float32)
+
+_EPS = (6 / 29) ** 3
+_KAPPA = 1 / (3 * (6 / 29) ** 2)
+
+
+def _srgb_to_linear(c: np.ndarray) -> np.ndarray:
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+# 0~255 → 선형 sRGB (256칸)
+SRGB_TO_LINEAR = _srgb_to_linear(np.arange(256) / 255.0).astype(np.float32)
+SRGB_TO_LINEAR.setflags(write=False)
+
+
+def srgb_to_lab(rgb) -> np.ndarray:
+    """sRGB 배열 (..., 3) → Lab (..., 3) float32. uint8이 아니면 반올림 후 LUT 사용"""
+    rgb = np.asarray(rgb)
+    if rgb.dtype != np.uint8:
+        rgb = np.clip(np.rint(rgb), 0, 255).astype(np.uint8)
+    xyz = SRGB_TO_LINEAR[rgb] @ _RGB2XYZ_N
+    f = np.where(xyz > _EPS, np.cbrt(xyz), xyz * _KAPPA + 4 / 29)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+@lru_cache(maxsize=1)
+def bin_lab() -> np.ndarray:
+    """16단계 양자화 4096칸 (r>>4<<8 | g>>4<<4 | b>>4)의 칸 중심 Lab (4096, 3)"""
+    i = np.arange(4096)
+    centers = np.stack([(i >> 8) * 16 + 8, ((i >> 4) & 15) * 16 + 8, (i & 15) * 16 + 8], axis=1)
+    lab = srgb_to_lab(centers.astype(np.uint8))
+    lab.setflags(write=False)
+    return lab
+
+
+def delta_e(a, b) -> np.ndarray:
+    """Lab 색 집합 간 ΔE76 거리 행렬 (len(a), len(b))"""
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    return np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(-1))
+
+
+def merge_similar(lab, weights, threshold: float):
+    """가중치 큰 순서로 보면서 이미 고른 색과 ΔE < threshold인 색은 가장 가까운 색에 합친다.
+    반환: (남길 인덱스 배열, 합쳐진 가중치 배열) — 가중치 내림차순"""
+    lab = np.asarray(lab, dtype=np.float32)
+    weights = np.asarray(weights, dtype=np.float64)
+    if len(lab) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+    d = delta_e(lab, lab)
+    keep, merged = [], []
+    for i in np.argsort(-weights, kind="stable"):
+        if keep:
+            near = d[i, keep]
+            j = int(np.argmin(near))
+            if near[j] < threshold:
+                merged[j] += weights[i]
+                continue
+        keep.append(i)
+        merged.append(weights[i])
+    keep, merged = np.array(keep, dtype=np.intp), np.array(merged)
+    order = np.argsort(-merged, kind="stable")
+    return keep[order], merged[order]
+
+
+def pad_palettes(labs, weights):
+    """길이가 다른 팔레트 목록 → (N, K, 3) Lab, (N, K) 가중치. 빈 칸은 가중치 0"""
+    k = max((len(w) for w in weights), default=0)
+    lab = np.zeros((len(labs), max(k, 1), 3), dtype=np.float32)
+    w = np.zeros((len(labs), max(k, 1)))
+    for i, (l, wi) in enumerate(zip(labs, weights)):
+        lab[i, :len(wi)] = l
+        w[i, :len(wi)] = wi
+    return lab, w
+
+
+def palette_distance(lab_a, w_a, lab_b, w_b) -> np.ndarray:
+    """팔레트 집합 간 거리 행렬 (N, M). pad_palettes 형식 입력.
+    각 색에서 상대 팔레트의 가장 가까운 색까지의 ΔE를 가중 평균하고, 양방향 값을 평균한다."""
+    lab_a = np.asarray(lab_a, dtype=np.float32)
+    lab_b = np.asarray(lab_b, dtype=np.float32)
+    w_a = np.asarray(w_a, dtype=np.float64)
+    w_b = np.asarray(w_b, dtype=np.float64)
+    w_a = w_a / np.maximum(w_a.sum(1, keepdims=True), 1e-12)
+    w_b = w_b / np.maximum(w_b.sum(1, keepdims=True), 1e-12)
+    # (N, M, K, L) — 팔레트는 8색 이하라 한 번에 계산해도 작다
+    d = np.sqrt(((lab_a[:, None, :, None, :] - lab_b[None, :, None, :, :]) ** 2).sum(-1))
+    a_to_b = np.where(w_b[None, :, None, :] > 0, d, np.inf).min(3)
+    b_to_a = np.where(w_a[:, None, :, None] > 0, d, np.inf).min(2)
+    a_to_b = (np.where(w_a[:, None, :] > 0, a_to_b, 0) * w_a[:, None, :]).sum(2)
+    b_to_a = (np.where(w_b[None, :, :] > 0, b_to_a, 0) * w_b[None, :, :]).sum(2)
+    return (a_to_b + b_to_a) / 2
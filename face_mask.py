@@ -0,0 +1,144 @@
+# 얼굴 사진 영역 나누기: 피부 / 머리카락 / 배경 / 그 외(옷 등)
+# 모델 없이 YCbCr 임계값 + 3x3 형태학 연산으로 정리한다. 128px 분석 이미지 기준 수 ms.
+
+import numpy as np
+
+from colorspace import srgb_to_lab
+
+BACKGROUND, SKIN, HAIR, OTHER = 0, 1, 2, 3
+
+# 피부색 범위 (Chai & Ngan, YCbCr 0~255)
+SKIN_CB = (77, 127)
+SKIN_CR = (133, 173)
+SKIN_MIN_Y = 40
+HAIR_MAX_Y = 70            # 이보다 어두운 비피부 픽셀은 머리카락 후보
+BG_DELTA_E = 12.0          # 테두리 대표색과 이만큼 가까우면 배경 후보
+BG_BORDER_SHARE = 0.05     # 테두리 픽셀의 5% 이상을 차지하는 색만 배경 대표색으로
+BG_MAX_COLORS = 4
+MIN_FOREGROUND = 0.05      # 팔레트에 남는 픽셀이 이보다 적으면 마스크를 줄인다
+
+
+def rgb_to_ycbcr(arr: np.ndarray) -> np.ndarray:
+    """(..., 3) uint8 RGB → (..., 3) float32 YCbCr (JPEG 전범위)"""
+    rgb = np.asarray(arr, dtype=np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    out = np.empty(rgb.shape, dtype=np.float32)
+    out[..., 0] = 0.299 * r + 0.587 * g + 0.114 * b
+    out[..., 1] = 128 - 0.168736 * r - 0.331264 * g + 0.5 * b
+    out[..., 2] = 128 + 0.5 * r - 0.418688 * g - 0.081312 * b
+    return out
+
+
+# ============ 3x3 형태학 연산 ============
+# 정사각형 3x3 구조 요소는 가로/세로 1x3 두 번으로 나눠서 슬라이스 연산만 쓴다
+def _dilate1(mask: np.ndarray, axis: int) -> np.ndarray:
+    out = mask.copy()
+    a, b = [slice(None)] * 2, [slice(None)] * 2
+    a[axis], b[axis] = slice(1, None), slice(None, -1)
+    out[tuple(a)] |= mask[tuple(b)]
+    out[tuple(b)] |= mask[tuple(a)]
+    return out
+
+
+def _erode1(mask: np.ndarray, axis: int) -> np.ndarray:
+    # 이미지 밖은 참으로 본다 (가장자리가 깎여 나가지 않게)
+    out = mask.copy()
+    a, b = [slice(None)] * 2, [slice(None)] * 2
+    a[axis], b[axis] = slice(1, None), slice(None, -1)
+    out[tuple(a)] &= mask[tuple(b)]
+    out[tuple(b)] &= mask[tuple(a)]
+    return out
+
+
+def erode(mask: np.ndarray) -> np.ndarray:
+    return _erode1(_erode1(mask, 0), 1)
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    return _dilate1(_dilate1(mask, 0), 1)
+
+
+def opening(mask: np.ndarray) -> np.ndarray:
+    """작은 점 잡음 제거"""
+    return dilate(erode(mask))
+
+
+def closing(mask: np.ndarray) -> np.ndarray:
+    """작은 구멍 메우기"""
+    return erode(dilate(mask))
+
+
+def reconstruct(seed: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """seed에서 시작해 mask 안에서 이어진 영역만 남긴다 (측지 팽창 반복)"""
+    cur = seed & mask
+    while True:
+        nxt = dilate(cur) & mask
+        if np.array_equal(nxt, cur):
+            return cur
+        cur = nxt
+
+
+# ============ 영역 나누기 ============
+def _frame(shape) -> np.ndarray:
+    """배경 씨앗 영역: 윗변 + 양옆 위쪽 절반. 아랫변은 보통 몸/옷이 닿아 있어서 뺀다"""
+    frame = np.zeros(shape, dtype=bool)
+    frame[0] = True
+    frame[:shape[0] // 2, [0, -1]] = True
+    return frame
+
+
+def _border_colors(lab: np.ndarray, frame: np.ndarray) -> np.ndarray:
+    """테두리에서 자주 나오는 Lab 8단계 칸의 평균색 (최대 BG_MAX_COLORS개)"""
+    border = lab[frame]
+    q = np.clip((border[:, 0] / 100 * 7.99).astype(np.int64), 0, 7) * 64 \
+        + np.clip(((border[:, 1] + 128) / 256 * 7.99).astype(np.int64), 0, 7) * 8 \
+        + np.clip(((border[:, 2] + 128) / 256 * 7.99).astype(np.int64), 0, 7)
+    counts = np.bincount(q, minlength=512)
+    top = np.argsort(-counts, kind="stable")[:BG_MAX_COLORS]
+    top = top[counts[top] >= BG_BORDER_SHARE * len(border)]
+    return np.stack([border[q == t].mean(0) for t in top]) if len(top) else np.empty((0, 3), np.float32)
+
+
+def segment(arr: np.ndarray) -> np.ndarray:
+    """(H, W, 3) uint8 → (H, W) uint8 라벨 (BACKGROUND/SKIN/HAIR/OTHER)"""
+    ycc = rgb_to_ycbcr(arr)
+    y, cb, cr = ycc[..., 0], ycc[..., 1], ycc[..., 2]
+    skin = ((cb >= SKIN_CB[0]) & (cb <= SKIN_CB[1]) & (cr >= SKIN_CR[0]) & (cr <= SKIN_CR[1])
+            & (y >= SKIN_MIN_Y))
+    skin = opening(closing(skin))
+
+    # 배경: 테두리 대표색과 비슷하면서 테두리에서 이어진 비피부 영역
+    lab = srgb_to_lab(arr)
+    frame = _frame(skin.shape)
+    colors = _border_colors(lab, frame)
+    if len(colors):
+        d = np.min([((lab - c) ** 2).sum(-1) for c in colors], axis=0)
+        cand = (d < BG_DELTA_E ** 2) & ~skin
+        bg = closing(reconstruct(frame, opening(cand))) & ~skin
+    else:
+        bg = np.zeros_like(skin)
+
+    hair = opening((y < HAIR_MAX_Y) & ~skin & ~bg)
+
+    labels = np.full(skin.shape, OTHER, dtype=np.uint8)
+    labels[bg] = BACKGROUND
+    labels[hair] = HAIR
+    labels[skin] = SKIN
+    return labels
+
+
+def foreground(labels: np.ndarray) -> np.ndarray:
+    """팔레트에 셀 픽셀 마스크: 배경과 피부(따로 보고)를 뺀 나머지.
+    남는 픽셀이 너무 적으면 피부, 그래도 적으면 (단색 사진 등) 배경까지 되살린다."""
+    for keep in (labels >= HAIR, labels != BACKGROUND):
+        if keep.mean() >= MIN_FOREGROUND:
+            return keep
+    return np.ones(labels.shape, dtype=bool)
+
+
+def skin_tone(arr: np.ndarray, labels: np.ndarray):
+    """피부 픽셀의 채널별 중앙값 RGB, 피부가 없으면 None"""
+    px = arr[labels == SKIN]
+    if len(px) == 0:
+        return None
+    return tuple(int(v) for v in np.median(px, axis=0))
@@ -0,0 +1,200 @@
+# 별자리 데이터 + 운세 계산 — main.py에서 분리 (Streamlit 없이 import 가능)
+
+import datetime as dt
+import hashlib
+import os
+import random
+import threading
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# ---------- 데이터 ----------
+SIGNS = [
+    ("양자리", "Aries", "♈"), ("황소자리", "Taurus", "♉"), ("쌍둥이자리", "Gemini", "♊"),
+    ("게자리", "Cancer", "♋"), ("사자자리", "Leo", "♌"), ("처녀자리", "Virgo", "♍"),
+    ("천칭자리", "Libra", "♎"), ("전갈자리", "Scorpio", "♏"), ("사수자리", "Sagittarius", "♐"),
+    ("염소자리", "Capricorn", "♑"), ("물병자리", "Aquarius", "♒"), ("물고기자리", "Pisces", "♓"),
+]
+SIGN_KO = [s[0] for s in SIGNS]
+SIGN_EN = {s[0]: s[1] for s in SIGNS}
+SIGN_EMOJI = {s[0]: s[2] for s in SIGNS}
+
+ELEMENT = {
+    "양자리": "불", "사자자리": "불", "사수자리": "불",
+    "황소자리": "흙", "처녀자리": "흙", "염소자리": "흙",
+    "쌍둥이자리": "공기", "천칭자리": "공기", "물병자리": "공기",
+    "게자리": "물", "전갈자리": "물", "물고기자리": "물",
+}
+
+SUGGESTIONS = {
+    "불": ["🔥 에너지 폭발! 하이킥 산책", "🎤 노래방에서 리즈곡 부르기", "🌶️ 매운 음식 도전"],
+    "흙": ["🌿 초록 카페에서 사진찍기", "🍞 동네 베이커리 신상 투어", "🧹 책상 정리하고 새 시작"],
+    "공기": ["🗣️ 먼저 안부 보내기", "📚 도서관에서 1시간 집중", "🎧 새 플레이리스트 만들기"],
+    "물": ["🛁 따뜻한 반신욕", "🍵 말차/허브티로 힐링", "🎨 감성 일기/드로잉"],
+}
+
+# 운세 값 — 순서를 바꾸면 같은 날짜라도 결과가 달라진다 (운세 달력 fortune_calendar.py도 다시 만들어야 함)
+SCORE_RANGE = (55, 100)   # 랭킹 점수
+STAT_RANGE = (60, 99)     # 사랑/금전/학업/건강
+LUCKY_COLORS = ["💜 보라", "💙 파랑", "💚 초록", "❤️ 빨강", "🧡 주황", "💛 노랑", "🖤 블랙", "🤍 화이트", "🤎 브라운"]
+LUCKY_ITEMS = ["📸 필름카메라", "🎧 무선이어폰", "🍫 초콜릿", "🧴 핸드크림", "📒 노트", "💄 틴트", "🥤 아이스라떼", "📿 팔찌"]
+VIBES = ["하이틴 무드🌈", "스포티 에너지💥", "러블리 감성💖", "시크&모던🖤", "내추럴 힐링🍃"]
+MESSAGES = [
+    "작은 씬스틸러가 되는 날!", "우연이 자주 겹치는 날 🔮", "집중력이 폭발하는 꿀컨디션!",
+    "좋아하는 사람과 거리 좁히기 딱 좋은 타이밍 💘", "새 시도를 두려워하지 마세요 ✨",
+]
+
+# (글로벌) 유명인 예시 — 기본 카드용
+CELEB_BY_SIGN = {
+    "양자리": ["Lady Gaga", "Emma Watson"],
+    "황소자리": ["아이유", "David Beckham"],
+    "쌍둥이자리": ["Angelina Jolie", "Kanye West"],
+    "게자리": ["Selena Gomez", "Ariana Grande"],
+    "사자자리": ["Jennifer Lopez", "Barack Obama"],
+    "처녀자리": ["정국", "Zendaya"],
+    "천칭자리": ["지민 (가수)", "Kim Kardashian"],
+    "전갈자리": ["Leonardo DiCaprio", "Drake (래퍼)"],
+    "사수자리": ["Taylor Swift", "진 (가수)"],
+    "염소자리": ["뷔 (가수)", "제니 (가수)"],
+    "물병자리": ["Harry Styles", "제이홉"],
+    "물고기자리": ["SUGA", "Rihanna"],
+}
+
+# ▼▼ K‑Idol 프리셋 (검증 필요시 사용자 입력으로 보완 가능) ▼▼
+# 간편 매칭을 위한 샘플: 이름, 그룹, 별자리, 위키 제목
+IDOLS = [
+    # RIIZE
+    {"name": "SHOTARO", "group": "RIIZE", "sign": "사수자리", "wiki": "Shotaro (singer)"},
+    {"name": "SUNGCHAN", "group": "RIIZE", "sign": "처녀자리", "wiki": "Sungchan"},
+    {"name": "SOHEE", "group": "RIIZE", "sign": "전갈자리", "wiki": "Sohee (singer)"},
+    {"name": "WONBIN", "group": "RIIZE", "sign": "물고기자리", "wiki": "Wonbin (singer)"},
+    {"name": "EUNSEOK", "group": "RIIZE", "sign": "물고기자리", "wiki": "Eunseok"},
+    {"name": "ANTON", "group": "RIIZE", "sign": "양자리", "wiki": "Anton (singer)"},
+    # NCT (일부)
+    {"name": "TAEYONG", "group": "NCT", "sign": "게자리", "wiki": "Taeyong"},
+    {"name": "MARK", "group": "NCT", "sign": "사자자리", "wiki": "Mark Lee (singer)"},
+    {"name": "JAEHYUN", "group": "NCT", "sign": "물병자리", "wiki": "Jaehyun"},
+    {"name": "HAECHAN", "group": "NCT", "sign": "쌍둥이자리", "wiki": "Haechan"},
+    {"name": "TEN", "group": "NCT", "sign": "물고기자리", "wiki": "Ten (singer)"},
+    {"name": "JISUNG", "group": "NCT", "sign": "물병자리", "wiki": "Jisung (singer, born 2002)"},
+    # 5세대 예시
+    {"name": "ILLIT WONHEE", "group": "ILLIT", "sign": "쌍둥이자리", "wiki": "Wonhee"},
+    {"name": "ILLIT MINJU", "group": "ILLIT", "sign": "물병자리", "wiki": "Minju (singer, born 2004)"},
+    {"name": "TWS SHINYU", "group": "TWS", "sign": "물고기자리", "wiki": "Shinyu"},
+    {"name": "TWS DOHOON", "group": "TWS", "sign": "사수자리", "wiki": "Dohoon"},
+    {"name": "BABYMONSTER AHYEON", "group": "BABYMONSTER", "sign": "물고기자리", "wiki": "Ahyeon"},
+]
+
+# ---------- 유틸 ----------
+
+def seed_by_date(sign_ko: str, date: dt.date, purpose: str = "lucky") -> random.Random:
+    key = f"{date.isoformat()}::{sign_ko}::{purpose}"
+    h = hashlib.sha256(key.encode()).hexdigest()
+    seed_val = int(h[:16], 16)
+    return random.Random(seed_val)
+
+def today_rank_all(date: dt.date):
+    scores = []
+    for sign in SIGN_KO:
+        rng = seed_by_date(sign, date)
+        score = rng.randint(*SCORE_RANGE)
+        scores.append((sign, score))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores
+
+
+def detail_fortune(sign: str, date: dt.date):
+    rng = seed_by_date(sign, date)
+    def roll():
+        return rng.randint(*STAT_RANGE)
+    love = roll(); money = roll(); study = roll(); health = roll()
+    element = ELEMENT[sign]
+    # 추천은 따로 시드한 rng로 — 같은 날 같은 별자리면 같은 결과 (캐시/미리 계산 가능), 위 rng 순서는 그대로
+    tips = seed_by_date(sign, date, "tips").sample(SUGGESTIONS[element], k=min(3, len(SUGGESTIONS[element])))
+    lucky_color = rng.choice(LUCKY_COLORS)
+    lucky_item = rng.choice(LUCKY_ITEMS)
+    vibe = rng.choice(VIBES)
+    msg = rng.choice(MESSAGES)
+    return {
+        "love": love, "money": money, "study": study, "health": health,
+        "tips": tips, "lucky_color": lucky_color, "lucky_item": lucky_item,
+        "vibe": vibe, "message": msg,
+    }
+
+
+
+# ---------- 날짜별 결과 캐시 ----------
+# 랭킹/운세는 (별자리, 날짜)의 순수 함수라 날짜마다 한 번만 계산해서 모든 세션이 같이 쓴다.
+# "오늘"은 FORTUNE_TZ 기준 (서버가 UTC여도 한국 자정에 바뀌도록).
+FORTUNE_TZ = os.environ.get("FORTUNE_TZ", "Asia/Seoul")
+KEEP_DAYS = 2            # 오늘 + 어제 (자정 직전에 연 페이지가 다시 그려질 때)
+MAX_DAYS = 8             # 지난 날짜를 직접 넘기는 호출이 있어도 이 이상 쌓지 않는다
+
+
+def fortune_tz():
+    try:
+        return ZoneInfo(FORTUNE_TZ)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None      # tzdata가 없으면 서버 로컬 시간
+
+
+def fortune_now() -> dt.datetime:
+    return dt.datetime.now(fortune_tz())
+
+
+def fortune_today() -> dt.date:
+    return fortune_now().date()
+
+
+class DayCache:
+    """날짜 → (랭킹, {별자리: 디테일}). 새 날짜가 들어오면 오늘-KEEP_DAYS보다 오래된 날짜를 지운다.
+    calendar(fortune_calendar.FortuneCalendar)가 있으면 그 범위 안의 날짜는 계산 대신 찾아 쓴다"""
+
+    def __init__(self, keep_days: int = KEEP_DAYS, max_days: int = MAX_DAYS, calendar=None):
+        self.keep_days = keep_days
+        self.max_days = max_days
+        self.calendar = calendar
+        self._days = {}
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "miss": 0, "calendar": 0, "evicted": 0}
+
+    def get(self, date: dt.date):
+        with self._lock:
+            day = self._days.get(date)
+            if day is not None:
+                self.stats["hit"] += 1
+                return day
+            # 12별자리 계산은 수 ms라 락 안에서 한 번만 (같은 날짜를 동시에 두 번 계산하지 않게)
+            self.stats["miss"] += 1
+            day = self.calendar.day(date) if self.calendar is not None else None
+            if day is not None:
+                self.stats["calendar"] += 1
+            else:
+                day = (today_rank_all(date), {s: detail_fortune(s, date) for s in SIGN_KO})
+            self._days[date] = day
+            self._evict(fortune_today())
+            return day
+
+    def _evict(self, today: dt.date):
+        oldest = today - dt.timedelta(days=self.keep_days - 1)
+        keep = set(sorted(d for d in self._days if d >= oldest)[-self.max_days:])
+        old = [d for d in self._days if d not in keep]
+        for d in old:
+            del self._days[d]
+        self.stats["evicted"] += len(old)
+
+    def dates(self):
+        with self._lock:
+            return sorted(self._days)
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+            self.stats = dict.fromkeys(self.stats, 0)
+
+
+day_cache = DayCache()
+
+
+def day_fortunes(date: dt.date = None):
+    """그날의 (랭킹, {별자리: 디테일}) — 모든 세션 공유. 서버 시작/자정 워밍업(warmup.py)이 미리 채운다"""
+    return day_cache.get(fortune_today() if date is None else date)
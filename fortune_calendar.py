@@ -0,0 +1,311 @@
+# 운세 달력 — 날짜 범위 전체(예: 10년 × 12별자리)의 랭킹/디테일을 한꺼번에 만들어 두고, 앱은 계산 대신 찾아 쓴다
+# Build : python fortune_calendar.py build --start 2025-01-01 --years 10 -o fortune_calendar.npz
+#         python fortune_calendar.py info fortune_calendar.npz
+#         python fortune_calendar.py verify fortune_calendar.npz   (fortune.py 계산과 전부 비교 + 속도)
+# seed_by_date → random.Random(seed) 경로를 numpy로 똑같이 재현한다:
+#   (날짜, 별자리, 용도)마다 sha256 시드 → MT19937 init_by_array → twist → tempering 을 수천 개 스트림에 한꺼번에,
+#   randint/choice/sample은 CPython의 _randbelow(getrandbits 거절 샘플링)와 같은 순서로 워드를 소비.
+# 파일: 열마다 (날짜 수, 12) uint8 배열인 npz — score, love, money, study, health, color, item, vibe, message,
+#       tips는 (날짜 수, 12, 3) SUGGESTIONS 안의 위치. fingerprint가 지금 fortune.py 데이터와 다르면 앱은 무시한다.
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fortune import (ELEMENT, LUCKY_COLORS, LUCKY_ITEMS, MESSAGES, SCORE_RANGE, SIGN_KO, STAT_RANGE,
+                     SUGGESTIONS, VIBES)
+
+FORTUNE_CALENDAR_PATH = os.environ.get("FORTUNE_CALENDAR_PATH", "fortune_calendar.npz")
+CHUNK_DAYS = 365      # 워커 작업 하나의 날짜 수 (스트림 4380개 × 2, 상태 배열 ~22 MB씩)
+STAT_COLUMNS = ("love", "money", "study", "health")
+COLUMNS = ("score",) + STAT_COLUMNS + ("color", "item", "vibe", "message", "tips")
+TIPS_K = 3            # detail_fortune의 sample(k=min(3, n))
+
+
+def fingerprint() -> str:
+    """결과를 바꾸는 fortune.py 데이터의 해시 — 달력을 만든 뒤 데이터가 바뀌면 달력을 쓰지 않는다"""
+    data = [SIGN_KO, ELEMENT, SUGGESTIONS, LUCKY_COLORS, LUCKY_ITEMS, VIBES, MESSAGES, SCORE_RANGE, STAT_RANGE]
+    return hashlib.sha256(json.dumps(data, ensure_ascii=False).encode()).hexdigest()[:16]
+
+
+# ============ MT19937 (CPython _randommodule.c와 같은 계산, 스트림 축으로 벡터화) ============
+N, M = 624, 397
+MATRIX_A, UPPER, LOWER, MASK32 = 0x9908B0DF, 0x80000000, 0x7FFFFFFF, 0xFFFFFFFF
+
+
+def _init_genrand(s: int) -> np.ndarray:
+    mt = [s]
+    for i in range(1, N):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & MASK32)
+    return np.array(mt, dtype=np.uint64)
+
+
+_BASE_STATE = _init_genrand(19650218)   # init_by_array는 항상 이 상태에서 시작
+
+
+def seed_words(seeds) -> np.ndarray:
+    """random.Random(int) 시드들 → MT 상태 (624, 스트림 수) uint64.
+    CPython은 시드를 32비트 워드로 쪼개 키로 쓴다 (2**32 미만이면 워드 하나)"""
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    lo, hi = seeds & MASK32, seeds >> np.uint64(32)
+    one = hi == 0                       # 키 길이 1: 매번 key[0], j=0
+    keys = (lo, np.where(one, lo, hi))
+    jadd = (np.uint64(0), np.where(one, 0, 1).astype(np.uint64))
+    mt = np.repeat(_BASE_STATE[:, None], len(seeds), axis=1)
+    i, j = 1, 0
+    for _ in range(N):                  # max(N, 키 길이)
+        prev = mt[i - 1]
+        mt[i] = ((mt[i] ^ ((prev ^ (prev >> np.uint64(30))) * np.uint64(1664525))) + keys[j] + jadd[j]) & MASK32
+        i, j = i + 1, 1 - j
+        if i >= N:
+            mt[0] = mt[N - 1]
+            i = 1
+    for _ in range(N - 1):
+        prev = mt[i - 1]
+        mt[i] = ((mt[i] ^ ((prev ^ (prev >> np.uint64(30))) * np.uint64(1566083941))) - np.uint64(i)) & MASK32
+        i += 1
+        if i >= N:
+            mt[0] = mt[N - 1]
+            i = 1
+    mt[0] = UPPER
+    return mt
+
+
+def _mix(cur, nxt, far):
+    y = (cur & UPPER) | (nxt & LOWER)
+    return far ^ (y >> np.uint64(1)) ^ ((y & np.uint64(1)) * np.uint64(MATRIX_A))
+
+
+def twist_temper(mt: np.ndarray, count: int = N) -> np.ndarray:
+    """상태 → 첫 count개 출력 워드 (count, 스트림 수) uint32.
+    twist의 순차 의존성(mt[kk]가 먼저 갱신된 mt[kk+M-N]을 씀)은 227칸 단위 블록으로 풀어서 계산.
+    count <= N-M이면 첫 블록만 (운세 한 번에 필요한 워드는 보통 20개 안쪽)"""
+    if count <= N - M:
+        y = _mix(mt[:count], mt[1:count + 1], mt[M:M + count])
+    else:
+        y = np.empty_like(mt)
+        y[:N - M] = _mix(mt[:N - M], mt[1:N - M + 1], mt[M:])
+        y[N - M:2 * (N - M)] = _mix(mt[N - M:2 * (N - M)], mt[N - M + 1:2 * (N - M) + 1], y[:N - M])
+        y[2 * (N - M):N - 1] = _mix(mt[2 * (N - M):N - 1], mt[2 * (N - M) + 1:], y[N - M:M - 1])
+        y[N - 1] = _mix(mt[N - 1], y[0], y[M - 1])
+        y = y[:count]
+    y ^= y >> np.uint64(11)
+    y ^= (y << np.uint64(7)) & np.uint64(0x9D2C5680)
+    y ^= (y << np.uint64(15)) & np.uint64(0xEFC60000)
+    y ^= y >> np.uint64(18)
+    return (y & MASK32).astype(np.uint32)
+
+
+class Streams:
+    """스트림마다 random.Random 하나처럼: randbelow(n)은 CPython _randbelow_with_getrandbits와 같은 워드를 쓴다.
+    처음엔 앞 WORDS개 워드만 만들고, 거절이 길어져 모자라면 624개 전부 다시 만든다"""
+
+    WORDS = 64
+
+    def __init__(self, mt: np.ndarray):
+        self.mt = mt
+        self.words = twist_temper(mt, self.WORDS)
+        self.pos = np.zeros(mt.shape[1], dtype=np.int64)
+        self._cols = np.arange(mt.shape[1])
+
+    def _word(self, rows, cols):
+        if rows.max() >= len(self.words):
+            if len(self.words) == N:           # 첫 624워드 안에서 끝나지 않을 확률은 사실상 0
+                raise RuntimeError("거절 샘플링이 624워드를 넘었습니다")
+            self.words = twist_temper(self.mt, N)
+        return self.words[rows, cols]
+
+    def randbelow(self, n: int) -> np.ndarray:
+        shift = np.uint32(32 - n.bit_length())       # getrandbits(k) = 워드 상위 k비트
+        r = self._word(self.pos, self._cols) >> shift
+        bad = np.flatnonzero(r >= n)
+        while len(bad):
+            self.pos[bad] += 1
+            r[bad] = self._word(self.pos[bad], bad) >> shift
+            bad = bad[r[bad] >= n]
+        self.pos += 1
+        return r.astype(np.int64)
+
+    def randint(self, a: int, b: int) -> np.ndarray:
+        return a + self.randbelow(b - a + 1)
+
+    def sample_positions(self, n: int, k: int) -> np.ndarray:
+        """sample(range(n), k) — n이 작을 때(<= 21) CPython이 쓰는 pool 방식 그대로, (스트림 수, k)"""
+        assert n <= 21, "set 방식 sample은 재현하지 않음"
+        pool = np.tile(np.arange(n), (len(self.pos), 1))
+        rows = np.arange(len(self.pos))
+        out = np.empty((len(self.pos), k), dtype=np.int64)
+        for i in range(k):
+            j = self.randbelow(n - i)
+            out[:, i] = pool[rows, j]
+            pool[rows, j] = pool[:, n - i - 1]
+        return out
+
+
+# ============ 만들기 ============
+def _seeds(dates, purpose: str) -> np.ndarray:
+    """seed_by_date와 같은 키 → (날짜 수 × 12) 시드, 날짜 순 그다음 별자리 순"""
+    out = []
+    for d in dates:
+        iso = d.isoformat()
+        for sign in SIGN_KO:
+            out.append(int(hashlib.sha256(f"{iso}::{sign}::{purpose}".encode()).hexdigest()[:16], 16))
+    return np.array(out, dtype=np.uint64)
+
+
+def compute(start_ordinal: int, days: int) -> dict:
+    """[start, start+days) 날짜의 전체 열 — 워커에서 실행"""
+    dates = [dt.date.fromordinal(start_ordinal + i) for i in range(days)]
+    lucky = seed_words(_seeds(dates, "lucky"))
+    tips_state = seed_words(_seeds(dates, "tips"))
+    shape = (days, len(SIGN_KO))
+    cols = {"score": Streams(lucky).randint(*SCORE_RANGE)}   # today_rank_all: 새 rng의 첫 randint
+    rng = Streams(lucky)                                      # detail_fortune: 같은 시드로 새 rng
+    for c in STAT_COLUMNS:
+        cols[c] = rng.randint(*STAT_RANGE)
+    for c, seq in (("color", LUCKY_COLORS), ("item", LUCKY_ITEMS), ("vibe", VIBES), ("message", MESSAGES)):
+        cols[c] = rng.randbelow(len(seq))
+    out = {c: v.reshape(shape).astype(np.uint8) for c, v in cols.items()}
+
+    # tips: 원소마다 SUGGESTIONS 길이가 다를 수 있어 길이별로 나눠서
+    tips = np.full((days * len(SIGN_KO), TIPS_K), 255, dtype=np.uint8)
+    sizes = np.array([len(SUGGESTIONS[ELEMENT[s]]) for s in SIGN_KO] * days)
+    for n in np.unique(sizes):
+        rows = np.flatnonzero(sizes == n)
+        k = min(TIPS_K, int(n))
+        tips[rows, :k] = Streams(tips_state[:, rows]).sample_positions(int(n), k)
+    out["tips"] = tips.reshape(shape + (TIPS_K,))
+    return out
+
+
+def build(path: str, start: dt.date, days: int, workers: int = None, chunk_days: int = CHUNK_DAYS) -> dict:
+    """start부터 days일치 달력을 만들어 path에 저장. workers=1이면 이 프로세스에서 직접"""
+    workers = workers or os.cpu_count() or 1
+    chunks = [(start.toordinal() + i, min(chunk_days, days - i)) for i in range(0, days, chunk_days)]
+    t0 = time.perf_counter()
+    if workers == 1:
+        parts = [compute(*c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as ex:
+            parts = list(ex.map(compute, *zip(*chunks)))
+    cols = {c: np.concatenate([p[c] for p in parts]) for c in COLUMNS}
+    seconds = time.perf_counter() - t0
+    meta = {"version": 1, "start": start.isoformat(), "days": days, "signs": SIGN_KO,
+            "fingerprint": fingerprint(), "built": time.strftime("%Y-%m-%d %H:%M:%S")}
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, meta=np.array(json.dumps(meta, ensure_ascii=False)), **cols)
+    os.replace(tmp, path)
+    return {"days": days, "workers": workers, "seconds": seconds, "dates_per_sec": days / seconds,
+            "bytes": os.path.getsize(path)}
+
+
+# ============ 찾기 ============
+class FortuneCalendar:
+    """만들어 둔 달력. day(date)는 day_fortunes와 같은 (랭킹, {별자리: 디테일})을 돌려준다 (범위 밖이면 None)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with np.load(path) as z:
+            self.meta = json.loads(str(z["meta"]))
+            self.cols = {c: z[c] for c in COLUMNS}
+        if self.meta.get("fingerprint") != fingerprint():
+            raise ValueError(f"fortune.py 데이터가 바뀌어 다시 만들어야 합니다: {path}")
+        self.start = dt.date.fromisoformat(self.meta["start"])
+        self.end = self.start + dt.timedelta(days=self.meta["days"])   # 미포함
+
+    def __contains__(self, date) -> bool:
+        return self.start <= date < self.end
+
+    def __len__(self):
+        return self.meta["days"]
+
+    def day(self, date: dt.date):
+        if date not in self:
+            return None
+        i = (date - self.start).days
+        row = {c: self.cols[c][i].tolist() for c in COLUMNS}
+        rankings = sorted(zip(SIGN_KO, row["score"]), key=lambda x: x[1], reverse=True)   # today_rank_all과 같은 안정 정렬
+        fortunes = {}
+        for j, sign in enumerate(SIGN_KO):
+            sugg = SUGGESTIONS[ELEMENT[sign]]
+            fortunes[sign] = {
+                **{c: row[c][j] for c in STAT_COLUMNS},
+                "tips": [sugg[t] for t in row["tips"][j][:min(TIPS_K, len(sugg))]],
+                "lucky_color": LUCKY_COLORS[row["color"][j]], "lucky_item": LUCKY_ITEMS[row["item"][j]],
+                "vibe": VIBES[row["vibe"][j]], "message": MESSAGES[row["message"][j]],
+            }
+        return rankings, fortunes
+
+
+def load_calendar(path: str = FORTUNE_CALENDAR_PATH):
+    """달력이 없거나 깨졌거나 데이터가 바뀌었으면 None (전부 계산)"""
+    try:
+        return FortuneCalendar(path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def verify(calendar: FortuneCalendar, limit: int = None) -> dict:
+    """fortune.py로 직접 계산한 값과 날짜별로 비교 (limit일만 보려면 앞에서부터)"""
+    from fortune import detail_fortune, today_rank_all
+    days = len(calendar) if limit is None else min(limit, len(calendar))
+    bad = []
+    t0 = time.perf_counter()
+    for i in range(days):
+        d = calendar.start + dt.timedelta(days=i)
+        if calendar.day(d) != (today_rank_all(d), {s: detail_fortune(s, d) for s in SIGN_KO}):
+            bad.append(d)
+    seconds = time.perf_counter() - t0
+    return {"days": days, "mismatch": bad, "seconds": seconds}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="운세 달력 (날짜 범위 전체 미리 계산)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="날짜 범위 → 달력 파일")
+    b.add_argument("-o", "--output", default=FORTUNE_CALENDAR_PATH)
+    b.add_argument("--start", type=dt.date.fromisoformat, default=dt.date.today().replace(month=1, day=1))
+    b.add_argument("--years", type=int, default=10)
+    b.add_argument("--days", type=int, help="--years 대신 날짜 수로")
+    b.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    b.add_argument("--chunk-days", type=int, default=CHUNK_DAYS)
+    i = sub.add_parser("info", help="달력 범위/크기")
+    i.add_argument("path", nargs="?", default=FORTUNE_CALENDAR_PATH)
+    v = sub.add_parser("verify", help="fortune.py 계산과 비교")
+    v.add_argument("path", nargs="?", default=FORTUNE_CALENDAR_PATH)
+    v.add_argument("--limit", type=int, help="앞에서부터 이 날짜 수만")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        days = args.days or (args.start.replace(year=args.start.year + args.years) - args.start).days
+        report = build(args.output, args.start, days, args.workers, args.chunk_days)
+        print(f"{args.output}: {args.start} 부터 {days}일 × {len(SIGN_KO)}별자리 — 워커 {report['workers']}개, "
+              f"{report['seconds']:.2f}s ({report['dates_per_sec']:,.0f} 날짜/s), {report['bytes'] / 1024:.0f} KB")
+        return 0
+
+    calendar = load_calendar(args.path)
+    if calendar is None:
+        print(f"달력을 열 수 없거나 지금 fortune.py와 맞지 않습니다: {args.path}", file=sys.stderr)
+        return 1
+    if args.cmd == "info":
+        print(f"{args.path}: {calendar.start} ~ {calendar.end - dt.timedelta(days=1)} ({len(calendar)}일), "
+              f"{os.path.getsize(args.path) / 1024:.0f} KB, {calendar.meta}")
+        return 0
+    report = verify(calendar, args.limit)
+    print(f"{report['days']}일 비교: 불일치 {len(report['mismatch'])}일 "
+          f"(fortune.py 직접 계산 {report['days'] / report['seconds']:,.0f} 날짜/s)")
+    for d in report["mismatch"][:10]:
+        print(f"  ❌ {d}", file=sys.stderr)
+    return 1 if report["mismatch"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# 앱 전체가 함께 쓰는 외부 HTTP 클라이언트
+# requests.Session 하나(keep-alive 연결 풀)에 동시 요청 수 제한, 호스트별 토큰 버킷, 지터 지수 백오프 재시도,
+# 호스트별 서킷 브레이커, 오류 카운터를 더한다. 실패는 삼키지 않고 예외로 올리고 카운터에 남긴다.
+
+import os
+import random
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_MAX_CONCURRENCY = int(os.environ.get("HTTP_MAX_CONCURRENCY", 8))   # 프로세스 전체 동시 요청 수
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 2))                   # 첫 시도 뒤 재시도 횟수
+HTTP_RATE = float(os.environ.get("HTTP_RATE_PER_HOST", 10))             # 호스트별 초당 요청 수 (0 = 제한 없음)
+HTTP_BURST = int(os.environ.get("HTTP_BURST", 10))                      # 쉬고 있던 호스트에 한꺼번에 보낼 수 있는 수
+BACKOFF_BASE = 0.2       # 초. n번째 재시도 전 0 ~ min(BACKOFF_MAX, BACKOFF_BASE * 2**n) 사이에서 무작위로 쉰다
+BACKOFF_MAX = 2.0
+BREAKER_THRESHOLD = 5    # 호스트별 연속 실패가 이만큼이면 회로를 연다
+BREAKER_COOLDOWN = 30.0  # 열린 회로는 이 시간 뒤 요청 하나만 시험 삼아 보낸다
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RETRY_ERRORS = (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)
+# 관리자 화면이 따로 보여주는 카운터 — 나머지(오류 종류별 개수, throttled)는 전부 뒤에 붙여서 보여준다
+COUNTERS = {"requests", "ok", "retries", "ms", "throttle_ms", "circuit"}
+USER_AGENT = "FortuneApp/1.0 (Streamlit; star-sign ranking demo)"
+
+
+class CircuitOpen(requests.RequestException):
+    """호스트의 회로가 열려 있어서 요청을 보내지 않았다"""
+
+
+class _Breaker:
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False       # 반열림 상태에서 시험 요청이 나가 있는지
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 할 시간(초)을 돌려준다. 모자라면 빚을 져서 먼저 온 순서대로 기다린다"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class HttpClient:
+    """스레드 안전한 공유 HTTP 클라이언트. get()은 requests.get과 같은 인자를 받는다."""
+
+    def __init__(self, max_concurrency: int = HTTP_MAX_CONCURRENCY, retries: int = HTTP_RETRIES,
+                 rate: float = HTTP_RATE, burst: int = HTTP_BURST):
+        self.retries = retries
+        self.rate = rate
+        self.burst = burst
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._buckets = {}
+        self.stats = {}          # 호스트 → {requests, ok, retries, 오류 종류별 개수, ms}
+
+    # ---- 카운터 ----
+    def _count(self, host: str, key: str, n=1):
+        with self._lock:
+            s = self.stats.setdefault(host, {"requests": 0, "ok": 0, "retries": 0, "ms": 0.0})
+            s[key] = s.get(key, 0) + n
+
+    def snapshot(self) -> dict:
+        """호스트별 카운터 복사본 (+ 회로 상태)"""
+        with self._lock:
+            out = {h: dict(s) for h, s in self.stats.items()}
+            for h, b in self._breakers.items():
+                out.setdefault(h, {})["circuit"] = "open" if b.opened_at is not None else "closed"
+        return out
+
+    # ---- 서킷 브레이커 ----
+    def _allow(self, host: str) -> bool:
+        with self._lock:
+            b = self._breakers.setdefault(host, _Breaker())
+            if b.opened_at is None:
+                return True
+            if time.monotonic() - b.opened_at < BREAKER_COOLDOWN or b.trial:
+                return False
+            b.trial = True
+            return True
+
+    def _record(self, host: str, ok: bool):
+        with self._lock:
+            b = self._breakers.setdefault(host, _Breaker())
+            b.trial = False
+            if ok:
+                b.failures, b.opened_at = 0, None
+                return
+            b.failures += 1
+            if b.opened_at is not None or b.failures >= BREAKER_THRESHOLD:
+                b.opened_at = time.monotonic()   # 시험 요청이 실패하면 다시 쿨다운
+
+    # ---- 속도 제한 ----
+    def _throttle(self, host: str):
+        with self._lock:
+            bucket = self._buckets.setdefault(host, _TokenBucket(self.rate, self.burst))
+            delay = bucket.reserve()
+        if delay > 0:
+            self._count(host, "throttled")
+            self._count(host, "throttle_ms", delay * 1000)
+            time.sleep(delay)
+
+    # ---- 요청 ----
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET + 재시도. 최종 응답이 오류 상태면 HTTPError, 회로가 열려 있으면 CircuitOpen,
+        그 밖의 requests 예외는 종류별로 세고 그대로 올린다 (연결/타임아웃/끊긴 응답만 재시도)"""
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            if not self._allow(host):
+                self._count(host, "circuit_open")
+                raise CircuitOpen(f"{host}: 연속 실패로 잠시 요청을 보내지 않습니다")
+            self._throttle(host)
+            self._count(host, "requests")
+            t0 = time.perf_counter()
+            retry_after = None
+            ok = False           # finally에서 회로에 남길 결과 — 어떤 경로로 나가도 반열림 시험(trial)이 풀린다
+            try:
+                try:
+                    with self._slots:
+                        r = self.session.get(url, **kwargs)
+                except requests.RequestException as e:
+                    self._count(host, error_kind(e))
+                    if not isinstance(e, RETRY_ERRORS) or attempt == self.retries:
+                        raise
+                else:
+                    if r.status_code < 400:
+                        ok = True
+                        self._count(host, "ok")
+                        self._count(host, "ms", (time.perf_counter() - t0) * 1000)
+                        return r
+                    self._count(host, f"http_{r.status_code}")
+                    if r.status_code not in RETRY_STATUS:
+                        # 4xx는 요청 쪽 문제라 재시도하지 않고, 호스트는 살아 있는 것으로 본다
+                        ok = True
+                        r.raise_for_status()
+                    if attempt == self.retries:
+                        r.raise_for_status()
+                    retry_after = r.headers.get("Retry-After")
+            finally:
+                self._record(host, ok)
+            self._count(host, "retries")
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(BACKOFF_MAX, float(retry_after)))
+            time.sleep(delay)
+
+
+def error_kind(e: requests.RequestException) -> str:
+    """카운터 이름: timeout, connect, 그 밖에는 예외 이름 (ChunkedEncodingError → chunked_encoding)"""
+    if isinstance(e, requests.Timeout):
+        return "timeout"
+    if isinstance(e, requests.ConnectionError):
+        return "connect"
+    name = re.sub(r"(?<!^)(?=[A-Z])", "_", type(e).__name__).lower()
+    return name[:-len("_error")] if name.endswith("_error") else name
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """프로세스에 하나뿐인 공유 클라이언트"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
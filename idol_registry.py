@@ -0,0 +1,122 @@
+# 아이돌 레지스트리 — 프리셋(fortune.IDOLS) + 사이드바에서 추가한 아이돌을 SQLite 파일 하나에 저장한다.
+# 재시작해도 남고, 같은 서버의 세션/프로세스가 함께 쓴다 (WAL, (이름, 그룹) UNIQUE라 동시에 같은 아이돌을 넣어도 한 번).
+# 페이지는 (별자리, 그룹) 색인으로 한 페이지씩만 읽는다 — 아이돌이 수만 명이어도 페이지 비용은 거의 같다.
+
+import os
+import sqlite3
+import threading
+import time
+
+IDOL_DB_PATH = os.environ.get("IDOL_DB", "idols.sqlite3")
+IDOL_PAGE_SIZE = int(os.environ.get("IDOL_PAGE_SIZE", 12))
+ADD_FIELDS = ("name", "group", "sign", "wiki")
+
+
+class IdolRegistry:
+    """아이돌 목록 (SQLite). 행은 fortune.IDOLS와 같은 dict: {"name", "group", "sign", "wiki"}"""
+
+    def __init__(self, path: str = IDOL_DB_PATH, presets=None):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {"queries": 0, "added": 0, "duplicate": 0}
+        with self._conn() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS idols (
+                id INTEGER PRIMARY KEY, name TEXT NOT NULL, grp TEXT NOT NULL, sign TEXT NOT NULL,
+                wiki TEXT, preset INTEGER NOT NULL DEFAULT 0, added_at REAL NOT NULL, UNIQUE (name, grp))""")
+            # 별자리만 → (sign, id) 순서대로 LIMIT, 별자리+그룹 → (sign, grp)로 맞는 행만 찾아 정렬, 그룹 목록 → grp
+            conn.execute("CREATE INDEX IF NOT EXISTS idols_sign ON idols (sign, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idols_sign_grp ON idols (sign, grp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idols_grp ON idols (grp)")
+        if presets is None:
+            from fortune import IDOLS as presets
+        self.add_many(presets, preset=True)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드마다 따로 (Streamlit 세션 스레드마다)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key: str, n: int = 1):
+        if n:
+            with self._lock:
+                self.stats[key] += n
+
+    # ---------- 쓰기 ----------
+    def add(self, name: str, group: str, sign: str, wiki: str = None) -> bool:
+        """아이돌 한 명 추가. 같은 (이름, 그룹)이 이미 있으면 False"""
+        return self.add_many([{"name": name, "group": group, "sign": sign, "wiki": wiki}]) == 1
+
+    def add_many(self, idols, preset: bool = False) -> int:
+        """여러 명을 한 트랜잭션으로. 새로 들어간 수를 돌려준다 (이미 있는 아이돌은 건너뜀)"""
+        now = time.time()
+        rows = [(i["name"], i["group"], i["sign"], i.get("wiki") or i["name"], int(preset), now) for i in idols]
+        with self._conn() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT INTO idols (name, grp, sign, wiki, preset, added_at) VALUES (?, ?, ?, ?, ?, ?) "
+                             "ON CONFLICT (name, grp) DO NOTHING", rows)
+            added = conn.total_changes - before
+        if not preset:
+            self._count("added", added)
+            self._count("duplicate", len(rows) - added)
+        return added
+
+    # ---------- 읽기 ----------
+    def page(self, sign: str = None, groups=None, page: int = 0, page_size: int = IDOL_PAGE_SIZE):
+        """조건에 맞는 아이돌 중 page번째(0부터) 페이지 → (아이돌 목록, 전체 수). 추가한 순서대로"""
+        where, params = [], []
+        if sign is not None:
+            where.append("sign = ?")
+            params.append(sign)
+        if groups:
+            groups = list(groups)
+            where.append(f"grp IN ({','.join('?' * len(groups))})")
+            params += groups
+        sql = " WHERE " + " AND ".join(where) if where else ""
+        if sign is not None and groups:
+            # 통계(ANALYZE)가 없으면 SQLite는 ORDER BY id 정렬을 피하려고 (sign, id)로 별자리 전체를 훑는다 —
+            # 고른 그룹의 행만 (sign, grp)로 찾아 정렬하는 쪽이 수만 명일 때 100배 빠르다
+            sql = " INDEXED BY idols_sign_grp" + sql
+        conn = self._conn()
+        total = conn.execute(f"SELECT COUNT(*) FROM idols{sql}", params).fetchone()[0]
+        rows = conn.execute(f"SELECT name, grp, sign, wiki FROM idols{sql} ORDER BY id LIMIT ? OFFSET ?",
+                            params + [page_size, max(page, 0) * page_size]).fetchall()
+        self._count("queries")
+        return [dict(zip(ADD_FIELDS, r)) for r in rows], total
+
+    def groups(self):
+        """등록된 그룹 이름 (정렬)"""
+        return [g for (g,) in self._conn().execute("SELECT DISTINCT grp FROM idols ORDER BY grp")]
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM idols").fetchone()[0]
+
+    def summary(self) -> dict:
+        """저장된 수 (프리셋/추가) + 이 프로세스의 통계"""
+        rows = dict(self._conn().execute("SELECT preset, COUNT(*) FROM idols GROUP BY preset").fetchall())
+        out = {"preset": rows.get(1, 0), "custom": rows.get(0, 0)}
+        with self._lock:
+            out.update(self.stats)
+        return out
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> IdolRegistry:
+    """프로세스에 하나 (IDOL_DB_PATH를 바꾸면 다시 연다)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None or _registry.path != IDOL_DB_PATH:
+            _registry = IdolRegistry(IDOL_DB_PATH)
+        return _registry
+
+
+def page_count(total: int, page_size: int = IDOL_PAGE_SIZE) -> int:
+    return max(1, -(-total // page_size))
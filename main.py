@@ -3,10 +3,21 @@
 
 import streamlit as st
 import datetime as dt
-import random
-import hashlib
-import requests
-from functools import lru_cache
+import html
+import os
+import sqlite3
+
+from fortune import CELEB_BY_SIGN, SIGN_EMOJI, SIGN_KO, day_cache, day_fortunes, fortune_today
+from fortune_calendar import load_calendar
+from http_client import COUNTERS, get_client
+from idol_registry import get_registry, page_count
+from thumb_bundle import card_thumbs, load_bundle
+from thumb_proxy import THUMB_PROXY_PORT, start_server
+from warmup import Warmup
+from wiki_thumbs import cache_stats
+
+# 관리자 화면: ?admin=<토큰> 으로 열면 사이드바에 캐시 통계를 보여준다
+ADMIN_TOKEN = os.environ.get("FORTUNE_ADMIN_TOKEN", "")
 
 st.set_page_config(
     page_title="오늘의 별자리 운세 — K‑Idol",
@@ -50,126 +61,32 @@ box-shadow:0 16px 34px rgba(0,0,0,.08)}
 st.markdown(STYLES, unsafe_allow_html=True)
 
 # ---------- 데이터 ----------
-SIGNS = [
-    ("양자리", "Aries", "♈"), ("황소자리", "Taurus", "♉"), ("쌍둥이자리", "Gemini", "♊"),
-    ("게자리", "Cancer", "♋"), ("사자자리", "Leo", "♌"), ("처녀자리", "Virgo", "♍"),
-    ("천칭자리", "Libra", "♎"), ("전갈자리", "Scorpio", "♏"), ("사수자리", "Sagittarius", "♐"),
-    ("염소자리", "Capricorn", "♑"), ("물병자리", "Aquarius", "♒"), ("물고기자리", "Pisces", "♓"),
-]
-SIGN_KO = [s[0] for s in SIGNS]
-SIGN_EN = {s[0]: s[1] for s in SIGNS}
-SIGN_EMOJI = {s[0]: s[2] for s in SIGNS}
-
-ELEMENT = {
-    "양자리": "불", "사자자리": "불", "사수자리": "불",
-    "황소자리": "흙", "처녀자리": "흙", "염소자리": "흙",
-    "쌍둥이자리": "공기", "천칭자리": "공기", "물병자리": "공기",
-    "게자리": "물", "전갈자리": "물", "물고기자리": "물",
-}
-
-SUGGESTIONS = {
-    "불": ["🔥 에너지 폭발! 하이킥 산책", "🎤 노래방에서 리즈곡 부르기", "🌶️ 매운 음식 도전"],
-    "흙": ["🌿 초록 카페에서 사진찍기", "🍞 동네 베이커리 신상 투어", "🧹 책상 정리하고 새 시작"],
-    "공기": ["🗣️ 먼저 안부 보내기", "📚 도서관에서 1시간 집중", "🎧 새 플레이리스트 만들기"],
-    "물": ["🛁 따뜻한 반신욕", "🍵 말차/허브티로 힐링", "🎨 감성 일기/드로잉"],
-}
-
-# (글로벌) 유명인 예시 — 기본 카드용
-CELEB_BY_SIGN = {
-    "양자리": ["Lady Gaga", "Emma Watson"],
-    "황소자리": ["아이유", "David Beckham"],
-    "쌍둥이자리": ["Angelina Jolie", "Kanye West"],
-    "게자리": ["Selena Gomez", "Ariana Grande"],
-    "사자자리": ["Jennifer Lopez", "Barack Obama"],
-    "처녀자리": ["정국", "Zendaya"],
-    "천칭자리": ["지민 (가수)", "Kim Kardashian"],
-    "전갈자리": ["Leonardo DiCaprio", "Drake (래퍼)"],
-    "사수자리": ["Taylor Swift", "진 (가수)"],
-    "염소자리": ["뷔 (가수)", "제니 (가수)"],
-    "물병자리": ["Harry Styles", "제이홉"],
-    "물고기자리": ["SUGA", "Rihanna"],
-}
-
-# ▼▼ K‑Idol 프리셋 (검증 필요시 사용자 입력으로 보완 가능) ▼▼
-# 간편 매칭을 위한 샘플: 이름, 그룹, 별자리, 위키 제목
-IDOLS = [
-    # RIIZE
-    {"name": "SHOTARO", "group": "RIIZE", "sign": "사수자리", "wiki": "Shotaro (singer)"},
-    {"name": "SUNGCHAN", "group": "RIIZE", "sign": "처녀자리", "wiki": "Sungchan"},
-    {"name": "SOHEE", "group": "RIIZE", "sign": "전갈자리", "wiki": "Sohee (singer)"},
-    {"name": "WONBIN", "group": "RIIZE", "sign": "물고기자리", "wiki": "Wonbin (singer)"},
-    {"name": "EUNSEOK", "group": "RIIZE", "sign": "물고기자리", "wiki": "Eunseok"},
-    {"name": "ANTON", "group": "RIIZE", "sign": "양자리", "wiki": "Anton (singer)"},
-    # NCT (일부)
-    {"name": "TAEYONG", "group": "NCT", "sign": "게자리", "wiki": "Taeyong"},
-    {"name": "MARK", "group": "NCT", "sign": "사자자리", "wiki": "Mark Lee (singer)"},
-    {"name": "JAEHYUN", "group": "NCT", "sign": "물병자리", "wiki": "Jaehyun"},
-    {"name": "HAECHAN", "group": "NCT", "sign": "쌍둥이자리", "wiki": "Haechan"},
-    {"name": "TEN", "group": "NCT", "sign": "물고기자리", "wiki": "Ten (singer)"},
-    {"name": "JISUNG", "group": "NCT", "sign": "물병자리", "wiki": "Jisung (singer, born 2002)"},
-    # 5세대 예시
-    {"name": "ILLIT WONHEE", "group": "ILLIT", "sign": "쌍둥이자리", "wiki": "Wonhee"},
-    {"name": "ILLIT MINJU", "group": "ILLIT", "sign": "물병자리", "wiki": "Minju (singer, born 2004)"},
-    {"name": "TWS SHINYU", "group": "TWS", "sign": "물고기자리", "wiki": "Shinyu"},
-    {"name": "TWS DOHOON", "group": "TWS", "sign": "사수자리", "wiki": "Dohoon"},
-    {"name": "BABYMONSTER AHYEON", "group": "BABYMONSTER", "sign": "물고기자리", "wiki": "Ahyeon"},
-]
-
-GROUPS = sorted(list({i["group"] for i in IDOLS}))
-
-# ---------- 유틸 ----------
-
-def seed_by_date(sign_ko: str, date: dt.date) -> random.Random:
-    key = f"{date.isoformat()}::{sign_ko}::lucky"
-    h = hashlib.sha256(key.encode()).hexdigest()
-    seed_val = int(h[:16], 16)
-    return random.Random(seed_val)
-
-@lru_cache(maxsize=256)
-def wiki_thumb(title: str):
-    """위키피디아 썸네일 URL 가져오기 (없으면 None)"""
-    try:
-        url = f"https://{('ko' if any(ord(c) > 127 for c in title) else 'en')}.wikipedia.org/api/rest_v1/page/summary/" + requests.utils.quote(title)
-        r = requests.get(url, timeout=6)
-        if r.ok:
-            data = r.json()
-            thumb = data.get('thumbnail', {}).get('source')
-            if thumb:
-                return thumb
-    except Exception:
-        pass
-    return None
-
-
-def today_rank_all(date: dt.date):
-    scores = []
-    for sign in SIGN_KO:
-        rng = seed_by_date(sign, date)
-        score = rng.randint(55, 100)
-        scores.append((sign, score))
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores
-
-
-def detail_fortune(sign: str, date: dt.date):
-    rng = seed_by_date(sign, date)
-    def roll():
-        return rng.randint(60, 99)
-    love = roll(); money = roll(); study = roll(); health = roll()
-    element = ELEMENT[sign]
-    tips = random.sample(SUGGESTIONS[element], k=min(3, len(SUGGESTIONS[element])))
-    lucky_color = rng.choice(["💜 보라", "💙 파랑", "💚 초록", "❤️ 빨강", "🧡 주황", "💛 노랑", "🖤 블랙", "🤍 화이트", "🤎 브라운"])
-    lucky_item = rng.choice(["📸 필름카메라", "🎧 무선이어폰", "🍫 초콜릿", "🧴 핸드크림", "📒 노트", "💄 틴트", "🥤 아이스라떼", "📿 팔찌"])
-    vibe = rng.choice(["하이틴 무드🌈", "스포티 에너지💥", "러블리 감성💖", "시크&모던🖤", "내추럴 힐링🍃"])
-    msg = rng.choice([
-        "작은 씬스틸러가 되는 날!", "우연이 자주 겹치는 날 🔮", "집중력이 폭발하는 꿀컨디션!",
-        "좋아하는 사람과 거리 좁히기 딱 좋은 타이밍 💘", "새 시도를 두려워하지 마세요 ✨",
-    ])
-    return {
-        "love": love, "money": money, "study": study, "health": health,
-        "tips": tips, "lucky_color": lucky_color, "lucky_item": lucky_item,
-        "vibe": vibe, "message": msg,
-    }
+# 별자리/아이돌 데이터와 운세 계산은 fortune.py
+
+@st.cache_resource
+def thumb_bundle():
+    # 오프라인 번들은 서버 시작 때 한 번 mmap (없으면 None → 전부 실시간으로)
+    return load_bundle()
+
+@st.cache_resource
+def thumb_proxy_server():
+    # THUMB_PROXY_PORT를 켰을 때만, 서버 프로세스 하나에 서빙 스레드 하나 (번들 이미지도 같은 주소로 서빙).
+    # 포트를 못 잡으면 None → 카드는 원본 URL/data: URI 그대로
+    return start_server(bundle=thumb_bundle()) if THUMB_PROXY_PORT else None
+
+@st.cache_resource
+def fortune_calendar():
+    # 미리 만든 운세 달력(fortune_calendar.py build)이 있으면 그 범위의 날짜는 계산 대신 찾아 쓴다
+    day_cache.calendar = load_calendar()
+    return day_cache.calendar
+
+@st.cache_resource
+def warmup():
+    # 서버 시작/매일 자정에 오늘 랭킹·운세와 프리셋 썸네일을 백그라운드로 미리 채운다
+    fortune_calendar()
+    return Warmup(bundle=thumb_bundle(), proxy=thumb_proxy_server()).start()
+
+warmup()
 
 # ---------- 헤더 ----------
 col1, col2 = st.columns([1,1])
@@ -181,7 +98,7 @@ with col2:
     st.markdown("""<div class='marquee'><span>🌌 NCT · NCT WISH · RIIZE · 5세대 아이돌 매칭 업데이트! 🌠🌠🌠</span></div>""", unsafe_allow_html=True)
 
 # ---------- 입력 ----------
-today = dt.date.today()
+today = fortune_today()
 left, right = st.columns([1,2])
 with left:
     sign = st.selectbox("내 별자리", options=SIGN_KO, index=0, help="양자리~물고기자리 순")
@@ -196,11 +113,12 @@ g1, g2 = st.columns([2,3])
 with g1:
     use_filter = st.toggle("특정 그룹만 보기", value=True)
 with g2:
-    selected_groups = st.multiselect("그룹 선택", options=["NCT","NCT WISH","RIIZE","ILLIT","TWS","BABYMONSTER"], default=["NCT","RIIZE"])
+    group_options = get_registry().groups()
+    selected_groups = st.multiselect("그룹 선택", options=group_options, default=[g for g in ("NCT", "RIIZE") if g in group_options])
 
 # ---------- 랭킹 영역 ----------
 st.markdown("### 🏆 오늘의 별자리 랭킹")
-rankings = today_rank_all(today)
+rankings, fortunes = day_fortunes(today)
 
 # 상위 3 카드를 강조
 top3_cols = st.columns(3)
@@ -225,7 +143,7 @@ st.divider()
 
 # ---------- 내 별자리 상세 ----------
 st.markdown(f"## {SIGN_EMOJI[sign]} {sign} — 오늘의 디테일")
-info = detail_fortune(sign, today)
+info = fortunes[sign]
 
 # KPIs
 st.markdown("<div class='kpis'>" +
@@ -249,37 +167,52 @@ st.divider()
 # ---------- 같은 별자리 스타 (기본) ----------
 st.markdown(f"### 🌟 {sign}와(과) 같은 별자리 — 유명인")
 
+celebs = CELEB_BY_SIGN.get(sign, [])[:6]
+# 아이돌은 레지스트리(SQLite)에서 이 별자리·그룹의 한 페이지만
+idol_page = st.session_state.get("idol_page", 1)
+filtered, idol_total = get_registry().page(sign, selected_groups if use_filter else None, page=idol_page - 1)
+if not filtered and idol_page > 1:   # 별자리/그룹을 바꿔서 페이지가 줄었으면 첫 페이지로
+    idol_page = st.session_state["idol_page"] = 1
+    filtered, idol_total = get_registry().page(sign, selected_groups if use_filter else None)
+
+# 이 페이지의 썸네일: 번들에 있는 제목은 네트워크 없이, 나머지만 한꺼번에 요청 — 느린 카드는 마감 후 기본 아이콘으로
+thumbs = card_thumbs(celebs + [idol.get("wiki") or idol["name"] for idol in filtered], thumb_bundle(),
+                     proxy=thumb_proxy_server())
+
 def celeb_card(title: str, subtitle: str = ""):
-    img = wiki_thumb(title)
+    img = thumbs.get(title)
+    title, subtitle = html.escape(title), html.escape(subtitle)
     if img is None:
         st.markdown(f"<div class='card'><div style='height:180px;display:flex;align-items:center;justify-content:center;font-size:46px'>🎤</div><div class='name'>{title}</div><div class='meta'>{subtitle}</div></div>", unsafe_allow_html=True)
     else:
-        st.markdown(f"<div class='card'><img src='{img}'/><div class='name'>{title}</div><div class='meta'>{subtitle}</div></div>", unsafe_allow_html=True)
+        st.markdown(f"<div class='card'><img src='{html.escape(img)}'/><div class='name'>{title}</div><div class='meta'>{subtitle}</div></div>", unsafe_allow_html=True)
 
 cards_col = st.columns(3)
-for i, name in enumerate(CELEB_BY_SIGN.get(sign, [])[:6]):
+for i, name in enumerate(celebs):
     with cards_col[i % 3]:
         celeb_card(name)
 
 # ---------- 같은 별자리 — K‑Idol 매칭 ----------
 st.markdown(f"### 💚 {sign}와(과) 같은 별자리 — K‑Idol")
 
-filtered = [i for i in IDOLS if i["sign"] == sign]
-if use_filter and selected_groups:
-    filtered = [i for i in filtered if i["group"] in selected_groups]
-
 if not filtered:
     st.info("선택한 조건에 맞는 아이돌 카드가 아직 없어요. 사이드바에서 직접 추가해보세요! ✍️")
 else:
     st.markdown("<div class='cards'>", unsafe_allow_html=True)
     for idol in filtered:
         title = idol.get("wiki") or idol["name"]
-        img = wiki_thumb(title)
+        img = thumbs.get(title)
+        # 이름/그룹은 사이드바 입력이 그대로 저장된 값 — 모든 세션에 보이므로 마크업에 넣기 전에 escape
+        label = f"{html.escape(idol['name'])} ({html.escape(idol['group'])})"
+        meta = html.escape(idol["sign"])
         if img is None:
-            st.markdown(f"<div class='card'><div style='height:180px;display:flex;align-items:center;justify-content:center;font-size:46px'>⭐</div><div class='name'>{idol['name']} ({idol['group']})</div><div class='meta'>{idol['sign']}</div></div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='card'><div style='height:180px;display:flex;align-items:center;justify-content:center;font-size:46px'>⭐</div><div class='name'>{label}</div><div class='meta'>{meta}</div></div>", unsafe_allow_html=True)
         else:
-            st.markdown(f"<div class='card'><img src='{img}'/><div class='name'>{idol['name']} ({idol['group']})</div><div class='meta'>{idol['sign']}</div></div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='card'><img src='{html.escape(img)}'/><div class='name'>{label}</div><div class='meta'>{meta}</div></div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
+    pages = page_count(idol_total)
+    if pages > 1:
+        st.number_input(f"페이지 (전체 {idol_total}명, {pages}쪽)", min_value=1, max_value=pages, key="idol_page")
 
 st.caption("이미지는 위키피디아 공개 썸네일을 사용합니다. 일부 인물/페이지는 썸네일이 없을 수 있어요.")
 
@@ -310,16 +243,46 @@ with st.sidebar.form("add_idol"):
 
     if submitted:
         if name.strip():
-            IDOLS.append({
-                "name": name.strip(),
-                "group": group.strip() or "K‑Idol",
-                "sign": sign_from_bday(bday),
-                "wiki": wiki_title.strip() or name.strip(),
-            })
-            st.success(f"추가 완료! {name} — {sign_from_bday(bday)}")
+            try:
+                added = get_registry().add(name.strip(), group.strip() or "K‑Idol", sign_from_bday(bday),
+                                           wiki_title.strip() or name.strip())
+            except sqlite3.Error as e:
+                st.error(f"저장하지 못했어요 — 잠시 후 다시 시도해주세요 ({e})")
+            else:
+                if added:
+                    st.success(f"추가 완료! {name} — {sign_from_bday(bday)}")
+                else:
+                    st.info(f"{name} ({group.strip() or 'K‑Idol'})은(는) 이미 있어요")
         else:
             st.warning("이름은 필수에요 ✨")
 
+# ---------- 사이드바: 관리자 통계 ----------
+if ADMIN_TOKEN and st.query_params.get("admin") == ADMIN_TOKEN:
+    st.sidebar.header("🛠️ 썸네일 캐시")
+    stats = cache_stats()
+    st.sidebar.caption("저장 — 찾음 {found} · 없음 {not_found} · 실패 {failed} · 만료 {expired}".format(**stats))
+    st.sidebar.caption("조회 — 신선 {fresh} · 만료(재검증) {stale} · 없음 {negative} · 미스 {miss} · "
+                       "요청 {fetched} · 합류 {shared} · 백그라운드 갱신 {refresh} · 저장 오류 {store_error}".format(**stats))
+    w = warmup().snapshot()
+    st.sidebar.header("🔥 워밍업")
+    st.sidebar.caption(f"{w['date']} · {w['state']} · {w['runs']}회 · {w['seconds']}s · "
+                       f"운세 {w['fortunes']}/{len(SIGN_KO)} · 썸네일 {w['thumbs']}/{w['thumbs_total']}"
+                       + (f" · 오류 {w['error']}" if w["error"] else ""))
+    st.sidebar.caption("운세 캐시 — 적중 {hit} · 미스 {miss} (달력 {calendar}) · 지운 날짜 {evicted}".format(**day_cache.stats)
+                       + f" · 보관 {', '.join(d.isoformat() for d in day_cache.dates())}")
+    cal = fortune_calendar()
+    st.sidebar.caption(f"운세 달력 — {cal.start} ~ {cal.end - dt.timedelta(days=1)} ({len(cal)}일)" if cal is not None
+                       else "운세 달력 — 없음 (매일 계산)")
+    st.sidebar.caption("아이돌 레지스트리 — 프리셋 {preset} · 추가 {custom} · 이 프로세스: 조회 {queries} · "
+                       "추가 {added} · 중복 {duplicate}".format(**get_registry().summary()))
+    st.sidebar.header("🌐 외부 요청")
+    for host, h in get_client().snapshot().items():
+        errors = {k: v for k, v in h.items() if k not in COUNTERS}
+        avg = h.get("ms", 0) / h["ok"] if h.get("ok") else 0
+        st.sidebar.caption(f"{host} — 요청 {h.get('requests', 0)} · 성공 {h.get('ok', 0)} · 재시도 {h.get('retries', 0)} · "
+                           f"평균 {avg:.0f} ms · 회로 {h.get('circuit', 'closed')}"
+                           + "".join(f" · {k} {v}" for k, v in errors.items()))
+
 # 축하 애니메이션
 if rankings[0][0] == sign:
     st.balloons()
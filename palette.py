@@ -0,0 +1,472 @@
+# 팔레트 분석 — 디코딩/미리보기/히스토그램/팔레트 계산과 데이터. test.py(Streamlit 화면)에서 분리해서
+# 워커 프로세스(palette_pool)나 일괄 처리/벤치마크 스크립트가 Streamlit 없이 import 한다.
+# test.py가 `streamlit run`으로 __main__이 되어도 ImageTooLarge 같은 예외 클래스는 이 모듈 하나뿐이다.
+
+import hashlib
+import io
+import os
+import zlib
+
+import numpy as np
+from PIL import Image, features
+
+from colorspace import bin_lab, merge_similar, srgb_to_lab
+from face_mask import foreground, segment, skin_tone
+
+
+# ============ Pillow LANCZOS 호환 ============
+try:
+    RESAMPLE = Image.Resampling.LANCZOS
+except Exception:
+    RESAMPLE = Image.LANCZOS
+
+# ============ Helper ============
+def to_numpy(img: Image.Image) -> np.ndarray:
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    # 읽기 전용 배열 — np.array()처럼 한 번 더 복사하지 않는다
+    return np.asarray(img)
+
+def resize_for_analysis(img: Image.Image, max_side: int = 128) -> Image.Image:
+    w, h = img.size
+    scale = min(max_side / max(w, h), 1.0)
+    if scale < 1.0:
+        return img.resize((int(w * scale), int(h * scale)), RESAMPLE)
+    return img
+
+_ORIENTATION = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT, 3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM, 5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270, 7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+def _orientation(img: Image.Image) -> int:
+    # PNG의 getexif()는 전체 디코딩을 하므로 헤더에서 읽힌 eXIf만 본다
+    if img.format == "PNG":
+        if "exif" not in img.info:
+            return 1
+        exif = Image.Exif()
+        exif.load(img.info["exif"])
+    else:
+        exif = img.getexif()
+    return exif.get(0x0112, 1)
+
+def apply_exif_orientation(img: Image.Image, orient: int = None) -> Image.Image:
+    """EXIF 회전 반영. 회전이 필요 없으면 복사 없이 그대로 돌려준다"""
+    if orient is None:
+        orient = _orientation(img)
+    return img.transpose(_ORIENTATION[orient]) if orient in _ORIENTATION else img
+
+def open_for_analysis(fp, max_side: int = 128) -> Image.Image:
+    """분석 전용 축소 이미지 열기.
+    JPEG은 draft()로 DCT 단계에서 1/2~1/8 축소 디코딩하고, EXIF 회전은 그대로 반영한다."""
+    img = Image.open(fp)
+    if img.format == "JPEG":
+        img.draft("RGB", (max_side, max_side))
+    # 회전은 축소한 뒤에 적용 — 원본 크기의 회전 사본을 만들지 않는다
+    orient = _orientation(img)
+    return apply_exif_orientation(resize_for_analysis(img, max_side), orient)
+
+def get_simple_palette(img: Image.Image, k: int = 5):
+    small = resize_for_analysis(img, 128)
+    arr = to_numpy(small).reshape(-1, 3) >> 4
+    arr <<= 4
+    uniq, counts = np.unique(arr, axis=0, return_counts=True)
+    idx = np.argsort(-counts)[:k]
+    return [tuple(map(int, uniq[i])) for i in idx]
+
+# ============ 팔레트 알고리즘 ============
+PALETTE_SEED = 0          # k-means 초기화/미니배치 샘플링 시드 (결과 재현용)
+KMEANS_MAX_ITER = 40      # 미니배치 반복 상한
+KMEANS_BATCH = 512        # 미니배치 크기
+MERGE_DELTA_E = 8.0       # 이보다 가까운(ΔE76) 팔레트 색은 하나로 합친다
+SIMPLE_CANDIDATES = 64    # 빠른 양자화에서 중복 제거 전에 볼 상위 칸 수
+
+def quantize_pixels(arr: np.ndarray) -> np.ndarray:
+    """(N,3) uint8 픽셀 → 16단계 칸 번호 (r>>4<<8 | g>>4<<4 | b>>4), uint16"""
+    # 칸 번호는 uint16 버퍼 하나에서 제자리 연산으로 만든다
+    idx = np.right_shift(arr[:, 0], 4, dtype=np.uint16)
+    idx <<= 4
+    idx |= arr[:, 1] >> 4
+    idx <<= 4
+    idx |= arr[:, 2] >> 4
+    return idx
+
+def count_bins(idx: np.ndarray, arr: np.ndarray):
+    """칸 번호별 (개수, 채널합)"""
+    counts = np.bincount(idx, minlength=4096)
+    sums = np.stack([np.bincount(idx, weights=arr[:, c], minlength=4096) for c in range(3)], axis=1)
+    return counts, sums
+
+def histogram_from_pixels(arr: np.ndarray):
+    """(N,3) uint8 픽셀 → 16단계 4096칸 (개수, 채널합) 히스토그램"""
+    return count_bins(quantize_pixels(arr), arr)
+
+def color_histogram(img: Image.Image):
+    small = resize_for_analysis(img, 128)
+    return histogram_from_pixels(to_numpy(small).reshape(-1, 3))
+
+def histogram_points(counts: np.ndarray, sums: np.ndarray):
+    """비어있지 않은 칸의 평균색(RGB float)과 개수"""
+    nz = np.flatnonzero(counts)
+    w = counts[nz].astype(np.float64)
+    return sums[nz] / w[:, None], w
+
+def _cluster_colors(rgb, w, labels, n):
+    """클러스터별 가중 평균 RGB와 픽셀 수 (빈 클러스터 제외)"""
+    tot = np.bincount(labels, weights=w, minlength=n)
+    acc = np.stack([np.bincount(labels, weights=w * rgb[:, c], minlength=n) for c in range(3)], axis=1)
+    nz = tot > 0
+    return acc[nz] / tot[nz, None], tot[nz]
+
+def _median_cut(lab, w, k):
+    boxes = [np.arange(len(lab))]
+    while len(boxes) < k:
+        # 범위 x 픽셀 수가 가장 큰 상자를 가장 긴 축의 가중 중앙값에서 자른다
+        scores = [np.ptp(lab[b], axis=0).max() * w[b].sum() if len(b) > 1 else -1.0 for b in boxes]
+        i = int(np.argmax(scores))
+        if scores[i] <= 0:
+            break
+        b = boxes.pop(i)
+        axis = int(np.argmax(np.ptp(lab[b], axis=0)))
+        order = b[np.argsort(lab[b, axis], kind="stable")]
+        cw = np.cumsum(w[order])
+        cut = int(np.clip(np.searchsorted(cw, cw[-1] / 2), 1, len(order) - 1))
+        boxes += [order[:cut], order[cut:]]
+    labels = np.empty(len(lab), dtype=np.intp)
+    for j, b in enumerate(boxes):
+        labels[b] = j
+    return labels, len(boxes)
+
+def _minibatch_kmeans(X, w, k, seed, max_iter, batch_size, tol=0.5):
+    rng = np.random.default_rng(seed)
+    p = w / w.sum()
+    k = min(k, len(X))
+    # 가중 k-means++ 초기화
+    centers = np.empty((k, X.shape[1]))
+    centers[0] = X[rng.choice(len(X), p=p)]
+    d2 = ((X - centers[0]) ** 2).sum(1)
+    for j in range(1, k):
+        q = d2 * w
+        centers[j] = X[rng.choice(len(X), p=q / q.sum() if q.sum() > 0 else p)]
+        d2 = np.minimum(d2, ((X - centers[j]) ** 2).sum(1))
+    # 미니배치 갱신 (중심별 학습률 = 배치 개수 / 누적 개수)
+    seen = np.zeros(k)
+    for _ in range(max_iter):
+        xb = X[rng.choice(len(X), size=batch_size, p=p)]
+        lb = np.argmin(((xb[:, None, :] - centers[None]) ** 2).sum(-1), axis=1)
+        cnt = np.bincount(lb, minlength=k)
+        sums = np.stack([np.bincount(lb, weights=xb[:, c], minlength=k) for c in range(X.shape[1])], axis=1)
+        seen += cnt
+        m = cnt > 0
+        step = (cnt[m] / seen[m])[:, None] * (sums[m] / cnt[m, None] - centers[m])
+        centers[m] += step
+        if np.abs(step).max(initial=0.0) < tol:
+            break
+    labels = np.argmin(((X[:, None, :] - centers[None]) ** 2).sum(-1), axis=1)
+    return labels, k
+
+def palette_from_histogram(counts, sums, k: int = 5, algorithm: str = "kmeans", seed: int = PALETTE_SEED):
+    if algorithm == "simple":
+        # get_simple_palette와 같은 16단계 칸의 하한값 색 — 지각적으로 거의 같은 칸은 합친다
+        top = np.argsort(-counts, kind="stable")[:SIMPLE_CANDIDATES]
+        top = top[counts[top] > 0]
+        keep, _ = merge_similar(bin_lab()[top], counts[top], MERGE_DELTA_E)
+        return [(int(i >> 8) * 16, int((i >> 4) & 15) * 16, int(i & 15) * 16) for i in top[keep[:k]]]
+    rgb, w = histogram_points(counts, sums)
+    if len(w) == 0:
+        return []
+    lab = srgb_to_lab(rgb)
+    if algorithm == "median_cut":
+        labels, n = _median_cut(lab, w, k)
+    else:
+        labels, n = _minibatch_kmeans(lab, w, k, seed, KMEANS_MAX_ITER, KMEANS_BATCH)
+    colors, weights = _cluster_colors(rgb, w, labels, n)
+    keep, _ = merge_similar(srgb_to_lab(colors), weights, MERGE_DELTA_E)
+    return [tuple(int(round(v)) for v in colors[i]) for i in keep[:k]]
+
+def get_median_cut_palette(img: Image.Image, k: int = 5):
+    return palette_from_histogram(*color_histogram(img), k=k, algorithm="median_cut")
+
+def get_kmeans_palette(img: Image.Image, k: int = 5, seed: int = PALETTE_SEED):
+    return palette_from_histogram(*color_histogram(img), k=k, algorithm="kmeans", seed=seed)
+
+def palette_weights(counts, sums, colors) -> np.ndarray:
+    """히스토그램 픽셀을 가장 가까운 팔레트 색(Lab)에 나눠 준 비율 (합 1)"""
+    rgb, w = histogram_points(counts, sums)
+    if len(colors) == 0 or len(w) == 0:
+        return np.zeros(len(colors))
+    pal = srgb_to_lab(np.array(colors))
+    nearest = np.argmin(((srgb_to_lab(rgb)[:, None, :] - pal[None]) ** 2).sum(-1), axis=1)
+    share = np.bincount(nearest, weights=w, minlength=len(colors))
+    return share / share.sum()
+
+# 사이드바 라벨 → palette_from_histogram(algorithm=...)
+PALETTE_ALGORITHMS = {
+    "빠른 양자화 (16단계)": "simple",
+    "미디언 컷 (Lab)": "median_cut",
+    "미니배치 k-means (Lab)": "kmeans",
+}
+
+# ============ 대용량 업로드 (스트립 스트리밍) ============
+# 이 픽셀 수 이상인 JPEG 외 업로드는 스트립 단위로 읽어서 히스토그램만 누적한다
+STREAM_MIN_PIXELS = int(os.environ.get("PALETTE_STREAM_MIN_PIXELS", 24_000_000))
+# 디컴프레션 밤 차단 상한 (헤더만 읽고 판단)
+MAX_UPLOAD_PIXELS = int(os.environ.get("PALETTE_MAX_PIXELS", 150_000_000))
+STRIP_PIXELS = 2_000_000  # 스트립 하나의 픽셀 수 상한 → 피크 메모리 상한
+PREVIEW_SIDE = 1024
+
+Image.MAX_IMAGE_PIXELS = MAX_UPLOAD_PIXELS
+
+class ImageTooLarge(ValueError):
+    pass
+
+def check_pixel_cap(img: Image.Image, cap: int = MAX_UPLOAD_PIXELS):
+    w, h = img.size
+    if w * h > cap:
+        raise ImageTooLarge(f"{w}x{h} ({w * h / 1e6:.0f}MP) — 최대 {cap / 1e6:.0f}MP까지 분석할 수 있어요.")
+
+_PNG_BPP = {"L": 1, "P": 1, "LA": 2, "RGB": 3, "RGBA": 4}  # 8비트 PNG rawmode
+_STREAM_MODES = {"L", "P", "LA", "RGB", "RGBA"}
+
+def _decode_into(mode, size, codec, args, data, palette=None) -> Image.Image:
+    strip = Image.new(mode, size)
+    if palette is not None:
+        strip.putpalette(palette)
+    decoder = Image._getdecoder(mode, codec, args)
+    decoder.setimage(strip.im, (0, 0) + size)
+    try:
+        decoder.decode(data)
+    finally:
+        decoder.cleanup()
+    return strip
+
+def _png_idat(fp, offset):
+    """IDAT 청크 데이터를 64KB 조각으로"""
+    fp.seek(offset - 8)
+    length = int.from_bytes(fp.read(4), "big")
+    fp.seek(4, 1)
+    while True:
+        while length > 0:
+            buf = fp.read(min(length, 1 << 16))
+            if not buf:
+                return
+            length -= len(buf)
+            yield buf
+        head = fp.read(12)[4:]  # 앞 4바이트는 CRC
+        if len(head) < 8 or head[4:] != b"IDAT":
+            return
+        length = int.from_bytes(head[:4], "big")
+
+def _iter_png_strips(img, rows):
+    # 필터된 스캔라인은 zlib 스트림 하나라서, 직접 스트리밍으로 풀고 스트립마다
+    # "이전 스트립의 마지막 행(필터 0)"을 앞에 붙여 비압축 zlib로 다시 감싼 뒤
+    # Pillow 디코더에 넘긴다. Up/Average/Paeth 필터도 C 코드에서 그대로 복원된다.
+    w, h = img.size
+    rawmode = img.tile[0][3]
+    row_bytes = 1 + w * _PNG_BPP[rawmode]
+    want = rows * row_bytes
+    z = zlib.decompressobj()
+    pending = bytearray()
+    seed = b""
+    y = 0
+
+    def emit(raw):
+        nonlocal seed, y
+        n = len(raw) // row_bytes
+        extra = 1 if seed else 0
+        strip = _decode_into(img.mode, (w, n + extra), "zip", rawmode,
+                             zlib.compress(seed + bytes(raw[:n * row_bytes]), 0), img.palette)
+        seed = b"\0" + strip.crop((0, n + extra - 1, w, n + extra)).tobytes("raw", rawmode)
+        box = (0, y, w, y + n)
+        y += n
+        return box, strip.crop((0, extra, w, n + extra)) if extra else strip
+
+    for chunk in _png_idat(img.fp, img.tile[0][2]):
+        buf = chunk
+        while buf:
+            # max_length로 압축 해제량을 스트립 크기로 제한 (zlib 밤 방지)
+            pending += z.decompress(buf, want - len(pending))
+            buf = z.unconsumed_tail
+            if len(pending) >= want:
+                yield emit(pending)
+                del pending[:want]
+    pending += z.flush()
+    if y < h and len(pending) >= row_bytes:
+        yield emit(pending[:(h - y) * row_bytes])
+
+def _iter_raw_strips(img, rows_for):
+    # 비압축(raw) 타일은 행 단위로 잘라 읽을 수 있다 (비압축 TIFF, BMP 등)
+    for _, (x0, y0, x1, y1), offset, args in img.tile:
+        rawmode, stride, ystep = args if isinstance(args, tuple) else (args, 0, 1)
+        tw, th = x1 - x0, y1 - y0
+        if not stride:
+            stride = len(Image.new(img.mode, (tw, 1)).tobytes("raw", rawmode))
+        step = rows_for(tw)
+        for r in range(0, th, step):
+            n = min(step, th - r)
+            img.fp.seek(offset + r * stride)
+            strip = _decode_into(img.mode, (tw, n), "raw", (rawmode, stride, ystep),
+                                 img.fp.read(n * stride), img.palette)
+            top = y0 + r if ystep > 0 else y1 - r - n
+            yield (x0, top, x1, top + n), strip
+
+def iter_strips(img: Image.Image, strip_pixels: int = STRIP_PIXELS, align: int = 1):
+    """헤더만 읽은 이미지를 가로 스트립/타일 단위로 디코딩 → (box, Image) 제너레이터.
+    스트리밍할 수 없는 형식(JPEG, 인터레이스/16비트 PNG, 압축 TIFF 등)이면 None."""
+    if img.mode not in _STREAM_MODES or not img.tile or getattr(img, "fp", None) is None:
+        return None
+
+    def rows_for(width):
+        return max(align, strip_pixels // width // align * align)
+
+    codecs = {t[0] for t in img.tile}
+    if img.format == "PNG" and codecs == {"zip"} and len(img.tile) == 1:
+        if img.info.get("interlace") or img.tile[0][3] not in _PNG_BPP or img.tile[0][1] != (0, 0) + img.size:
+            return None
+        return _iter_png_strips(img, rows_for(img.width))
+    if codecs == {"raw"}:
+        return _iter_raw_strips(img, rows_for)
+    return None
+
+def stream_preview(img: Image.Image, preview_side: int = PREVIEW_SIDE, on_strip=None):
+    """스트립 단위로 읽어 미리보기(긴 변 preview_side 이하)만 만든다. 지원 안 되면 None.
+    on_strip(rgb)을 주면 디코딩한 RGB 스트립마다 불린다. 피크 메모리는 STRIP_PIXELS + 미리보기 크기."""
+    w, h = img.size
+    f = max(1, -(-max(w, h) // preview_side))
+    strips = iter_strips(img, align=f)
+    if strips is None:
+        return None
+    preview = Image.new("RGB", (-(-w // f), -(-h // f)))
+    for (x0, y0, x1, y1), strip in strips:
+        rgb = strip.convert("RGB")
+        if on_strip is not None:
+            on_strip(rgb)
+        preview.paste(rgb.resize((-(-(x1 - x0) // f), -(-(y1 - y0) // f)), Image.Resampling.BOX), (x0 // f, y0 // f))
+    return apply_exif_orientation(preview, _orientation(img))
+
+def stream_histogram(img: Image.Image, preview_side: int = PREVIEW_SIDE):
+    """stream_preview + 전체 픽셀 히스토그램 → (counts, sums, 미리보기). 지원 안 되면 None.
+    앱은 미리보기만 쓰므로 이 함수는 벤치마크의 전체 디코딩 비교용이다."""
+    counts = np.zeros(4096, dtype=np.int64)
+    sums = np.zeros((4096, 3))
+
+    def add(rgb):
+        c, s = histogram_from_pixels(to_numpy(rgb).reshape(-1, 3))
+        counts[:] += c
+        sums[:] += s
+
+    preview = stream_preview(img, preview_side, add)
+    if preview is None:
+        return None
+    return counts, sums, preview
+
+# ============ 미리보기 ============
+PREVIEW_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+PREVIEW_QUALITY = 80
+PREVIEW_WEBP_METHOD = 2  # 기본값(4)보다 4배쯤 빠르고 크기 차이는 몇 %
+
+def encode_preview(img: Image.Image) -> bytes:
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, PREVIEW_FORMAT, quality=PREVIEW_QUALITY, method=PREVIEW_WEBP_METHOD)
+    return buf.getvalue()
+
+def preview_image(img: Image.Image, max_side: int = PREVIEW_SIDE) -> Image.Image:
+    """연 이미지 → 회전을 반영한 표시 크기 이미지 (긴 변 max_side). JPEG은 축소 디코딩한다"""
+    if img.format == "JPEG":
+        # thumbnail() 기본값은 2배 크기로 draft하므로 직접 표시 크기에 맞춘다
+        img.draft("RGB", (max_side, max_side))
+    orient = _orientation(img)
+    img.thumbnail((max_side, max_side), RESAMPLE)
+    return apply_exif_orientation(img, orient)
+
+def make_preview(fp, max_side: int = PREVIEW_SIDE) -> bytes:
+    """화면 표시용 미리보기 바이트 (긴 변 max_side)"""
+    return encode_preview(preview_image(Image.open(fp), max_side))
+
+def needs_streaming(img: Image.Image) -> bool:
+    return img.format != "JPEG" and img.width * img.height >= STREAM_MIN_PIXELS
+
+def masked_histogram(small: Image.Image):
+    """분석 이미지 → (counts, sums, 피부 톤 RGB 또는 None). 배경/피부 픽셀은 세지 않는다"""
+    arr = to_numpy(small.convert("RGB"))
+    labels = segment(arr)
+    counts, sums = histogram_from_pixels(arr[foreground(labels)])
+    return counts, sums, skin_tone(arr, labels)
+
+def analyze_upload(fp, want_preview: bool = True, want_histogram: bool = True):
+    """업로드 → (히스토그램 또는 None, 미리보기 바이트 또는 None, 피부 톤 또는 None). 워커 프로세스에서 실행된다.
+    히스토그램은 배경/피부를 뺀 128px 분석 이미지 기준. 아주 큰 PNG/TIFF는 스트립 단위로 한 번 읽은
+    미리보기에서, 나머지 JPEG 외 형식은 한 번 디코딩한 미리보기 크기 이미지에서 분석 이미지를 만든다.
+    JPEG은 미리보기/분석 이미지를 각각 DCT 단계 축소 디코딩하는 쪽이 더 싸다."""
+    img = Image.open(fp)
+    check_pixel_cap(img)
+    if needs_streaming(img):
+        small = stream_preview(img)
+        if small is not None:
+            counts, sums, skin = masked_histogram(resize_for_analysis(small, 128)) if want_histogram else (0, 0, None)
+            return ((counts, sums) if want_histogram else None, encode_preview(small) if want_preview else None,
+                    skin)
+    if img.format != "JPEG" and want_preview and want_histogram:
+        # PNG/TIFF는 축소 디코딩이 없어 열 때마다 전체 디코딩 — 한 번만 디코딩해서 둘 다 만든다
+        small = preview_image(img)
+        counts, sums, skin = masked_histogram(resize_for_analysis(small, 128))
+        return (counts, sums), encode_preview(small), skin
+    hist = preview = skin = None
+    if want_preview:
+        fp.seek(0)
+        preview = make_preview(fp)
+    if want_histogram:
+        fp.seek(0)
+        counts, sums, skin = masked_histogram(open_for_analysis(fp))
+        hist = (counts, sums)
+    return hist, preview, skin
+
+# ============ 카메라 모드 (누적 히스토그램) ============
+CAMERA_SIDE = 96     # 프레임 분석 크기 (긴 변)
+CAMERA_DECAY = 0.7   # 새 프레임이 올 때 이전 누적값에 곱하는 비율
+
+def decay_histogram(acc, counts, sums, decay: float = CAMERA_DECAY):
+    """누적 (counts, sums)에 새 프레임을 지수 감쇠로 더한다. 4096칸 배열 제자리 연산 두 번뿐"""
+    if acc is None:
+        return counts.astype(np.float64), sums.astype(np.float64)
+    acc_counts, acc_sums = acc
+    acc_counts *= decay
+    acc_counts += counts
+    acc_sums *= decay
+    acc_sums += sums
+    return acc_counts, acc_sums
+
+def analyze_frame(frame, side: int = CAMERA_SIDE):
+    """카메라 프레임(JPEG) → (counts, sums, 피부 톤). 작은 프레임이라 워커 풀을 거치지 않는다"""
+    return masked_histogram(open_for_analysis(frame, side))
+
+# ============ 공용 도구 ============
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+def rgb_to_hex(rgb):
+    return '#%02x%02x%02x' % rgb
+
+def swatch_html(c) -> str:
+    return f"<div style='border-radius:12px;border:1px solid #ccc;height:80px;background:{rgb_to_hex(c)}'></div>"
+
+# ============ 데이터 ============
+BRANDS = {
+    "street": ["Uniqlo U", "Diesel", "BAPE", "Carhartt WIP", "Off-White"],
+    "minimal": ["Muji", "COS", "A.P.C.", "Jil Sander", "Lemaire"],
+    "classic": ["Uniqlo", "Ralph Lauren", "Tommy Hilfiger", "Burberry"],
+    "techwear": ["Nike ACG", "Stone Island", "ACRONYM"],
+    "y2k": ["Bershka", "Diesel D logo", "Blumarine", "Miu Miu"],
+}
+
+OUTFITS = {
+    "street": ["와이드 데님 + 그래픽 티셔츠", "카고팬츠 + 후드", "트랙팬츠 + 스니커즈"],
+    "minimal": ["울 팬츠 + 니트", "와이드 치노 + 셔츠", "모노톤 자켓+팬츠 셋업"],
+    "classic": ["옥스포드 셔츠 + 치노", "네이비 블레이저 + 그레이 팬츠", "니트 폴로 + 로퍼"],
+    "techwear": ["방수 셸자켓 + 카고", "소프트셸 + 트레킹 슈즈"],
+    "y2k": ["로우라이즈 데님 + 베이비 티", "트랙자켓 + 미니스커트"],
+}
@@ -0,0 +1,128 @@
+# 대표 색상 팔레트 일괄 추출 (헤드리스)
+# Run: python palette_batch.py catalog/ -o palettes.jsonl
+#      python palette_batch.py catalog/ -o palettes.csv --algorithm kmeans -k 6
+# 중간에 끊겨도 같은 명령을 다시 실행하면 이미 처리한 이미지는 건너뛰고 이어서 진행한다.
+
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+
+from palette import (PALETTE_ALGORITHMS, color_histogram, open_for_analysis,
+                     palette_from_histogram, rgb_to_hex)
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp", ".bmp")
+CSV_FIELDS = ["path", "colors", "error"]
+
+
+def iter_images(root):
+    """root 아래 이미지 경로를 정렬된 순서로 (root 기준 상대경로)"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(IMAGE_EXTS):
+                yield os.path.relpath(os.path.join(dirpath, name), root)
+
+
+def analyze_file(job):
+    root, rel, algorithm, k = job
+    try:
+        small = open_for_analysis(os.path.join(root, rel))
+        colors = palette_from_histogram(*color_histogram(small), k=k, algorithm=algorithm)
+        return {"path": rel, "colors": [rgb_to_hex(c) for c in colors], "error": ""}
+    except Exception as e:  # 깨진 파일 하나 때문에 전체 작업이 멈추지 않게
+        return {"path": rel, "colors": [], "error": f"{type(e).__name__}: {e}"}
+
+
+# ============ 출력 (이어하기 지원) ============
+def _drop_partial_line(path):
+    # 강제 종료로 마지막 줄이 잘렸으면 그 줄을 버린다
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def load_done(path, fmt):
+    """이미 출력 파일에 기록된 경로 집합"""
+    if not os.path.exists(path):
+        return set()
+    _drop_partial_line(path)
+    done = set()
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            done.update(row["path"] for row in csv.DictReader(f))
+        else:
+            for line in f:
+                if line.strip():
+                    done.add(json.loads(line)["path"])
+    return done
+
+
+class ResultWriter:
+    def __init__(self, path, fmt):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.fmt = fmt
+        self.f = open(path, "a", encoding="utf-8", newline="")
+        if fmt == "csv":
+            self.w = csv.DictWriter(self.f, fieldnames=CSV_FIELDS)
+            if new:
+                self.w.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self.w.writerow({**row, "colors": " ".join(row["colors"])})
+        else:
+            self.f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.f.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="이미지 폴더의 대표 색상 팔레트를 CSV/JSONL로 추출")
+    ap.add_argument("root", help="이미지 폴더 (하위 폴더 포함)")
+    ap.add_argument("-o", "--output", required=True, help="결과 파일 (.csv 또는 .jsonl)")
+    ap.add_argument("-k", type=int, default=5, help="대표 색상 개수")
+    ap.add_argument("--algorithm", default="simple", choices=sorted(set(PALETTE_ALGORITHMS.values())))
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="워커 프로세스 수")
+    ap.add_argument("--chunksize", type=int, default=32)
+    ap.add_argument("--report-every", type=float, default=5.0, metavar="SEC", help="진행 상황 출력 간격")
+    args = ap.parse_args(argv)
+
+    fmt = "csv" if args.output.lower().endswith(".csv") else "jsonl"
+    done = load_done(args.output, fmt)
+    if done:
+        print(f"이어하기: {len(done)}장은 이미 처리됨", file=sys.stderr)
+    jobs = ((args.root, rel, args.algorithm, args.k) for rel in iter_images(args.root) if rel not in done)
+
+    writer = ResultWriter(args.output, fmt)
+    n = errors = 0
+    t0 = last = time.perf_counter()
+    try:
+        with mp.Pool(args.jobs) as pool:
+            for row in pool.imap_unordered(analyze_file, jobs, chunksize=args.chunksize):
+                writer.write(row)
+                n += 1
+                errors += bool(row["error"])
+                now = time.perf_counter()
+                if now - last >= args.report_every:
+                    writer.f.flush()
+                    print(f"{n}장 처리 · {n / (now - t0):.1f} images/sec · 오류 {errors}", file=sys.stderr)
+                    last = now
+    except KeyboardInterrupt:
+        print("중단됨 — 같은 명령으로 다시 실행하면 이어서 처리합니다.", file=sys.stderr)
+        return 130
+    finally:
+        writer.close()
+        elapsed = time.perf_counter() - t0
+        print(f"완료: {n}장 / {elapsed:.1f}s · {n / elapsed if elapsed else 0:.1f} images/sec · 오류 {errors}",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
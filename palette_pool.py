@@ -0,0 +1,128 @@
+# 팔레트 분석 워커 풀 — Streamlit 서버 프로세스마다 하나 (test.get_analysis_pool)
+# 디코딩/리샘플링을 스크립트 스레드가 아닌 별도 프로세스에서 돌려서
+# 동시에 올라온 업로드끼리 GIL을 두고 다투지 않게 한다.
+
+import io
+import multiprocessing as mp
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+ANALYSIS_WORKERS = int(os.environ.get("PALETTE_WORKERS", os.cpu_count() or 1))
+QUEUE_PER_WORKER = int(os.environ.get("PALETTE_QUEUE_PER_WORKER", 2))  # 워커당 대기열 길이
+JOB_TIMEOUT = float(os.environ.get("PALETTE_JOB_TIMEOUT", 30))         # 작업 하나의 최대 대기 시간(초)
+BUSY_WAIT = 0.5                                                         # 대기열 자리를 기다리는 시간(초)
+
+
+class PoolBusy(RuntimeError):
+    """대기열이 가득 참 — 잠시 후 다시 시도"""
+
+
+def analyze_job(data: bytes, want_preview: bool = True, want_histogram: bool = True):
+    """워커에서 실행: 업로드 바이트 → (히스토그램, 미리보기 바이트, 피부 톤) — palette.analyze_upload와 같다"""
+    from palette import analyze_upload
+    return analyze_upload(io.BytesIO(data), want_preview, want_histogram)
+
+
+def _warmup():
+    # 첫 업로드가 import 비용을 내지 않도록 미리 불러둔다
+    import palette  # noqa: F401
+    return os.getpid()
+
+
+class AnalysisPool:
+    """크기 제한 대기열 + 작업별 타임아웃 + 가득 차면 PoolBusy를 던지는 프로세스 풀"""
+
+    def __init__(self, workers: int = ANALYSIS_WORKERS, queue_per_worker: int = QUEUE_PER_WORKER,
+                 timeout: float = JOB_TIMEOUT, busy_wait: float = BUSY_WAIT):
+        self.workers = max(1, workers)
+        self.capacity = self.workers * (1 + queue_per_worker)
+        self.timeout = timeout
+        self.busy_wait = busy_wait
+        # 실행 중 + 대기 중 작업 수를 세마포어로 제한 (작업이 끝나야 자리가 돌아온다)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._owner = weakref.WeakKeyDictionary()   # 작업 → 그 작업을 맡은 executor
+        self.inflight = 0
+        self.stats = {"done": 0, "busy": 0, "timeout": 0, "failed": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # 서버는 멀티스레드라 fork 대신 spawn
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=mp.get_context("spawn"))
+            return self._executor
+
+    def _reset(self, broken: ProcessPoolExecutor = None):
+        """broken이 아직 현재 executor일 때만 내리고 다음 작업에서 새로 만든다 (None이면 무조건).
+        여러 세션이 같은 BrokenProcessPool을 보더라도 먼저 온 세션이 새로 만든 풀은 건드리지 않는다."""
+        with self._lock:
+            if broken is not None and broken is not self._executor:
+                return
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def warmup(self):
+        ex = self._get_executor()
+        return sorted({f.result() for f in [ex.submit(_warmup) for _ in range(self.workers)]})
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _release(self, fut):
+        with self._lock:
+            self.inflight -= 1
+        self._slots.release()
+        self._count("done" if not fut.cancelled() and fut.exception() is None else "failed")
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(timeout=self.busy_wait):
+            self._count("busy")
+            raise PoolBusy("분석 대기열이 가득 찼어요")
+        try:
+            ex = self._get_executor()
+            try:
+                fut = ex.submit(fn, *args)
+            except BrokenProcessPool:
+                # 워커가 죽었으면 (OOM 등) 풀을 새로 만든다
+                self._reset(ex)
+                ex = self._get_executor()
+                fut = ex.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._owner[fut] = ex
+            self.inflight += 1
+        fut.add_done_callback(self._release)
+        return fut
+
+    def run(self, fn, *args):
+        """작업을 맡기고 결과를 기다린다. PoolBusy / TimeoutError / BrokenProcessPool / 작업 예외를 그대로 던진다"""
+        return self.wait(self.submit(fn, *args))
+
+    def wait(self, fut, timeout: float = None):
+        """submit으로 받은 작업의 결과. 시간이 지나면 TimeoutError"""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            # 이미 실행 중인 작업은 멈출 수 없지만, 끝날 때까지 자리를 차지하므로 과부하는 막힌다
+            fut.cancel()
+            self._count("timeout")
+            raise TimeoutError(f"분석이 {timeout:.0f}초 안에 끝나지 않았어요") from None
+        except BrokenProcessPool:
+            with self._lock:
+                ex = self._owner.get(fut)
+            if ex is not None:
+                self._reset(ex)
+            raise
+
+    def shutdown(self):
+        self._reset()
@@ -1,66 +1,341 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
 import numpy as np
-from PIL import Image, ImageOps
+from PIL import Image
 import streamlit as st
 
-# ============ Pillow LANCZOS 호환 ============
-try:
-    RESAMPLE = Image.Resampling.LANCZOS
-except Exception:
-    RESAMPLE = Image.LANCZOS
-
-# ============ Helper ============
-def to_numpy(img: Image.Image) -> np.ndarray:
-    if img.mode != "RGB":
-        img = img.convert("RGB")
-    return np.array(img)
-
-def resize_for_analysis(img: Image.Image, max_side: int = 128) -> Image.Image:
-    w, h = img.size
-    scale = min(max_side / max(w, h), 1.0)
-    if scale < 1.0:
-        return img.resize((int(w * scale), int(h * scale)), RESAMPLE)
-    return img
-
-def get_simple_palette(img: Image.Image, k: int = 5):
-    small = resize_for_analysis(img, 128)
-    arr = to_numpy(small).reshape(-1, 3)
-    arr = (arr // 16) * 16
-    uniq, counts = np.unique(arr, axis=0, return_counts=True)
-    idx = np.argsort(-counts)[:k]
-    return [tuple(map(int, uniq[i])) for i in idx]
-
-def rgb_to_hex(rgb):
-    return '#%02x%02x%02x' % rgb
+from color_index import PRODUCT_INDEX_PATH, ColorIndex
+from colorspace import pad_palettes, palette_distance, srgb_to_lab
+from palette import (BRANDS, CAMERA_DECAY, OUTFITS, PALETTE_ALGORITHMS, ImageTooLarge, analyze_frame,
+                     check_pixel_cap, content_digest, decay_histogram, palette_from_histogram, palette_weights,
+                     rgb_to_hex, swatch_html)
+from palette_pool import AnalysisPool, PoolBusy, analyze_job
+
+# ============ 분석 워커 풀 ============
+@st.cache_resource
+def get_analysis_pool() -> AnalysisPool:
+    # 서버 프로세스 하나에 워커 풀 하나 (모든 세션 공유)
+    pool = AnalysisPool()
+    pool.warmup()
+    return pool
+
+# ============ 팔레트 캐시 ============
+PALETTE_CACHE_DIR = os.environ.get("PALETTE_CACHE_DIR", ".palette_cache")
+PALETTE_CACHE_MAX_BYTES = int(os.environ.get("PALETTE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+PALETTE_CACHE_MAX_ITEMS = 256
+ANALYSIS_VERSION = "v2"  # v2: 배경/피부를 뺀 히스토그램 + 피부 톤
+
+class PaletteCache:
+    """업로드 바이트 해시 기준 2단 캐시.
+    메모리 LRU(세션 공유) + 용량 제한 디스크(재시작 후에도 유지).
+    디스크에는 해시별 히스토그램(.npz), (알고리즘, k)별 팔레트(.json), 인코딩된 미리보기를 둔다."""
+
+    def __init__(self, directory: str = PALETTE_CACHE_DIR, max_items: int = PALETTE_CACHE_MAX_ITEMS,
+                 max_bytes: int = PALETTE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory": 0, "disk": 0, "miss": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    # ---- 메모리 LRU ----
+    def get_memory(self, key):
+        with self._lock:
+            if key not in self._mem:
+                return None
+            self._mem.move_to_end(key)
+            return self._mem[key]
+
+    def put_memory(self, key, value):
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_items:
+                self._mem.popitem(last=False)
+
+    # ---- 디스크 ----
+    def _path(self, digest: str, ext: str) -> str:
+        # 분석 방식이 바뀌면 버전을 올려서 예전 결과를 다시 쓰지 않는다 (옛 파일은 용량 정리로 사라짐)
+        return os.path.join(self.directory, f"{digest}.{ANALYSIS_VERSION}{ext}")
+
+    def _write(self, path: str, write):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+        self._trim()
+
+    def _trim(self):
+        # 오래 안 쓴(mtime) 파일부터 지워서 용량 상한의 90%까지 줄인다
+        entries = [e for e in os.scandir(self.directory) if e.is_file() and not e.name.endswith(".tmp")]
+        total = sum(e.stat().st_size for e in entries)
+        if total <= self.max_bytes:
+            return
+        for e in sorted(entries, key=lambda e: e.stat().st_mtime):
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                total -= e.stat().st_size
+                os.remove(e.path)
+            except OSError:
+                pass
+
+    def _touch(self, path: str):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _hit(self, tier: str):
+        with self._lock:
+            self.stats[tier] += 1
+
+    # ---- 히스토그램 ----
+    def _load_histogram(self, digest: str, count: bool = True):
+        # 메모리에는 (counts, sums, 피부 톤) 세 값을 함께 둔다
+        entry = self.get_memory(("hist", digest))
+        if entry is not None:
+            if count:
+                self._hit("memory")
+            return entry
+        path = self._path(digest, ".npz")
+        try:
+            with np.load(path) as z:
+                skin = tuple(int(v) for v in z["skin"]) or None
+                entry = (z["counts"], z["sums"], skin)
+        except (OSError, KeyError, ValueError):
+            if count:
+                self._hit("miss")
+            return None
+        self._touch(path)
+        if count:
+            self._hit("disk")
+        self.put_memory(("hist", digest), entry)
+        return entry
+
+    def get_histogram(self, digest: str):
+        entry = self._load_histogram(digest)
+        return None if entry is None else entry[:2]
+
+    def get_skin_tone(self, digest: str):
+        """배경 제외 분석에서 잡힌 피부 톤 RGB (없으면 None)"""
+        entry = self._load_histogram(digest, count=False)
+        return None if entry is None else entry[2]
+
+    def put_histogram(self, digest: str, counts, sums, skin=None):
+        self.put_memory(("hist", digest), (counts, sums, skin))
+        self._write(self._path(digest, ".npz"),
+                    lambda f: np.savez_compressed(f, counts=counts, sums=sums, skin=np.array(skin or (), dtype=np.uint8)))
+
+    # ---- 팔레트 ----
+    def _load_palettes(self, digest: str) -> dict:
+        try:
+            with open(self._path(digest, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get_palette(self, digest: str, algorithm: str, k: int):
+        colors = self.get_memory(("palette", digest, algorithm, k))
+        if colors is not None:
+            self._hit("memory")
+            return colors
+        saved = self._load_palettes(digest).get(f"{algorithm}/{k}")
+        if saved is None:
+            self._hit("miss")
+            return None
+        self._touch(self._path(digest, ".json"))
+        self._hit("disk")
+        colors = [tuple(c) for c in saved]
+        self.put_memory(("palette", digest, algorithm, k), colors)
+        return colors
+
+    def put_palette(self, digest: str, algorithm: str, k: int, colors):
+        self.put_memory(("palette", digest, algorithm, k), colors)
+        with self._lock:
+            saved = self._load_palettes(digest)
+            saved[f"{algorithm}/{k}"] = [list(c) for c in colors]
+            self._write(self._path(digest, ".json"), lambda f: f.write(json.dumps(saved).encode()))
+
+    # ---- 미리보기 (인코딩된 바이트) ----
+    def get_preview(self, digest: str):
+        data = self.get_memory(("preview", digest))
+        if data is not None:
+            return data
+        path = self._path(digest, ".preview")
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._touch(path)
+        self.put_memory(("preview", digest), data)
+        return data
+
+    def put_preview(self, digest: str, data: bytes):
+        self.put_memory(("preview", digest), data)
+        self._write(self._path(digest, ".preview"), lambda f: f.write(data))
+
+@st.cache_resource
+def get_palette_cache() -> PaletteCache:
+    # 서버 프로세스 하나에 캐시 하나 (모든 세션 공유)
+    return PaletteCache()
+
+# ============ 코디 사진 비교 ============
+def analyze_uploads(files, cache, pool):
+    """업로드 여러 장 → [(digest, 히스토그램, 미리보기 바이트, 오류 메시지)].
+    캐시에 없는 사진만 워커 풀에 한꺼번에 맡겨서 동시에 분석한다."""
+    entries, pending, errors = [], {}, {}
+    stored = set()
+
+    def store(digest, result):
+        hist, preview, skin = result
+        if preview is not None:
+            cache.put_preview(digest, preview)
+        cache.put_histogram(digest, *hist, skin)
+        stored.add(digest)
+
+    try:
+        for f in files:
+            with f.getbuffer() as buf:
+                digest = content_digest(buf)
+            entries.append(digest)
+            if digest in pending or digest in errors or (cache.get_histogram(digest) is not None
+                                                         and cache.get_preview(digest) is not None):
+                continue
+            # 얼굴 사진처럼 헤더만 읽어 크기 상한을 먼저 본다 — 너무 큰 사진은 워커에 보내지 않는다
+            try:
+                check_pixel_cap(Image.open(f))
+            except (ImageTooLarge, Image.DecompressionBombError, OSError) as e:
+                errors[digest] = str(e)
+                continue
+            while True:
+                try:
+                    pending[digest] = pool.submit(analyze_job, f.getvalue(), cache.get_preview(digest) is None, True)
+                    break
+                except PoolBusy:
+                    # 대기열이 찼으면 먼저 맡긴 사진이 끝나서 자리가 날 때까지 기다린다
+                    if all(fut.done() for fut in pending.values()):
+                        raise
+                    wait([fut for fut in pending.values() if not fut.done()], return_when=FIRST_COMPLETED)
+        for digest, fut in pending.items():
+            try:
+                result = pool.wait(fut)
+            except (ImageTooLarge, Image.DecompressionBombError, OSError) as e:
+                errors[digest] = str(e)
+                continue
+            store(digest, result)
+    finally:
+        # PoolBusy/TimeoutError로 빠져나가도 이미 끝난 사진은 캐시에 넣어 둔다 — 다시 시도할 때 또 분석하지 않게
+        for digest, fut in pending.items():
+            if digest not in stored and fut.done() and not fut.cancelled() and fut.exception() is None:
+                store(digest, fut.result())
+    return [(d, cache.get_histogram(d) if d not in errors else None, cache.get_preview(d), errors.get(d))
+            for d in entries]
+
+def rank_by_palette(face, outfits):
+    """face: (색 목록, 비율), outfits: [(색 목록, 비율)] → (거리 배열, 가까운 순 인덱스)"""
+    lab, w = pad_palettes([srgb_to_lab(np.array(c).reshape(-1, 3)) for c, _ in [face, *outfits]],
+                          [wi for _, wi in [face, *outfits]])
+    dist = palette_distance(lab, w, lab, w)
+    return dist, np.argsort(dist[0, 1:], kind="stable")
+
+# ============ 상품 색상 인덱스 ============
+@st.cache_resource
+def get_product_index():
+    """서버 시작 후 한 번만 로드 (color_index.py build로 미리 생성). 없으면 None"""
+    path = os.environ.get("PRODUCT_INDEX_PATH", PRODUCT_INDEX_PATH)
+    return ColorIndex.load(path) if os.path.exists(path) else None
 
 def color_swatches(colors):
     cols = st.columns(len(colors))
     for i, c in enumerate(colors):
-        hexv = rgb_to_hex(c)
         with cols[i]:
+            st.markdown(swatch_html(c), unsafe_allow_html=True)
+            st.caption(f"**{rgb_to_hex(c).upper()}**")
+
+# ============ Streamlit UI ============
+def show_skin_tone(skin):
+    st.subheader("🧑 피부 톤")
+    st.markdown(
+        f"<div style='display:flex;gap:12px;align-items:center;'><div style='width:60px;height:60px;border-radius:50%;border:1px solid #ccc;background:{rgb_to_hex(skin)}'></div><b>{rgb_to_hex(skin).upper()}</b></div>",
+        unsafe_allow_html=True,
+    )
+
+def show_product_matches(colors):
+    # 팔레트 색별 가까운 상품
+    index = get_product_index()
+    if index is not None and colors:
+        st.subheader("🛍️ 팔레트와 어울리는 상품")
+        matches = index.query(srgb_to_lab(np.array(colors)), n=3)
+        cols = st.columns(len(colors))
+        for i, items in enumerate(matches):
+            with cols[i]:
+                for it in items:
+                    st.markdown(
+                        f"<div style='display:flex;gap:8px;align-items:center;margin:4px 0;'><div style='width:22px;height:22px;border-radius:6px;border:1px solid #ccc;background:{it['color']}'></div><div style='font-size:0.85em;'><b>{it['brand']}</b><br>{it['name']} <span style='color:#888;'>ΔE {it['delta_e']:.1f}</span></div></div>",
+                        unsafe_allow_html=True,
+                    )
+
+def show_style_picks(style):
+    # 브랜드 카드
+    st.subheader("🏷️ 추천 브랜드")
+    cols = st.columns(3)
+    for i, b in enumerate(BRANDS[style]):
+        with cols[i % 3]:
             st.markdown(
-                f"<div style='border-radius:12px;border:1px solid #ccc;height:80px;background:{hexv}'></div>",
+                f"<div style='border:1px solid #ddd;border-radius:15px;padding:15px;margin:5px;background:#fafafa;'><b>{b}</b><br><span style='color:#888;font-size:0.9em;'>스타일: {style}</span></div>",
                 unsafe_allow_html=True,
             )
-            st.caption(f"**{hexv.upper()}**")
-
-# ============ 데이터 ============
-BRANDS = {
-    "street": ["Uniqlo U", "Diesel", "BAPE", "Carhartt WIP", "Off-White"],
-    "minimal": ["Muji", "COS", "A.P.C.", "Jil Sander", "Lemaire"],
-    "classic": ["Uniqlo", "Ralph Lauren", "Tommy Hilfiger", "Burberry"],
-    "techwear": ["Nike ACG", "Stone Island", "ACRONYM"],
-    "y2k": ["Bershka", "Diesel D logo", "Blumarine", "Miu Miu"],
-}
-
-OUTFITS = {
-    "street": ["와이드 데님 + 그래픽 티셔츠", "카고팬츠 + 후드", "트랙팬츠 + 스니커즈"],
-    "minimal": ["울 팬츠 + 니트", "와이드 치노 + 셔츠", "모노톤 자켓+팬츠 셋업"],
-    "classic": ["옥스포드 셔츠 + 치노", "네이비 블레이저 + 그레이 팬츠", "니트 폴로 + 로퍼"],
-    "techwear": ["방수 셸자켓 + 카고", "소프트셸 + 트레킹 슈즈"],
-    "y2k": ["로우라이즈 데님 + 베이비 티", "트랙자켓 + 미니스커트"],
-}
 
-# ============ Streamlit UI ============
+    # 코디 아이디어
+    st.subheader("🧩 코디 아이디어")
+    for s in OUTFITS[style]:
+        st.markdown(f"- {s}")
+
+def camera_mode(style, k_colors, algorithm):
+    """카메라 프레임이 올 때마다 누적 히스토그램에 더해서 팔레트를 갱신한다"""
+    state = st.session_state
+    if st.sidebar.button("카메라 누적 초기화"):
+        for key in ("camera_hist", "camera_skin", "camera_frames", "camera_last"):
+            state.pop(key, None)
+        # camera_input은 마지막 사진을 계속 돌려주므로 key를 바꿔 위젯 자체를 비운다
+        state.camera_widget = state.get("camera_widget", 0) + 1
+    frame = st.camera_input("📷 카메라로 찍기 — 찍을 때마다 팔레트가 이어서 갱신돼요",
+                            key=f"camera_{state.get('camera_widget', 0)}")
+    if frame is None and "camera_hist" not in state:
+        st.info("카메라로 찍으면 분석이 시작돼요!")
+        return
+    if frame is not None:
+        with frame.getbuffer() as buf:
+            digest = content_digest(buf)
+        # 옵션만 바뀐 재실행에서는 같은 프레임을 두 번 더하지 않는다
+        if state.get("camera_last") != digest:
+            counts, sums, skin = analyze_frame(frame)
+            state.camera_hist = decay_histogram(state.get("camera_hist"), counts, sums)
+            if skin is not None:
+                prev = state.get("camera_skin")
+                state.camera_skin = skin if prev is None else tuple(
+                    int(round(CAMERA_DECAY * p + (1 - CAMERA_DECAY) * v)) for p, v in zip(prev, skin))
+            state.camera_frames = state.get("camera_frames", 0) + 1
+            state.camera_last = digest
+
+    colors = palette_from_histogram(*state.camera_hist, k=k_colors, algorithm=algorithm)
+    st.subheader("🎨 대표 색상 팔레트")
+    st.caption(f"프레임 {state.camera_frames}장 누적 (이전 프레임 비중 x{CAMERA_DECAY}/장)")
+    color_swatches(colors)
+    if state.get("camera_skin") is not None:
+        show_skin_tone(state.camera_skin)
+    show_product_matches(colors)
+    show_style_picks(style)
+
 def main():
     st.set_page_config(page_title="AI 패션 코디네이터", page_icon="👗", layout="wide")
     st.markdown("<h1 style='text-align:center;'>👗 AI 패션 코디네이터</h1>", unsafe_allow_html=True)
@@ -68,35 +343,122 @@ def main():
 
     style = st.sidebar.selectbox("스타일 선택", list(BRANDS.keys()), index=0)
     k_colors = st.sidebar.slider("대표 색상 개수", 3, 8, 5)
+    algo = st.sidebar.selectbox("팔레트 알고리즘", list(PALETTE_ALGORITHMS.keys()), index=0)
+    source = st.sidebar.radio("입력 방식", ["사진 업로드", "카메라"], horizontal=True)
+    if source == "카메라":
+        camera_mode(style, k_colors, PALETTE_ALGORITHMS[algo])
+        return
 
-    uploaded = st.file_uploader("📸 얼굴 사진 업로드", type=["jpg","jpeg","png"])
+    uploaded = st.file_uploader("📸 얼굴 사진 업로드", type=["jpg","jpeg","png","tif","tiff"])
     if not uploaded:
         st.info("사진을 올리면 분석이 시작돼요!")
         return
 
-    img = Image.open(uploaded)
-    img_preview = ImageOps.exif_transpose(img.copy())
+    # 업로드 버퍼를 복사하지 않고 그대로 해시/디코딩한다
+    with uploaded.getbuffer() as buf:
+        digest = content_digest(buf)
+    try:
+        img = Image.open(uploaded)
+        check_pixel_cap(img)
+    except (ImageTooLarge, Image.DecompressionBombError) as e:
+        st.error(f"이미지가 너무 커요: {e}")
+        return
+
+    cache = get_palette_cache()
+    algorithm = PALETTE_ALGORITHMS[algo]
+
+    # 미리보기는 업로드마다 한 번만 표시 크기로 인코딩해 두고 그 바이트만 보낸다.
+    # 같은 사진이면 캐시된 히스토그램을 재사용해서 k/알고리즘만 다시 계산한다
+    colors = cache.get_palette(digest, algorithm, k_colors)
+    img_preview = cache.get_preview(digest)
+    hist = cache.get_histogram(digest) if colors is None else None
+    need_hist = colors is None and hist is None
+    if img_preview is None or need_hist:
+        # 디코딩은 서버 공유 워커 풀에서 — 스크립트 스레드는 GIL을 잡지 않고 기다린다
+        pool = get_analysis_pool()
+        try:
+            new_hist, new_preview, skin = pool.run(analyze_job, uploaded.getvalue(), img_preview is None, need_hist)
+        except PoolBusy:
+            st.warning("지금 분석 요청이 많아요 ⏳ 잠시 후 다시 시도해 주세요.")
+            st.button("다시 시도")
+            return
+        except BrokenProcessPool:
+            # 워커가 죽었다 (메모리 부족 등) — 풀은 다음 요청에서 새로 만들어진다
+            st.warning("분석 워커가 멈췄어요 ⏳ 다시 시도해 주세요.")
+            st.button("다시 시도")
+            return
+        except TimeoutError as e:
+            st.error(f"{e} — 더 작은 사진으로 다시 시도해 주세요.")
+            return
+        if new_preview is not None:
+            img_preview = new_preview
+            cache.put_preview(digest, img_preview)
+        if new_hist is not None:
+            hist = new_hist
+            cache.put_histogram(digest, *hist, skin)
     st.image(img_preview, caption="업로드한 이미지", use_container_width=True)
 
-    # 팔레트 추출
-    colors = get_simple_palette(img_preview, k=k_colors)
+    if colors is None:
+        colors = palette_from_histogram(*hist, k=k_colors, algorithm=algorithm)
+        cache.put_palette(digest, algorithm, k_colors, colors)
+    st.sidebar.caption("팔레트 캐시 — 메모리 {memory} · 디스크 {disk} · 미스 {miss}".format(**cache.stats))
     st.subheader("🎨 대표 색상 팔레트")
+    st.caption("배경과 피부는 빼고 머리카락·옷 색만 셌어요 (피부 톤은 아래에 따로).")
     color_swatches(colors)
 
-    # 브랜드 카드
-    st.subheader("🏷️ 추천 브랜드")
-    cols = st.columns(3)
-    for i, b in enumerate(BRANDS[style]):
-        with cols[i % 3]:
-            st.markdown(
-                f"<div style='border:1px solid #ddd;border-radius:15px;padding:15px;margin:5px;background:#fafafa;'><b>{b}</b><br><span style='color:#888;font-size:0.9em;'>스타일: {style}</span></div>",
-                unsafe_allow_html=True,
-            )
+    # 피부 톤은 팔레트와 따로 보여준다
+    skin = cache.get_skin_tone(digest)
+    if skin is not None:
+        show_skin_tone(skin)
+    show_product_matches(colors)
 
-    # 코디 아이디어
-    st.subheader("🧩 코디 아이디어")
-    for s in OUTFITS[style]:
-        st.markdown(f"- {s}")
+    # 코디 사진 비교 — 이미 분석한 사진은 캐시에서, 새로 추가된 사진만 워커 풀에서 동시에 분석
+    st.subheader("👕 코디 사진 비교")
+    outfit_files = st.file_uploader("코디 사진 여러 장 업로드", type=["jpg","jpeg","png","tif","tiff"],
+                                    accept_multiple_files=True)
+    if outfit_files and colors:
+        try:
+            analyzed = analyze_uploads(outfit_files, cache, get_analysis_pool())
+        except PoolBusy:
+            st.warning("지금 분석 요청이 많아요 ⏳ 잠시 후 다시 시도해 주세요.")
+            st.button("다시 시도", key="retry_outfits")
+            analyzed = []
+        except BrokenProcessPool:
+            st.warning("분석 워커가 멈췄어요 ⏳ 다시 시도해 주세요.")
+            st.button("다시 시도", key="retry_outfits")
+            analyzed = []
+        except TimeoutError as e:
+            st.error(f"{e} — 더 작은 사진으로 다시 시도해 주세요.")
+            analyzed = []
+        outfits = []
+        for f, (d, o_hist, o_preview, err) in zip(outfit_files, analyzed):
+            if err:
+                st.error(f"{f.name}: {err}")
+                continue
+            o_colors = cache.get_palette(d, algorithm, k_colors)
+            if o_colors is None:
+                o_colors = palette_from_histogram(*o_hist, k=k_colors, algorithm=algorithm)
+                cache.put_palette(d, algorithm, k_colors, o_colors)
+            outfits.append((f.name, o_preview, o_colors, palette_weights(*o_hist, o_colors)))
+        if outfits:
+            face_hist = hist if hist is not None else cache.get_histogram(digest)
+            face_w = palette_weights(*face_hist, colors) if face_hist is not None else np.ones(len(colors))
+            dist, order = rank_by_palette((colors, face_w), [(c, w) for _, _, c, w in outfits])
+            for rank, i in enumerate(order, 1):
+                name, o_preview, o_colors, _ = outfits[i]
+                c1, c2 = st.columns([1, 3])
+                with c1:
+                    st.image(o_preview, use_container_width=True)
+                with c2:
+                    chips = "".join(f"<span style='display:inline-block;width:28px;height:28px;border-radius:6px;border:1px solid #ccc;margin-right:4px;background:{rgb_to_hex(c)}'></span>" for c in o_colors)
+                    st.markdown(f"**{rank}위 · {name}** <span style='color:#888;'>팔레트 거리 ΔE {dist[0, i + 1]:.1f}</span><br>{chips}",
+                                unsafe_allow_html=True)
+            with st.expander("팔레트 거리 행렬 (ΔE, 낮을수록 비슷)"):
+                names = ["얼굴"] + [name for name, *_ in outfits]
+                st.dataframe({"": names, **{n: np.round(dist[:, j], 1) for j, n in enumerate(names)}},
+                             hide_index=True)
+
+    show_style_picks(style)
 
     st.success("✨ 분석 완료! 사이드바 옵션을 바꿔보세요.")
 
@@ -0,0 +1,191 @@
+# 오프라인 썸네일 번들 — 키오스크처럼 인터넷이 약하거나 없는 곳에서 카드 이미지를 네트워크 없이 그린다
+# Build: python thumb_bundle.py build -o thumbs.bundle      (IDOLS + CELEB_BY_SIGN 전부 미리 받아서 묶기)
+#        python thumb_bundle.py info thumbs.bundle
+# 파일 구조: MAGIC(8) | 색인 위치 u64 | 색인 길이 u64 | WebP 묶음 ... | 색인(JSON)
+# 색인: {"titles": {제목: 파일 이름 또는 null(썸네일 없음)}, "blobs": {파일 이름: [위치, 길이]}, ...}
+# 앱은 시작할 때 mmap으로 열고, 번들에 있는 제목은 위키에 묻지 않는다.
+
+import argparse
+import base64
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MAGIC = b"THMBNDL1"
+HEADER = struct.Struct("<8sQQ")
+THUMB_BUNDLE_PATH = os.environ.get("THUMB_BUNDLE_PATH", "thumbs.bundle")
+
+
+class ThumbBundle:
+    """mmap으로 연 읽기 전용 번들"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_at, index_len = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"썸네일 번들이 아닙니다: {path}")
+        index = json.loads(self._mm[index_at:index_at + index_len])
+        self.titles = index["titles"]
+        self.blobs = index["blobs"]
+        self.meta = {k: v for k, v in index.items() if k not in ("titles", "blobs")}
+
+    def __contains__(self, title) -> bool:
+        return title in self.titles
+
+    def __len__(self):
+        return len(self.titles)
+
+    def blob(self, name: str):
+        """파일 이름 → WebP 바이트 (없으면 None)"""
+        pos = self.blobs.get(name)
+        return None if pos is None else self._mm[pos[0]:pos[0] + pos[1]]
+
+    def thumbs(self, titles, inline: bool = False) -> dict:
+        """번들에 있는 제목만 {제목: 주소 또는 None}.
+        inline=False면 썸네일 프록시 주소(프록시가 번들을 서빙), True면 data: URI"""
+        from thumb_proxy import proxy_url
+        out = {}
+        for t in titles:
+            if t not in self.titles:
+                continue
+            name = self.titles[t]
+            if name is None:
+                out[t] = None
+            elif inline:
+                out[t] = "data:image/webp;base64," + base64.b64encode(self.blob(name)).decode("ascii")
+            else:
+                out[t] = proxy_url(name)
+        return out
+
+    def close(self):
+        self._mm.close()
+
+
+def load_bundle(path: str = THUMB_BUNDLE_PATH):
+    """번들이 없거나 깨졌으면 None (전부 실시간으로 가져온다)"""
+    try:
+        return ThumbBundle(path)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+
+def card_thumbs(titles, bundle=None, deadline: float = None, proxy=None) -> dict:
+    """카드용 썸네일 주소 {제목: 주소 또는 None}: 번들에 있는 제목은 네트워크 없이,
+    나머지만 위키에서 한꺼번에. proxy(start_server가 돌려준 서버)가 있을 때만 카드 크기 WebP 로컬 주소로,
+    없으면 번들 이미지는 data: URI, 나머지는 위키 원본 URL"""
+    from thumb_proxy import PROXY_DEADLINE, proxy_thumbs
+    from wiki_thumbs import THUMB_DEADLINE, fetch_thumbs
+    out = bundle.thumbs(titles, inline=proxy is None) if bundle is not None else {}
+    live = [t for t in titles if t not in out]
+    if live:
+        found = fetch_thumbs(live, deadline=THUMB_DEADLINE if deadline is None else deadline)
+        out.update(proxy_thumbs(found, deadline=PROXY_DEADLINE if deadline is None else deadline)
+                   if proxy is not None else found)
+    return out
+
+
+def preset_titles():
+    from fortune import CELEB_BY_SIGN, IDOLS
+    return list(dict.fromkeys([i.get("wiki") or i["name"] for i in IDOLS]
+                              + [n for names in CELEB_BY_SIGN.values() for n in names]))
+
+
+# ============ 만들기 ============
+def build(path: str, titles, workers: int = 8) -> dict:
+    """제목들의 썸네일을 받아 카드 크기 WebP로 묶는다. 조회/다운로드에 실패한 제목은 번들에서 빼고
+    (앱이 실시간으로 다시 시도) 보고서에 남긴다"""
+    from thumb_proxy import CARD_SIZE, download, to_card_webp, webp_name
+    from wiki_thumbs import _batches, resolve_batch
+
+    report = {"titles": len(titles), "images": 0, "no_image": 0, "failed": []}
+    urls = {}
+    for lang, batch in _batches(titles):
+        try:
+            urls.update(resolve_batch(lang, batch))
+        except Exception as e:  # 묶음 하나가 실패해도 나머지는 만든다
+            report["failed"] += [(t, f"조회 실패: {e}") for t in batch]
+
+    def convert(url):
+        return to_card_webp(download(url))
+
+    wanted = sorted({u for u in urls.values() if u})
+    with ThreadPoolExecutor(workers) as ex:
+        futures = {u: ex.submit(convert, u) for u in wanted}
+    webps = {}
+    for u, f in futures.items():
+        if f.exception() is None:
+            webps[u] = f.result()
+
+    index = {"version": 1, "card_size": list(CARD_SIZE), "built": time.strftime("%Y-%m-%d %H:%M:%S"),
+             "titles": {}, "blobs": {}}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        for t in titles:
+            if t not in urls:
+                continue
+            url = urls[t]
+            if url is None:
+                index["titles"][t] = None
+                report["no_image"] += 1
+                continue
+            if url not in webps:
+                report["failed"].append((t, f"다운로드/변환 실패: {futures[url].exception()}"))
+                continue
+            name = webp_name(webps[url])
+            if name not in index["blobs"]:
+                index["blobs"][name] = [f.tell(), len(webps[url])]
+                f.write(webps[url])
+            index["titles"][t] = name
+            report["images"] += 1
+        index_at = f.tell()
+        data = json.dumps(index, ensure_ascii=False).encode("utf-8")
+        f.write(data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, index_at, len(data)))
+    os.replace(tmp, path)
+    report["bytes"] = os.path.getsize(path)
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="오프라인 썸네일 번들")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="IDOLS + CELEB_BY_SIGN 썸네일을 받아 번들 만들기")
+    b.add_argument("-o", "--output", default=THUMB_BUNDLE_PATH)
+    b.add_argument("--title", action="append", default=[], help="프리셋 외에 넣을 위키 제목 (여러 번)")
+    b.add_argument("--workers", type=int, default=8)
+    i = sub.add_parser("info", help="번들 내용 요약")
+    i.add_argument("path", nargs="?", default=THUMB_BUNDLE_PATH)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        titles = list(dict.fromkeys(preset_titles() + args.title))
+        t0 = time.perf_counter()
+        report = build(args.output, titles, args.workers)
+        print(f"{args.output}: 제목 {report['titles']}개 — 이미지 {report['images']} · 썸네일 없음 {report['no_image']} · "
+              f"실패 {len(report['failed'])} · {report['bytes'] / 1024:.0f} KB · {time.perf_counter() - t0:.1f}s")
+        for t, why in report["failed"]:
+            print(f"  ❌ {t}: {why}", file=sys.stderr)
+        return 1 if report["failed"] else 0
+
+    bundle = load_bundle(args.path)
+    if bundle is None:
+        print(f"번들을 열 수 없습니다: {args.path}", file=sys.stderr)
+        return 1
+    missing = [t for t in preset_titles() if t not in bundle]
+    size = sum(n for _, n in bundle.blobs.values())
+    print(f"{args.path}: 제목 {len(bundle)}개, 이미지 {len(bundle.blobs)}개 ({size / 1024:.0f} KB), {bundle.meta}")
+    if missing:
+        print(f"번들에 없는 프리셋 제목 {len(missing)}개: {', '.join(missing)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
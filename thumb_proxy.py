@@ -0,0 +1,209 @@
+# 카드 썸네일 로컬 프록시 — 위키 이미지를 한 번만 받아서 카드 크기 WebP로 줄여 직접 서빙한다
+# 저장: THUMB_PROXY_DIR/<내용 해시>.webp (+ by-url/<원본 URL 해시> → 파일 이름 색인)
+# 서빙: 작은 HTTP 서버 스레드 (/thumbs/<해시>.webp, 내용 해시라서 1년 immutable 캐시).
+# 기본은 꺼져 있다 (THUMB_PROXY_PORT=0) — 브라우저가 이 포트에 닿는 배포에서만 켜고, 앱 주소와 같은 origin으로
+# 내보내려면 리버스 프록시 경로를 THUMB_PROXY_URL로 준다. 카드 주소는 이 프로세스가 서버를 띄웠을 때만 바꾼다.
+# 오프라인 번들(thumb_bundle.py)을 넘기면 폴더에 없는 파일은 번들에서 꺼내 같은 주소로 서빙한다.
+
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image, ImageOps
+
+from http_client import get_client
+
+THUMB_PROXY_DIR = os.environ.get("THUMB_PROXY_DIR", ".thumb_proxy")
+THUMB_PROXY_PORT = int(os.environ.get("THUMB_PROXY_PORT", 0))   # 0이면 프록시를 쓰지 않는다 (예: 8502로 켠다)
+# 브라우저가 보는 주소 (리버스 프록시 뒤라면 그 경로로)
+THUMB_PROXY_URL = os.environ.get("THUMB_PROXY_URL", f"http://localhost:{THUMB_PROXY_PORT}")
+CARD_SIZE = (480, 360)   # .card img 180px 높이의 2배 (고해상도 화면), 3열 카드 폭 비율
+WEBP_QUALITY = 80
+PROXY_DEADLINE = 1.5     # 페이지당 변환 대기(초). 못 끝낸 카드는 이번엔 원본 URL로
+PROXY_WORKERS = 4
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+FAILURE_TTL = 300        # 변환에 실패한 원본은 이 시간 동안 다시 받지 않는다 (원본 URL로 그린다)
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_NAME = re.compile(r"^[0-9a-f]{40}\.webp$")
+_executor = ThreadPoolExecutor(PROXY_WORKERS, thread_name_prefix="thumb-proxy")
+_lock = threading.Lock()
+_inflight = {}           # 원본 URL → 변환 중인 Future
+_failed = {}             # 원본 URL → 실패 시각
+
+
+def _url_key(url: str) -> str:
+    return hashlib.blake2b(url.encode(), digest_size=20).hexdigest()
+
+
+def _index_path(url: str) -> str:
+    return os.path.join(THUMB_PROXY_DIR, "by-url", _url_key(url))
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def to_card_webp(data: bytes) -> bytes:
+    """원본 이미지 바이트 → CARD_SIZE로 잘라 줄인 WebP.
+    CSS object-fit: cover와 같은 비율로 미리 자르되, 인물 사진이라 얼굴이 있는 위쪽을 조금 더 남긴다"""
+    img = Image.open(io.BytesIO(data))
+    img.draft("RGB", CARD_SIZE)          # JPEG은 DCT 단계에서 먼저 줄여 디코딩
+    img = ImageOps.exif_transpose(img).convert("RGB")
+    img = ImageOps.fit(img, CARD_SIZE, Image.LANCZOS, centering=(0.5, 0.35))
+    out = io.BytesIO()
+    img.save(out, "WEBP", quality=WEBP_QUALITY, method=4)
+    return out.getvalue()
+
+
+def lookup(url: str):
+    """이미 변환해 둔 파일 이름 (없으면 None)"""
+    try:
+        with open(_index_path(url), encoding="ascii") as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    return name if os.path.exists(os.path.join(THUMB_PROXY_DIR, name)) else None
+
+
+def download(url: str) -> bytes:
+    """원본 이미지 바이트 (MAX_SOURCE_BYTES 넘으면 ValueError)"""
+    r = get_client().get(url, timeout=10, stream=True)
+    data = r.raw.read(MAX_SOURCE_BYTES + 1, decode_content=True)
+    r.close()
+    if len(data) > MAX_SOURCE_BYTES:
+        raise ValueError(f"원본 이미지가 너무 큽니다: {url}")
+    return data
+
+
+def webp_name(webp: bytes) -> str:
+    return hashlib.blake2b(webp, digest_size=20).hexdigest() + ".webp"
+
+
+def store(url: str) -> str:
+    """원본을 내려받아 변환하고 파일 이름을 돌려준다. 같은 그림이면 URL이 달라도 파일 하나"""
+    webp = to_card_webp(download(url))
+    name = webp_name(webp)
+    path = os.path.join(THUMB_PROXY_DIR, name)
+    if not os.path.exists(path):
+        _write_atomic(path, webp)
+    _write_atomic(_index_path(url), name.encode("ascii"))
+    return name
+
+
+def _finish(url, future, _):
+    with _lock:
+        if _inflight.get(url) is future:
+            del _inflight[url]
+        if future.exception() is not None:
+            _failed[url] = time.monotonic()
+
+
+def _convert(urls) -> dict:
+    """URL별 변환 Future (같은 URL은 프로세스 전체에서 한 번만)"""
+    futures, started = {}, []
+    now = time.monotonic()
+    with _lock:
+        for url in urls:
+            if now - _failed.get(url, -FAILURE_TTL) < FAILURE_TTL:
+                continue
+            if url in _inflight:
+                futures[url] = _inflight[url]
+                continue
+            # 락 밖에서 색인을 본 뒤 다른 세션의 변환이 막 끝났을 수 있다
+            name = lookup(url)
+            if name:
+                futures[url] = Future()
+                futures[url].set_result(name)
+                continue
+            _inflight[url] = futures[url] = _executor.submit(store, url)
+            started.append(url)
+    for url in started:
+        futures[url].add_done_callback(partial(_finish, url, futures[url]))
+    return futures
+
+
+def proxy_url(name: str) -> str:
+    return f"{THUMB_PROXY_URL}/thumbs/{name}"
+
+
+def proxy_thumbs(thumbs: dict, deadline: float = PROXY_DEADLINE) -> dict:
+    """{제목: 원본 URL 또는 None} → {제목: 로컬 프록시 URL}.
+    아직 변환 못 한 이미지는 뒤에서 변환하고, deadline 안에 안 끝나면 이번에는 원본 URL을 그대로 쓴다"""
+    out, names = dict(thumbs), {}
+    for url in set(u for u in thumbs.values() if u):
+        name = lookup(url)
+        if name:
+            names[url] = name
+    futures = _convert([u for u in set(thumbs.values()) if u and u not in names])
+    wait(futures.values(), timeout=deadline)
+    for url, f in futures.items():
+        if f.done() and f.exception() is None:
+            names[url] = f.result()
+    for title, url in thumbs.items():
+        if url in names:
+            out[title] = proxy_url(names[url])
+    return out
+
+
+# ============ 서빙 ============
+class ThumbHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    bundle = None            # ThumbBundle (start_server에서 지정)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        prefix, _, name = self.path.partition("?")[0].rpartition("/")
+        if prefix != "/thumbs" or not _NAME.match(name):
+            return self._empty(404)
+        etag = f'"{name[:-5]}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._empty(304, etag)
+        try:
+            with open(os.path.join(THUMB_PROXY_DIR, name), "rb") as f:
+                data = f.read()
+        except OSError:
+            data = self.bundle.blob(name) if self.bundle is not None else None
+            if data is None:
+                return self._empty(404)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/webp")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("ETag", etag)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _empty(self, code, etag=None):
+        self.send_response(code)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def start_server(port: int = THUMB_PROXY_PORT, host: str = "0.0.0.0", bundle=None):
+    """서빙 스레드 시작. 포트를 못 잡으면 None — 그 포트의 서버는 우리 것이 아닐 수 있으니 원본 URL로 그린다"""
+    os.makedirs(THUMB_PROXY_DIR, exist_ok=True)
+    handler = type("BundleThumbHandler", (ThumbHandler,), {"bundle": bundle}) if bundle is not None else ThumbHandler
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError:
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="thumb-proxy-http", daemon=True).start()
+    return server
@@ -0,0 +1,71 @@
+# 캐시 워밍업 — 서버 시작과 매일 자정(FORTUNE_TZ 기준)에 백그라운드에서 미리 계산/조회해 둔다
+# 오늘의 랭킹 + 12별자리 디테일(fortune.day_fortunes), 프리셋 썸네일 전부(번들 → 위키 → 프록시).
+# 워밍업 중에도 요청은 평소대로 처리된다 (아직 안 채워진 값은 그 요청이 직접 계산/조회).
+
+import datetime as dt
+import threading
+import time
+
+from fortune import SIGN_KO, day_fortunes, fortune_now, fortune_today
+from thumb_bundle import card_thumbs, preset_titles
+
+WARMUP_THUMB_DEADLINE = 60.0   # 프리셋 썸네일 조회/변환을 기다리는 최대 시간(초)
+MIDNIGHT_SLACK = 2.0           # 자정 직후 몇 초 뒤에 시작 (시계 오차 여유)
+
+
+def seconds_until_midnight(now: dt.datetime = None) -> float:
+    now = now or fortune_now()
+    tomorrow = dt.datetime.combine(now.date() + dt.timedelta(days=1), dt.time(), tzinfo=now.tzinfo)
+    return tomorrow.timestamp() - now.timestamp()   # 서머타임이 있는 시간대에서도 실제 경과 시간
+
+
+class Warmup:
+    """백그라운드 워밍업 스레드 하나. status에 마지막 실행의 소요 시간과 채운 비율을 남긴다"""
+
+    def __init__(self, bundle=None, proxy=None):
+        self.bundle = bundle
+        self.proxy = proxy
+        self._lock = threading.Lock()
+        self._thread = None
+        self.status = {"state": "idle", "date": None, "runs": 0, "seconds": None,
+                       "fortunes": 0, "thumbs": 0, "thumbs_total": 0, "error": None}
+
+    def _set(self, **kw):
+        with self._lock:
+            self.status.update(kw)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.status)
+
+    def run_once(self, date: dt.date = None) -> dict:
+        """한 번 워밍업하고 status를 돌려준다"""
+        date = date or fortune_today()
+        self._set(state="running", date=date.isoformat(), error=None)
+        t0 = time.perf_counter()
+        try:
+            _, fortunes = day_fortunes(date)
+            self._set(fortunes=sum(s in fortunes for s in SIGN_KO))
+            titles = preset_titles()
+            thumbs = card_thumbs(titles, self.bundle, deadline=WARMUP_THUMB_DEADLINE, proxy=self.proxy)
+            # 썸네일이 없는 문서(None)도 조회는 끝난 것이지만, 커버리지는 카드에 그림이 나오는 비율로 본다
+            self._set(thumbs=sum(1 for t in titles if thumbs.get(t)), thumbs_total=len(titles))
+        except Exception as e:  # 워밍업이 실패해도 앱은 평소대로 (요청마다 직접 계산/조회)
+            self._set(error=f"{type(e).__name__}: {e}")
+        with self._lock:
+            self.status.update(state="done", seconds=round(time.perf_counter() - t0, 2),
+                               runs=self.status["runs"] + 1)
+            return dict(self.status)
+
+    def _loop(self):
+        while True:
+            self.run_once()
+            time.sleep(seconds_until_midnight() + MIDNIGHT_SLACK)
+
+    def start(self):
+        """데몬 스레드로 지금 한 번, 그 뒤 매일 자정마다 워밍업"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="warmup", daemon=True)
+                self._thread.start()
+        return self
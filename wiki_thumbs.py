@@ -0,0 +1,275 @@
+# 위키피디아 썸네일 가져오기 — main.py 카드용
+# 제목을 위키 언어(ko/en)별로 묶어 MediaWiki action API(prop=pageimages)로 한 번에 최대 50개씩 조회한다.
+# 한 페이지에 필요한 묶음은 스레드 풀로 동시에 보내고, 전체 마감 시간이 지나면 아직 안 온 카드는
+# 기본 아이콘으로 그린다. 늦게 도착한 응답은 캐시에 남아 다음 새로고침에 쓰인다.
+# 캐시는 SQLite 파일 하나(ThumbCache)라서 재시작 후에도 남고 같은 서버의 프로세스들이 함께 쓴다.
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+
+import requests
+
+from http_client import get_client
+
+# 로컬 스텁 서버로 돌릴 때는 WIKI_BASE_URL=http://127.0.0.1:8000/{lang}
+WIKI_BASE_URL = os.environ.get("WIKI_BASE_URL", "https://{lang}.wikipedia.org")
+WIKI_TIMEOUT = 6                                                   # 요청 하나의 타임아웃(초)
+THUMB_DEADLINE = float(os.environ.get("WIKI_THUMB_DEADLINE", 3))   # 페이지 전체 마감(초)
+THUMB_WORKERS = 8
+BATCH_SIZE = 50          # action API의 titles= 상한 (일반 사용자 기준)
+THUMB_SIZE = 320         # REST page/summary 썸네일과 비슷한 폭
+
+# ============ 썸네일 캐시 ============
+THUMB_CACHE_PATH = os.environ.get("WIKI_THUMB_CACHE", ".wiki_thumbs.sqlite3")
+THUMB_TTL = float(os.environ.get("WIKI_THUMB_TTL", 7 * 24 * 3600))               # 썸네일 URL
+NEGATIVE_TTL = float(os.environ.get("WIKI_THUMB_NEGATIVE_TTL", 6 * 3600))        # 문서/썸네일 없음
+ERROR_TTL = float(os.environ.get("WIKI_THUMB_ERROR_TTL", 60))                    # 요청 실패
+MAX_STALE = float(os.environ.get("WIKI_THUMB_MAX_STALE", 30 * 24 * 3600))        # 만료 후에도 보여줄 기간
+
+FOUND, NOT_FOUND, FAILED = 0, 1, 2
+
+
+class ThumbCache:
+    """제목 → 썸네일 URL을 SQLite에 저장하는 캐시 (WAL, 프로세스 간 공유).
+    찾은 URL은 THUMB_TTL, 없음은 NEGATIVE_TTL, 요청 실패는 ERROR_TTL 동안 그대로 쓴다.
+    만료된 URL은 MAX_STALE 동안 계속 보여주고 그 사이 뒤에서 다시 가져온다."""
+
+    def __init__(self, path: str = THUMB_CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {"fresh": 0, "stale": 0, "negative": 0, "miss": 0,
+                      "fetched": 0, "refresh": 0, "shared": 0, "store_error": 0}
+        with self._conn() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS thumbs (
+                title TEXT PRIMARY KEY, url TEXT, status INTEGER NOT NULL,
+                fetched_at REAL NOT NULL, expires_at REAL NOT NULL)""")
+        self.prune()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드마다 따로 (가져오기 스레드 풀에서도 쓴다)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key: str, n: int = 1):
+        if n:
+            with self._lock:
+                self.stats[key] += n
+
+    def lookup(self, titles, now: float = None):
+        """캐시에서 쓸 수 있는 항목 → ({제목: URL 또는 None}, 다시 가져올 만료 제목 목록).
+        결과에 없는 제목은 새로 요청해야 한다."""
+        now = time.time() if now is None else now
+        rows = []
+        try:
+            conn = self._conn()
+            for i in range(0, len(titles), 500):   # SQLite 변수 개수 제한
+                chunk = titles[i:i + 500]
+                rows += conn.execute(
+                    f"SELECT title, url, status, expires_at FROM thumbs WHERE title IN ({','.join('?' * len(chunk))})",
+                    chunk).fetchall()
+        except sqlite3.Error:
+            self._count("store_error")
+        out, stale = {}, []
+        for title, url, status, expires_at in rows:
+            if expires_at > now:
+                out[title] = url
+                self._count("fresh" if status == FOUND else "negative")
+            elif status == FOUND and expires_at + MAX_STALE > now:
+                out[title] = url
+                stale.append(title)
+                self._count("stale")
+        self._count("miss", len(titles) - len(out))
+        return out, stale
+
+    def put(self, found: dict, now: float = None):
+        """가져온 결과 저장: URL이면 THUMB_TTL, None이면 NEGATIVE_TTL"""
+        now = time.time() if now is None else now
+        self._write([(t, url, FOUND if url else NOT_FOUND, now, now + (THUMB_TTL if url else NEGATIVE_TTL))
+                     for t, url in found.items()])
+
+    def put_failed(self, titles, now: float = None):
+        """요청 실패: 잠깐만 None으로 기억한다. 이미 있던 URL은 덮어쓰지 않는다 (만료돼도 계속 보여준다)"""
+        now = time.time() if now is None else now
+        try:
+            with self._conn() as conn:
+                conn.executemany(
+                    """INSERT INTO thumbs VALUES (?, NULL, ?, ?, ?) ON CONFLICT(title) DO UPDATE SET
+                       status=excluded.status, fetched_at=excluded.fetched_at, expires_at=excluded.expires_at
+                       WHERE thumbs.status != ?""",
+                    [(t, FAILED, now, now + ERROR_TTL, FOUND) for t in titles])
+        except sqlite3.Error:
+            self._count("store_error")
+
+    def _write(self, rows):
+        try:
+            with self._conn() as conn:
+                conn.executemany("INSERT OR REPLACE INTO thumbs VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error:
+            self._count("store_error")
+
+    def prune(self, now: float = None):
+        """더 이상 보여주지 않을 항목 삭제"""
+        now = time.time() if now is None else now
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM thumbs WHERE expires_at + ? < ? OR (status != ? AND expires_at < ?)",
+                             (MAX_STALE, now, FOUND, now))
+        except sqlite3.Error:
+            self._count("store_error")
+
+    def summary(self, now: float = None) -> dict:
+        """저장된 항목 수 (찾음/없음/실패/만료) + 이 프로세스의 조회 통계"""
+        now = time.time() if now is None else now
+        out = {"found": 0, "not_found": 0, "failed": 0, "expired": 0}
+        try:
+            rows = self._conn().execute(
+                "SELECT status, COUNT(*), SUM(expires_at < ?) FROM thumbs GROUP BY status", (now,)).fetchall()
+        except sqlite3.Error:
+            rows = []
+        for status, n, expired in rows:
+            out[("found", "not_found", "failed")[status]] = n
+            out["expired"] += expired or 0
+        with self._lock:
+            out.update(self.stats)
+        return out
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM thumbs")
+        with self._lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+
+_executor = ThreadPoolExecutor(THUMB_WORKERS, thread_name_prefix="wiki-thumb")
+_cache = None            # ThumbCache, 처음 쓸 때 연다 (WIKI_THUMB_CACHE/THUMB_CACHE_PATH 바꿀 수 있게)
+_cache_lock = threading.Lock()
+_inflight = {}           # 제목 → 그 제목을 가져오는 중인 묶음 Future (프로세스 전체에서 제목당 하나)
+
+
+def get_cache() -> ThumbCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None or _cache.path != THUMB_CACHE_PATH:
+            _cache = ThumbCache(THUMB_CACHE_PATH)
+        return _cache
+
+
+def wiki_lang(title: str) -> str:
+    return "ko" if any(ord(c) > 127 for c in title) else "en"
+
+
+def api_url(lang: str) -> str:
+    return WIKI_BASE_URL.format(lang=lang) + "/w/api.php"
+
+
+def resolve_batch(lang: str, titles) -> dict:
+    """한 위키의 제목 최대 50개 → {제목: URL 또는 None}. 요청이 실패하면 예외 (재시도는 http_client)"""
+    r = get_client().get(api_url(lang), timeout=WIKI_TIMEOUT, params={
+        "action": "query", "format": "json", "formatversion": 2, "redirects": 1,
+        "prop": "pageimages", "piprop": "thumbnail", "pithumbsize": THUMB_SIZE,
+        "titles": "|".join(titles),
+    })
+    r.raise_for_status()
+    q = r.json().get("query", {})
+    # 요청한 제목 → (정규화) → (넘겨주기) → 실제 문서 제목
+    normalized = {n["from"]: n["to"] for n in q.get("normalized", [])}
+    redirects = {n["from"]: n["to"] for n in q.get("redirects", [])}
+    pages = {p["title"]: p.get("thumbnail", {}).get("source") for p in q.get("pages", [])}
+    out = {}
+    for t in titles:
+        name = normalized.get(t, t)
+        seen = set()
+        while name in redirects and name not in seen:
+            seen.add(name)
+            name = redirects[name]
+        out[t] = pages.get(name)
+    return out
+
+
+def _resolve_and_store(lang, titles):
+    cache = get_cache()
+    try:
+        found = resolve_batch(lang, titles)
+    except Exception:
+        cache.put_failed(titles)
+        raise
+    cache.put(found)
+    return found
+
+
+def _refresh(lang, titles):
+    try:
+        return _resolve_and_store(lang, titles)
+    except (requests.RequestException, ValueError):
+        return {}   # http_client 카운터에 남는다. 만료된 URL을 계속 보여주고 다음 조회에서 다시 시도
+
+
+def _batches(titles):
+    by_lang = {}
+    for t in titles:
+        by_lang.setdefault(wiki_lang(t), []).append(t)
+    for lang, ts in by_lang.items():
+        for i in range(0, len(ts), BATCH_SIZE):
+            yield lang, ts[i:i + BATCH_SIZE]
+
+
+def _finish(titles, future, _):
+    with _cache_lock:
+        for t in titles:
+            if _inflight.get(t) is future:
+                del _inflight[t]
+
+
+def _single_flight(cache, titles, job, started: str) -> dict:
+    """제목별 Future. 이미 누가 가져오는 중인 제목은 그 요청을 같이 기다리고,
+    나머지만 묶어서 job(lang, batch)을 시작한다 (같은 제목이 동시에 두 번 나가지 않는다)"""
+    with _cache_lock:
+        futures = {t: _inflight[t] for t in titles if t in _inflight}
+        new = [t for t in titles if t not in futures]
+        jobs = []
+        for lang, batch in _batches(new):
+            f = _executor.submit(job, lang, batch)
+            jobs.append((batch, f))
+            for t in batch:
+                _inflight[t] = futures[t] = f
+    # 이미 끝난 Future면 콜백이 바로 불리므로 락 밖에서 등록한다
+    for batch, f in jobs:
+        f.add_done_callback(partial(_finish, batch, f))
+    cache._count("shared", len(titles) - len(new))
+    cache._count(started, len(new))
+    return futures
+
+
+def fetch_thumbs(titles, deadline: float = THUMB_DEADLINE) -> dict:
+    """여러 제목의 썸네일을 가져온다: {제목: URL 또는 None}.
+    캐시에 없는 제목만 언어별 50개 묶음으로 동시에 요청하고, deadline 안에 못 받은 제목은 None.
+    만료된 URL은 그대로 돌려주고 뒤에서 다시 가져온다."""
+    titles = list(dict.fromkeys(titles))
+    cache = get_cache()
+    out, stale = cache.lookup(titles)
+    _single_flight(cache, stale, _refresh, "refresh")
+    missing = [t for t in titles if t not in out]
+    futures = _single_flight(cache, missing, _resolve_and_store, "fetched")
+    wait(set(futures.values()), timeout=deadline)
+    for t, f in futures.items():
+        if f.done() and f.exception() is None:
+            out[t] = f.result().get(t)
+    return {t: out.get(t) for t in titles}
+
+
+def cache_stats() -> dict:
+    return get_cache().summary()
+
+
+def clear_cache():
+    get_cache().clear()